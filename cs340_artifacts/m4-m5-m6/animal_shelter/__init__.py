@@ -14,7 +14,7 @@ Requirements following EARS format:
 """
 
 from .animal_shelter import AnimalShelter
-from .data_importer import AACDataImporter
+from .client_registry import close_all_clients
 
 __version__ = "1.0.0"
 __author__ = "Dave Mobley"
@@ -22,5 +22,32 @@ __email__ = "david.mobley@snhu.edu"
 
 __all__ = [
     "AnimalShelter",
-    "AACDataImporter"
-] 
\ No newline at end of file
+    "AsyncAnimalShelter",
+    "AACDataImporter",
+    "close_all_clients"
+]
+
+# Classes imported on first access, with the module that defines them
+_LAZY_ATTRIBUTES = {
+    "AACDataImporter": ".data_importer",
+    "AsyncAnimalShelter": ".async_animal_shelter",
+}
+
+
+def __getattr__(name):
+    """
+    Load AACDataImporter and AsyncAnimalShelter on first access.
+
+    The importer needs pandas and NumPy, and the async class needs Motor, all
+    of which take far longer to import than the CRUD class. Loading them
+    lazily keeps `import animal_shelter` cheap for CRUD-only consumers such as
+    dashboard workers.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES)) 
\ No newline at end of file
@@ -14,18 +14,100 @@ Requirements following EARS format:
 - When update() is called with valid criteria and update spec, the AnimalShelter shall return the number of modified documents
 - When delete() is called with valid criteria, the AnimalShelter shall return the number of deleted documents
 - The AnimalShelter class shall provide a helper to ensure indexes on common query fields
+- When AnimalShelter() is created with shared_client=True, the AnimalShelter shall reuse the process-wide MongoClient for its connection parameters
+- When read_iter() is called, the AnimalShelter shall yield matching documents one at a time from a batched cursor
+- When read_page() is called with a page token, the AnimalShelter shall return the next page by seeking past the token's sort key rather than skipping documents
+- When read() is called with fill_missing=True, the AnimalShelter shall return every AAC field on each document, even for sparse documents
+- When read_by_ids() is called, the AnimalShelter shall return every requested id mapped to its document, or None if it is missing
+- When create_many(), bulk_update() or delete_by_ids() is called, the AnimalShelter shall send the operations as bulk_write batches and return a result summary
+- Where the query cache is enabled, when read() repeats a cached filter and projection within the TTL, the AnimalShelter shall return the cached result without querying MongoDB
+- Where the query cache is enabled, when a write is made through the AnimalShelter, the AnimalShelter shall drop the cached results it might affect
+- Where profiling is enabled, the AnimalShelter shall record each query it sends with its duration and query shape, and explain slow ones
+- When top_values(), facet_counts() or outcome_breakdown() is called, the AnimalShelter shall compute the counts with an aggregation pipeline and return only the aggregate
+- Where summary stats are enabled, when a write is made through the AnimalShelter, the AnimalShelter shall apply the write's count deltas to the summary collection
+- When a document is written with a breed or sex_upon_outcome, the AnimalShelter shall keep its breed_tokens, breed_mix and intact fields current
+- When rescue_animals() is called, the AnimalShelter shall list the category from the indexed rescue_categories tags
+- When near() or within() is called, the AnimalShelter shall answer with a geo query on the 2dsphere-indexed location field
+- When advise_indexes() is called, the AnimalShelter shall propose compound indexes for the profiled workload and flag unused indexes
 """
 
-from pymongo import MongoClient
+import base64
+import hashlib
+import re
+from contextlib import contextmanager
+from pymongo import DeleteMany, InsertOne, MongoClient, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+import bson
 from bson.objectid import ObjectId
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, Iterator, List, Optional, Any, Sequence, Tuple, Union
 import logging
 import sys
 import os
-from dotenv import load_dotenv
+import threading
 
-# Load environment variables
-load_dotenv()
+from .client_registry import client_options_from_env, client_registry
+from .breeds import BREED_TOKENS_FIELD, INTACT_FIELD, add_breed_fields, breed_field_updates, breed_fields
+from .geo import (GEO_INDEX_NAME, LAT_FIELD, LOCATION_FIELD, LONG_FIELD, PointLike, add_location,
+                  location_expression, location_needs_refresh, location_updates, near_filter, within_filter)
+from .index_advisor import IndexAdvisor, key_pattern
+from .profiling import QueryProfiler
+from .query_cache import QueryCache
+from .rescue import (REFRESH_CHUNK_SIZE, RESCUE_CATEGORIES_FIELD, RESCUE_INDEX_NAME, add_rescue_categories,
+                     affects_rescue_categories, category_key, refresh_expression)
+from .schema import fill_missing_fields, projected_fields
+from .summary_stats import SummaryStats
+
+_dotenv_lock = threading.Lock()
+_dotenv_loaded = False
+
+
+def load_environment() -> None:
+    """
+    Load variables from a .env file into the environment, once per process.
+
+    This runs on first use (when an AnimalShelter or AACDataImporter is
+    created) rather than at import, so importing the package stays cheap.
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    with _dotenv_lock:
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _dotenv_loaded = True
+
+
+def connection_settings(user: str = None, password: str = None, host: str = None,
+                        port: int = None) -> Dict[str, Any]:
+    """
+    Resolve MongoDB connection settings shared by the sync and async shelters.
+
+    Arguments take precedence over environment variables (after loading
+    .env), which take precedence over the local development defaults.
+
+    Args:
+        user (str): Username for authentication
+        password (str): Password for authentication
+        host (str): MongoDB host address
+        port (int): MongoDB port number
+
+    Returns:
+        Dict[str, Any]: user, password, host, port, database, collection and connection_string
+    """
+    load_environment()
+    settings = {
+        'user': user or os.getenv('MONGO_USER') or os.getenv('AAC_USER', 'aacuser'),
+        'password': password or os.getenv('MONGO_PASS') or os.getenv('AAC_PASS', 'SECRET'),
+        'host': host or os.getenv('MONGO_HOST') or os.getenv('MONGODB_HOST', 'localhost'),
+        'port': int(port or os.getenv('MONGO_PORT') or os.getenv('MONGODB_PORT', '27017')),
+        'database': os.getenv('AAC_DATABASE', 'aac'),
+        'collection': os.getenv('AAC_COLLECTION', 'animals'),
+    }
+    # Connection string format from the rubric
+    settings['connection_string'] = (f"mongodb://{settings['user']}:{settings['password']}"
+                                     f"@{settings['host']}:{settings['port']}")
+    return settings
 
 
 class AnimalShelter(object):
@@ -38,7 +120,31 @@ class AnimalShelter(object):
     type hints for better code maintainability and reliability.
     """
 
-    def __init__(self, user: str = None, password: str = None, host: str = None, port: int = None):
+    # Indexes created by ensure_indexes(), as (name, keys). Not unique, to avoid
+    # conflicts with existing datasets unless guaranteed unique.
+    RECOMMENDED_INDEXES = [
+        ("idx_animal_id", [("animal_id", 1)]),
+        ("idx_animal_type", [("animal_type", 1)]),
+        ("idx_breed", [("breed", 1)]),
+        ("idx_outcome_type", [("outcome_type", 1)]),
+        # Range queries on typed (BSON date / double) fields
+        # datetime ranges and keyset pages by (datetime, _id), see read_page()
+        ("idx_datetime_id", [("datetime", 1), ("_id", 1)]),
+        ("idx_age_upon_outcome_in_weeks", [("age_upon_outcome_in_weeks", 1)]),
+        # Rescue filters: breed token lookups ($in, multikey) on intact animals of a type
+        ("idx_breed_tokens_intact_animal_type", [(BREED_TOKENS_FIELD, 1), (INTACT_FIELD, 1), ("animal_type", 1)]),
+        # Precomputed rescue category membership, see rescue_animals()
+        (RESCUE_INDEX_NAME, [(RESCUE_CATEGORIES_FIELD, 1)]),
+        # GeoJSON points for near() and within()
+        (GEO_INDEX_NAME, [(LOCATION_FIELD, "2dsphere")]),
+    ]
+
+    def __init__(self, user: str = None, password: str = None, host: str = None, port: int = None,
+                 shared_client: Optional[bool] = None, check_connection: Optional[bool] = None,
+                 client_options: Optional[Dict[str, Any]] = None,
+                 query_cache: Optional[Union[bool, QueryCache]] = None,
+                 profiler: Optional[Union[bool, QueryProfiler]] = None,
+                 summary_stats: Optional[Union[bool, SummaryStats]] = None):
         """
         Initialize the AnimalShelter with MongoDB connection.
 
@@ -47,38 +153,92 @@ class AnimalShelter(object):
             password (str): Password for authentication (default: from environment).
             host (str): MongoDB host address (default: from environment).
             port (int): MongoDB port number (default: from environment).
+            shared_client (Optional[bool]): Reuse the process-wide MongoClient for these
+                connection parameters instead of opening a new pool. A shared client is
+                not closed by close_connection(); see close_all_clients()
+                (default: MONGO_SHARED_CLIENT env var or False).
+            check_connection (Optional[bool]): Ping the server and check the collection
+                exists before returning. A shared client is only checked once. Without
+                the check, connection errors surface on the first operation
+                (default: MONGO_CHECK_CONNECTION env var or True).
+            client_options (Optional[Dict[str, Any]]): Extra MongoClient options such as
+                maxPoolSize or serverSelectionTimeoutMS, on top of the MONGO_* pool and
+                timeout env vars.
+            query_cache (Optional[Union[bool, QueryCache]]): Cache read() results in memory.
+                True creates a cache sized by the QUERY_CACHE_* env vars; a QueryCache
+                instance can be shared by several AnimalShelters
+                (default: QUERY_CACHE env var or False).
+            profiler (Optional[Union[bool, QueryProfiler]]): Time each query and explain slow
+                ones (see profile_report()). True creates a profiler configured by the
+                QUERY_PROFILE_* env vars (default: QUERY_PROFILE env var or False).
+            summary_stats (Optional[Union[bool, SummaryStats]]): Keep per-value counts in a
+                summary collection current with every write (see get_summary_stats())
+                (default: SUMMARY_STATS env var or False).
 
         Raises:
             ConnectionError: If unable to connect to MongoDB
         """
         # Connection Variables - using environment variables with fallbacks
         # User/password arguments take precedence over environment variables.
-        self.USER = user or os.getenv('MONGO_USER') or os.getenv('AAC_USER', 'aacuser')
-        self.PASS = password or os.getenv('MONGO_PASS') or os.getenv('AAC_PASS', 'SECRET')
-        self.HOST = host or os.getenv('MONGO_HOST') or os.getenv('MONGODB_HOST', 'localhost')
-        self.PORT = int(port or os.getenv('MONGO_PORT') or os.getenv('MONGODB_PORT', '27017'))
-        self.DB = os.getenv('AAC_DATABASE', 'aac')
-        self.COL = os.getenv('AAC_COLLECTION', 'animals')
+        settings = connection_settings(user, password, host, port)
+        self.USER = settings['user']
+        self.PASS = settings['password']
+        self.HOST = settings['host']
+        self.PORT = settings['port']
+        self.DB = settings['database']
+        self.COL = settings['collection']
+        if shared_client is None:
+            shared_client = os.getenv('MONGO_SHARED_CLIENT', 'false').lower() in ('1', 'true', 'yes')
+        if check_connection is None:
+            check_connection = os.getenv('MONGO_CHECK_CONNECTION', 'true').lower() in ('1', 'true', 'yes')
+        self.shared_client = bool(shared_client)
+        if query_cache is None:
+            query_cache = os.getenv('QUERY_CACHE', 'false').lower() in ('1', 'true', 'yes')
+        if isinstance(query_cache, QueryCache):
+            self.query_cache = query_cache
+        else:
+            self.query_cache = QueryCache.from_env() if query_cache else None
+        if profiler is None:
+            profiler = os.getenv('QUERY_PROFILE', 'false').lower() in ('1', 'true', 'yes')
+        if isinstance(profiler, QueryProfiler):
+            self.profiler = profiler
+        else:
+            self.profiler = QueryProfiler.from_env() if profiler else None
 
         # Initialize logging for debugging and monitoring
         self._setup_logging()
 
         try:
             # Initialize Connection using connection string format from rubric
-            connection_string = f'mongodb://{self.USER}:{self.PASS}@{self.HOST}:{self.PORT}'
-            self.client = MongoClient(connection_string)
-
-            # Test connection
-            self.client.admin.command('ping')
-            self.logger.info(f"Successfully connected to MongoDB at {self.HOST}:{self.PORT}")
+            connection_string = settings['connection_string']
+            options = {**client_options_from_env(), **(client_options or {})}
+            if self.shared_client:
+                self.client = client_registry.get_client(connection_string, MongoClient, options)
+            else:
+                self.client = MongoClient(connection_string, **options)
 
             # Set up database and collection references
             self.database = self.client[self.DB]
             self.collection = self.database[self.COL]
+            if isinstance(summary_stats, SummaryStats):
+                self.summary_stats = summary_stats
+            else:
+                if summary_stats is None:
+                    summary_stats = os.getenv('SUMMARY_STATS', 'false').lower() in ('1', 'true', 'yes')
+                self.summary_stats = SummaryStats.for_collection(self.database, self.COL, self.logger) \
+                    if summary_stats else None
+
+            if check_connection and not (self.shared_client and client_registry.is_checked(self.client)):
+                # Test connection
+                self.client.admin.command('ping')
+                self.logger.info(f"Successfully connected to MongoDB at {self.HOST}:{self.PORT}")
 
-            # Verify collection exists
-            if self.COL not in self.database.list_collection_names():
-                self.logger.warning(f"Collection '{self.COL}' does not exist. It will be created on first insert.")
+                # Verify collection exists
+                if self.COL not in self.database.list_collection_names():
+                    self.logger.warning(f"Collection '{self.COL}' does not exist. It will be created on first insert.")
+
+                if self.shared_client:
+                    client_registry.mark_checked(self.client)
 
         except Exception as e:
             self.logger.error(f"Failed to connect to MongoDB: {str(e)}")
@@ -142,15 +302,24 @@ class AnimalShelter(object):
             if not data:
                 raise ValueError("Data parameter cannot be empty")
 
+            # Add the indexed fields derived from breed, sex and coordinates
+            self._add_derived_fields(data)
+
             # Log the insertion attempt
             self.logger.info(f"Attempting to insert document: {list(data.keys())}")
 
             # Insert the document into the collection
-            result = self.collection.insert_one(data)
+            try:
+                result = self.collection.insert_one(data)
+            finally:
+                if self.query_cache is not None:
+                    self.query_cache.invalidate_inserts([data])
 
             # Verify insertion was successful
             if result.inserted_id:
                 self.logger.info(f"Successfully inserted document with ID: {result.inserted_id}")
+                if self.summary_stats is not None:
+                    self.summary_stats.apply_safely(lambda stats: stats.record_inserts([data]))
                 return True
             else:
                 self.logger.error("Insert operation completed but no document ID returned")
@@ -163,7 +332,8 @@ class AnimalShelter(object):
             self.logger.error(f"Database error in create method: {str(e)}")
             raise Exception(f"Failed to insert document: {str(e)}") from e
 
-    def read(self, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def read(self, criteria: Optional[Dict[str, Any]] = None, fill_missing: bool = False,
+             projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None) -> List[Dict[str, Any]]:
         """
         Read method to implement the R in CRUD.
 
@@ -175,6 +345,12 @@ class AnimalShelter(object):
             criteria (Optional[Dict[str, Any]]): Query criteria to filter documents.
                                                If None, returns all documents.
                                                Must be a dictionary with key/value pairs.
+            fill_missing (bool): If True, add any AAC field a document lacks (sparse
+                                 imports omit blank fields) with '' or None, so every
+                                 document has the same keys.
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return,
+                                 as a find() projection or a list of field names
+                                 (default: whole documents)
 
         Returns:
             List[Dict[str, Any]]: List of matching documents. Empty list if no matches found.
@@ -206,13 +382,28 @@ class AnimalShelter(object):
             else:
                 self.logger.info("Querying all documents")
 
-            # Execute the query using find() as specified in rubric
-            cursor = self.collection.find(query)
+            cache_key = self.query_cache.key(query, projection) if self.query_cache is not None else None
+            documents = self.query_cache.get(cache_key) if cache_key is not None else None
+            if documents is not None:
+                source = "query cache"
+            else:
+                source = "MongoDB"
+                generation = self.query_cache.generation if cache_key is not None else None
 
-            # Convert cursor to list of documents
-            documents = list(cursor)
+                with self._profiled("read", query, explain=lambda: self._explain(self._find_command(query, projection))):
+                    # Execute the query using find() as specified in rubric
+                    cursor = self.collection.find(query, projection) if projection is not None else self.collection.find(query)
 
-            self.logger.info(f"Query returned {len(documents)} documents")
+                    # Convert cursor to list of documents
+                    documents = list(cursor)
+                if cache_key is not None:
+                    self.query_cache.put(cache_key, query, documents, generation)
+
+            if fill_missing:
+                for document in documents:
+                    fill_missing_fields(document, projected_fields(projection))
+
+            self.logger.info(f"Query returned {len(documents)} documents from {source}")
             return documents
 
         except ValueError as ve:
@@ -222,42 +413,756 @@ class AnimalShelter(object):
             self.logger.error(f"Database error in read method: {str(e)}")
             raise Exception(f"Failed to query documents: {str(e)}") from e
 
-    def read_by_id(self, animal_id: str) -> Optional[Dict[str, Any]]:
+    def read_iter(self, criteria: Optional[Dict[str, Any]] = None,
+                  projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                  sort: Optional[Union[str, Sequence[Tuple[str, int]]]] = None,
+                  limit: int = 0, batch_size: Optional[int] = None,
+                  fill_missing: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream matching documents from a cursor instead of building a list.
+
+        Documents are fetched from the server batch_size at a time, so memory
+        use stays constant however many documents match. Arguments are
+        validated when read_iter() is called; the query runs on first iteration.
+
+        Args:
+            criteria (Optional[Dict[str, Any]]): Query criteria. If None, matches all documents.
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return,
+                                                                        as a find() projection
+                                                                        or a list of field names
+            sort (Optional[Union[str, Sequence[Tuple[str, int]]]]): A field name (ascending) or
+                                                                    a list of (field, direction) pairs
+            limit (int): Maximum number of documents to return (0 means no limit)
+            batch_size (Optional[int]): Documents fetched per server round trip
+                                        (default: the driver's)
+            fill_missing (bool): If True, add any AAC field a document lacks with '' or None
+
+        Returns:
+            Iterator[Dict[str, Any]]: Generator over the matching documents
+
+        Raises:
+            ValueError: If criteria is not a dictionary, or limit or batch_size is negative
+            Exception: If the query fails due to database errors (raised while iterating)
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> for dog in shelter.read_iter({"animal_type": "Dog"}, projection=["name", "breed"],
+            ...                              sort="name", batch_size=500):
+            ...     print(dog["name"])
+        """
+        if criteria is not None and not isinstance(criteria, dict):
+            raise ValueError("Criteria parameter must be a dictionary or None")
+        if limit < 0:
+            raise ValueError("limit must not be negative")
+        if batch_size is not None and batch_size < 0:
+            raise ValueError("batch_size must not be negative")
+
+        query = criteria if criteria is not None else {}
+        self.logger.info(f"Streaming documents with criteria: {query}")
+        return self._iter_cursor(query, projection, sort, limit, batch_size, fill_missing)
+
+    def _iter_cursor(self, query: Dict[str, Any], projection, sort, limit: int,
+                     batch_size: Optional[int], fill_missing: bool) -> Iterator[Dict[str, Any]]:
+        """Run a find() and yield its documents (the generator behind read_iter)."""
+        try:
+            cursor = self.collection.find(query, projection) if projection is not None else self.collection.find(query)
+            if sort is not None:
+                cursor = cursor.sort(sort)
+            if limit:
+                cursor = cursor.limit(limit)
+            if batch_size:
+                cursor = cursor.batch_size(batch_size)
+
+            try:
+                for document in cursor:
+                    yield fill_missing_fields(document, projected_fields(projection)) if fill_missing else document
+            finally:
+                # Release the server-side cursor even if the caller stops early
+                cursor.close()
+
+        except Exception as e:
+            self.logger.error(f"Database error in read_iter method: {str(e)}")
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+    def read_page(self, criteria: Optional[Dict[str, Any]] = None,
+                  projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                  sort_key: str = "_id", direction: int = 1, page_size: int = 100,
+                  page_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Read one page of matching documents using keyset (seek) pagination.
+
+        Documents are ordered by sort_key and then _id, which makes the order
+        total even when sort_key has repeated values. Each page ends with an
+        opaque token holding the last (sort_key, _id) pair. The next page
+        queries for documents after that pair instead of skipping the earlier
+        ones, so with an index on (sort_key, _id), such as idx_datetime_id,
+        page 1,000 costs the same as page one.
+
+        Args:
+            criteria (Optional[Dict[str, Any]]): Query criteria. If None, matches all documents.
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return,
+                                                                        as a find() projection
+                                                                        or a list of field names
+            sort_key (str): Field to page through, e.g. "_id" or "datetime"
+            direction (int): 1 for ascending, -1 for descending
+            page_size (int): Maximum number of documents per page
+            page_token (Optional[str]): next_token from the previous page, or None for page one
+
+        Returns:
+            Dict[str, Any]: 'documents' (the page) and 'next_token' (None on the last page)
+
+        Raises:
+            ValueError: If criteria, direction, page_size or page_token is invalid, or the
+                        token came from a query with a different filter or sort
+            Exception: If the query fails due to database errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> page = shelter.read_page({"animal_type": "Dog"}, sort_key="datetime", page_size=50)
+            >>> while page["next_token"]:
+            ...     page = shelter.read_page({"animal_type": "Dog"}, sort_key="datetime",
+            ...                              page_size=50, page_token=page["next_token"])
+        """
+        if criteria is not None and not isinstance(criteria, dict):
+            raise ValueError("Criteria parameter must be a dictionary or None")
+        if direction not in (1, -1):
+            raise ValueError("direction must be 1 (ascending) or -1 (descending)")
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        query = criteria if criteria is not None else {}
+        query_id = self._page_query_id(query, sort_key, direction)
+
+        if page_token is not None:
+            last_value, last_id = self._decode_page_token(page_token, query_id)
+            seek = self._seek_filter(sort_key, direction, last_value, last_id)
+            query = {"$and": [query, seek]} if query else seek
+
+        sort = [("_id", direction)] if sort_key == "_id" else [(sort_key, direction), ("_id", direction)]
+        find_projection, strip_fields = self._projection_with_field(projection, sort_key)
+
+        try:
+            with self._profiled("read_page", query, sort=sort, explain=lambda: self._explain(
+                    self._find_command(query, find_projection, sort, page_size + 1))):
+                cursor = self.collection.find(query, find_projection) if find_projection is not None \
+                    else self.collection.find(query)
+                # Fetch one extra document to learn whether another page follows
+                documents = list(cursor.sort(sort).limit(page_size + 1))
+        except Exception as e:
+            self.logger.error(f"Database error in read_page method: {str(e)}")
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+        next_token = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            last = documents[-1]
+            next_token = self._encode_page_token(query_id, last.get(sort_key), last["_id"])
+
+        for document in documents:
+            for field in strip_fields:
+                document.pop(field, None)
+
+        self.logger.info(f"Page returned {len(documents)} documents (more: {next_token is not None})")
+        return {"documents": documents, "next_token": next_token}
+
+    @staticmethod
+    def _page_query_id(query: Dict[str, Any], sort_key: str, direction: int) -> str:
+        """Fingerprint of a paged query, so a token is only accepted by the query that issued it."""
+        encoded = bson.encode({"q": query, "k": sort_key, "d": direction})
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+    @staticmethod
+    def _encode_page_token(query_id: str, last_value: Any, last_id: Any) -> str:
+        """Pack the last (sort_key, _id) pair into an opaque, URL-safe token."""
+        payload = bson.encode({"q": query_id, "v": last_value, "i": last_id})
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_page_token(page_token: str, query_id: str) -> Tuple[Any, Any]:
+        """Unpack a page token, checking that it belongs to this query."""
+        try:
+            padded = page_token + "=" * (-len(page_token) % 4)
+            payload = bson.decode(base64.urlsafe_b64decode(padded.encode("ascii")))
+            token_query_id, last_value, last_id = payload["q"], payload["v"], payload["i"]
+        except Exception as e:
+            raise ValueError("Invalid page token") from e
+        if token_query_id != query_id:
+            raise ValueError("Page token does not match this query's criteria and sort")
+        return last_value, last_id
+
+    @staticmethod
+    def _seek_filter(sort_key: str, direction: int, last_value: Any, last_id: Any) -> Dict[str, Any]:
+        """
+        Filter for the documents that sort after (last_value, last_id).
+
+        MongoDB sorts null and missing values before all others, and range
+        operators never match null, so null sort values need their own branches.
+        """
+        after = "$gt" if direction == 1 else "$lt"
+        if sort_key == "_id":
+            return {"_id": {after: last_id}}
+        if last_value is None:
+            same_value = {sort_key: None, "_id": {after: last_id}}
+            # Ascending: every non-null value still follows; descending: only nulls remain
+            return {"$or": [same_value, {sort_key: {"$ne": None}}]} if direction == 1 else same_value
+        branches = [
+            {sort_key: {after: last_value}},
+            {sort_key: last_value, "_id": {after: last_id}},
+        ]
+        if direction == -1:
+            branches.append({sort_key: None})
+        return {"$or": branches}
+
+    @staticmethod
+    def _projection_with_field(projection: Optional[Union[Dict[str, Any], Sequence[str]]],
+                               sort_key: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Extend a projection with a field the caller needs from every result
+        (the sort key for page tokens, the id field for read_by_ids).
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], List[str]]: The projection to send and the
+                                                        fields to remove from the results
+        """
+        if projection is None:
+            return None, []
+        if not isinstance(projection, dict):
+            projection = {field: 1 for field in projection}
+        projection = dict(projection)
+        strip_fields = []
+
+        if not projection.get("_id", 1):
+            projection.pop("_id")
+            strip_fields.append("_id")
+        inclusion = any(value and field != "_id" for field, value in projection.items())
+        if sort_key != "_id":
+            if inclusion and not projection.get(sort_key):
+                projection[sort_key] = 1
+                strip_fields.append(sort_key)
+            elif not inclusion and sort_key in projection:
+                projection.pop(sort_key)
+                strip_fields.append(sort_key)
+        return (projection or None), strip_fields
+
+    def read_by_id(self, animal_id: str, projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                   fill_missing: bool = False) -> Optional[Dict[str, Any]]:
         """
         Read a single document by animal_id.
 
-        This is a convenience method that uses the read() method internally
-        but returns a single document instead of a list.
+        Runs one find_one(), which stops at the first match and uses the
+        idx_animal_id index from ensure_indexes(). If several documents share
+        the animal_id, the first in natural order is returned.
 
         Args:
             animal_id (str): The animal_id to search for
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+                                 (default: the whole document)
+            fill_missing (bool): If True, add any AAC field the document lacks with '' or None
 
         Returns:
             Optional[Dict[str, Any]]: The matching document or None if not found
 
+        Raises:
+            Exception: If the query fails due to database errors
+
         Example:
             >>> shelter = AnimalShelter()
-            >>> animal = shelter.read_by_id("A123456")
+            >>> animal = shelter.read_by_id("A123456", projection=["name", "breed"])
             >>> if animal:
             ...     print(f"Found animal: {animal['name']}")
         """
+        query = {"animal_id": animal_id}
         try:
-            documents = self.read({"animal_id": animal_id})
-            return documents[0] if documents else None
+            cache_key = self.query_cache.key(query, projection, operation="find_one") \
+                if self.query_cache is not None else None
+            cached = self.query_cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                document = cached[0] if cached else None
+            else:
+                generation = self.query_cache.generation if cache_key is not None else None
+                with self._profiled("read_by_id", query,
+                                    explain=lambda: self._explain(self._find_command(query, projection, limit=1))):
+                    document = self.collection.find_one(query, projection) if projection is not None \
+                        else self.collection.find_one(query)
+                if cache_key is not None:
+                    self.query_cache.put(cache_key, query, [document] if document is not None else [], generation)
+
+            if document is not None and fill_missing:
+                fill_missing_fields(document, projected_fields(projection))
+            return document
         except Exception as e:
             self.logger.error(f"Error in read_by_id method: {str(e)}")
-            raise
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+    def read_by_ids(self, ids: Sequence[Any], field: str = "animal_id",
+                    projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                    fill_missing: bool = False, chunk_size: int = 1000) -> Dict[Any, Optional[Dict[str, Any]]]:
+        """
+        Read many documents by id with $in queries instead of one query per id.
+
+        Up to chunk_size ids are fetched per round trip. As with read_by_id(),
+        when several documents share an id the first in natural order is returned.
+
+        Args:
+            ids (Sequence[Any]): Ids to look up; repeated ids are fetched once
+            field (str): Field the ids are matched against (default: "animal_id")
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+                                 (default: whole documents)
+            fill_missing (bool): If True, add any AAC field a document lacks with '' or None
+            chunk_size (int): Ids per $in query
+
+        Returns:
+            Dict[Any, Optional[Dict[str, Any]]]: Each requested id, in request order,
+                mapped to its document, or to None if no document has that id
+
+        Raises:
+            ValueError: If ids is not a list of ids or chunk_size is less than 1
+            Exception: If a query fails due to database errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> animals = shelter.read_by_ids(["A1", "A2", "A3"], projection=["name"])
+            >>> missing = [animal_id for animal_id, doc in animals.items() if doc is None]
+        """
+        ids = self._as_list(ids, "ids must be a list of values")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        results = dict.fromkeys(ids)
+        unique_ids = list(results)
+        find_projection, strip_fields = self._projection_with_field(projection, field)
+
+        try:
+            for start in range(0, len(unique_ids), chunk_size):
+                query = {field: {"$in": unique_ids[start:start + chunk_size]}}
+                with self._profiled("read_by_ids", query,
+                                    explain=lambda: self._explain(self._find_command(query, find_projection))):
+                    cursor = self.collection.find(query, find_projection) if find_projection is not None \
+                        else self.collection.find(query)
+                    documents = list(cursor)
+                for document in documents:
+                    key = document.get(field)
+                    if key in results and results[key] is None:
+                        for strip_field in strip_fields:
+                            document.pop(strip_field, None)
+                        results[key] = fill_missing_fields(document, projected_fields(projection)) if fill_missing else document
+        except Exception as e:
+            self.logger.error(f"Database error in read_by_ids method: {str(e)}")
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+        missing = sum(1 for document in results.values() if document is None)
+        self.logger.info(f"read_by_ids found {len(results) - missing} of {len(results)} ids ({missing} missing)")
+        return results
+
+    def rescue_animals(self, category: str, projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                       limit: int = 0, fill_missing: bool = False) -> List[Dict[str, Any]]:
+        """
+        List the animals suited to a Grazioso Salvare rescue category.
+
+        Membership is precomputed in each document's rescue_categories tags
+        (see rescue.py), so this is one equality read on idx_rescue_categories.
+
+        Args:
+            category (str): Category key ('water', 'mountain', 'disaster'), dashboard label or alias
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+            limit (int): Maximum number of documents (0 means no limit)
+            fill_missing (bool): If True, add any AAC field a document lacks with '' or None
+
+        Returns:
+            List[Dict[str, Any]]: The category's animals
+
+        Raises:
+            ValueError: If the category is unknown or limit is negative
+            Exception: If the query fails due to database errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> water_dogs = shelter.rescue_animals("Water Rescue", projection=["name", "breed"], limit=100)
+        """
+        criteria = {RESCUE_CATEGORIES_FIELD: category_key(category)}
+        return list(self.read_iter(criteria, projection=projection, limit=limit, fill_missing=fill_missing))
+
+    def near(self, point: PointLike, max_distance: Optional[float] = None,
+             criteria: Optional[Dict[str, Any]] = None, limit: int = 100,
+             projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Find the animals closest to a point, nearest first.
+
+        The $near query walks the 2dsphere index on location outward from the
+        point, so only the returned documents are read. Documents without
+        coordinates never match.
+
+        Args:
+            point (PointLike): (lat, long) pair or GeoJSON Point
+            max_distance (Optional[float]): Farthest distance in meters (default: no limit)
+            criteria (Optional[Dict[str, Any]]): Other conditions, e.g. {"animal_type": "Dog"}
+            limit (int): Maximum number of documents (0 means no limit)
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+
+        Returns:
+            List[Dict[str, Any]]: Matching documents, nearest first
+
+        Raises:
+            ValueError: If the point, max_distance, criteria or limit is invalid
+            Exception: If the query fails (for example without the 2dsphere index, see ensure_indexes())
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> dogs = shelter.near((30.2672, -97.7431), max_distance=2000, criteria={"animal_type": "Dog"})
+        """
+        return self._geo_read("near", near_filter(point, max_distance), criteria, limit, projection)
+
+    def within(self, area: Union[Sequence[PointLike], Dict[str, Any]], criteria: Optional[Dict[str, Any]] = None,
+               limit: int = 0, projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Find the animals located inside an area, such as the visible part of a map.
+
+        Args:
+            area: Bounding box ((south, west), (north, east)), as in map bounds; a ring of
+                  (lat, long) vertices; or a GeoJSON Polygon or MultiPolygon
+            criteria (Optional[Dict[str, Any]]): Other conditions, e.g. {"animal_type": "Dog"}
+            limit (int): Maximum number of documents (0 means no limit)
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+
+        Returns:
+            List[Dict[str, Any]]: Matching documents, in no particular order
+
+        Raises:
+            ValueError: If the area, criteria or limit is invalid
+            Exception: If the query fails due to database errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> in_view = shelter.within(((30.1, -97.9), (30.5, -97.5)), projection=["name", "location"])
+        """
+        return self._geo_read("within", within_filter(area), criteria, limit, projection)
+
+    def _geo_read(self, operation: str, geo_filter: Dict[str, Any], criteria: Optional[Dict[str, Any]],
+                  limit: int, projection: Optional[Union[Dict[str, Any], Sequence[str]]]) -> List[Dict[str, Any]]:
+        """Run a find() combining a geo filter on location with other criteria."""
+        if criteria is not None and not isinstance(criteria, dict):
+            raise ValueError("Criteria parameter must be a dictionary or None")
+        if criteria and LOCATION_FIELD in criteria:
+            raise ValueError(f"criteria must not filter on '{LOCATION_FIELD}' as well")
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 0:
+            raise ValueError("limit must be a non-negative integer")
+
+        query = {**(criteria or {}), **geo_filter}
+        self.logger.info(f"Geo query ({operation}) with criteria: {criteria or {}} (limit={limit})")
+        try:
+            with self._profiled(operation, query,
+                                explain=lambda: self._explain(self._find_command(query, projection, limit=limit))):
+                cursor = self.collection.find(query, projection) if projection is not None else self.collection.find(query)
+                if limit:
+                    cursor = cursor.limit(limit)
+                documents = list(cursor)
+        except Exception as e:
+            self.logger.error(f"Database error in {operation} method: {str(e)}")
+            raise Exception(f"Failed to run geo query: {str(e)}") from e
+
+        self.logger.info(f"Geo query ({operation}) returned {len(documents)} documents")
+        return documents
+
+    def match_breed_tokens(self, pattern: str) -> List[str]:
+        """
+        Breed tokens in the collection that a regular expression matches, ignoring case.
+
+        This turns a breed regex into a list for an indexed
+        {"breed_tokens": {"$in": [...]}} lookup. The token list comes from
+        distinct() on the breed token index, so only index keys are read.
+        Compute it once per pattern and reuse it.
+
+        Args:
+            pattern (str): Regular expression searched for in each token, e.g. "Labrador|Newfoundland"
+
+        Returns:
+            List[str]: Matching tokens, sorted
+
+        Raises:
+            ValueError: If pattern is not a valid regular expression
+            Exception: If the tokens cannot be read
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> tokens = shelter.match_breed_tokens("Labrador|Newfoundland")
+            >>> dogs = shelter.read({"animal_type": "Dog", "breed_tokens": {"$in": tokens}, "intact": True})
+        """
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except (TypeError, re.error) as e:
+            raise ValueError(f"pattern must be a valid regular expression: {str(e)}") from e
+        try:
+            tokens = self.collection.distinct(BREED_TOKENS_FIELD)
+        except Exception as e:
+            self.logger.error(f"Database error in match_breed_tokens method: {str(e)}")
+            raise Exception(f"Failed to read breed tokens: {str(e)}") from e
+        return sorted(token for token in tokens if isinstance(token, str) and regex.search(token))
+
+    def backfill_breed_tokens(self, batch_size: int = 1000) -> int:
+        """
+        Add breed_tokens, breed_mix and intact to documents written without them.
+
+        Args:
+            batch_size (int): Documents updated per bulk_write round trip
+
+        Returns:
+            int: Number of documents updated
+
+        Raises:
+            ValueError: If batch_size is not positive
+            Exception: If the documents cannot be read or updated
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        criteria = {BREED_TOKENS_FIELD: {"$exists": False}}
+        updated = 0
+        batch: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        try:
+            for document in self.collection.find(criteria, ["breed", "sex_upon_outcome"]).batch_size(batch_size):
+                fields = breed_fields(document.get("breed"), document.get("sex_upon_outcome"))
+                batch.append(({"_id": document["_id"]}, {"$set": fields}))
+                if len(batch) >= batch_size:
+                    updated += self.bulk_update(batch, ordered=False)["modified"]
+                    batch = []
+            if batch:
+                updated += self.bulk_update(batch, ordered=False)["modified"]
+        except Exception as e:
+            self.logger.error(f"Database error in backfill_breed_tokens method: {str(e)}")
+            raise Exception(f"Failed to backfill breed tokens: {str(e)}") from e
+
+        self.logger.info(f"Backfilled breed tokens on {updated} documents")
+        return updated
+
+    def backfill_locations(self) -> int:
+        """
+        Add the location point to documents that have coordinates but no location.
+
+        Documents imported before location was written, or inserted without
+        going through AnimalShelter, need this once before near() and within()
+        can find them. It runs as one server-side pipeline update_many.
+
+        Returns:
+            int: Number of documents updated
+
+        Raises:
+            Exception: If the update fails
+        """
+        criteria = {
+            LOCATION_FIELD: {"$exists": False},
+            # Range conditions only match numbers, so strings and nulls are skipped
+            LAT_FIELD: {"$gte": -90, "$lte": 90},
+            LONG_FIELD: {"$gte": -180, "$lte": 180},
+        }
+        pipeline = [{"$set": {LOCATION_FIELD: {"type": "Point", "coordinates": [f"${LONG_FIELD}", f"${LAT_FIELD}"]}}}]
+        try:
+            with self._profiled("update_many", criteria):
+                result = self.collection.update_many(criteria, pipeline)
+        except Exception as e:
+            self.logger.error(f"Database error in backfill_locations method: {str(e)}")
+            raise Exception(f"Failed to backfill locations: {str(e)}") from e
+        finally:
+            if self.query_cache is not None:
+                self.query_cache.invalidate_updates([(criteria, pipeline)])
+
+        modified = int(result.modified_count or 0)
+        self.logger.info(f"Backfilled location on {modified} documents")
+        return modified
+
+    def refresh_rescue_categories(self, criteria: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Recompute the rescue_categories tags on the server.
+
+        Writes made through AnimalShelter and the importer keep the tags
+        current. This is for documents written some other way (such as
+        mongoimport), or for the whole collection after a category
+        definition changes. It runs as one pipeline update_many.
+
+        Args:
+            criteria (Optional[Dict[str, Any]]): Documents to retag (default: all)
+
+        Returns:
+            int: Number of documents whose tags changed
+
+        Raises:
+            ValueError: If criteria is not a dictionary
+            Exception: If the update fails
+        """
+        if criteria is not None and not isinstance(criteria, dict):
+            raise ValueError("Criteria parameter must be a dictionary or None")
+        query = criteria if criteria is not None else {}
+        pipeline = [{"$set": {RESCUE_CATEGORIES_FIELD: refresh_expression()}}]
+        try:
+            with self._profiled("update_many", query):
+                result = self.collection.update_many(query, pipeline)
+        except Exception as e:
+            self.logger.error(f"Database error in refresh_rescue_categories method: {str(e)}")
+            raise Exception(f"Failed to refresh rescue categories: {str(e)}") from e
+        finally:
+            if self.query_cache is not None:
+                self.query_cache.invalidate_updates([(query, {"$set": {RESCUE_CATEGORIES_FIELD: None}})])
+
+        modified = int(result.modified_count or 0)
+        self.logger.info(f"Refreshed rescue categories on {modified} documents")
+        return modified
+
+    def top_values(self, field: str, criteria: Optional[Dict[str, Any]] = None, k: int = 10,
+                   include_missing: bool = False) -> List[Dict[str, Any]]:
+        """
+        Count the most common values of a field among the matching documents.
+
+        The counting runs on the server as a $group pipeline, so only k rows
+        come back, however many documents match.
+
+        Args:
+            field (str): Field to count, e.g. "breed"
+            criteria (Optional[Dict[str, Any]]): Query criteria. If None, counts all documents.
+            k (int): Number of values to return
+            include_missing (bool): Also count documents where the field is missing, null or ''
+
+        Returns:
+            List[Dict[str, Any]]: [{'value': ..., 'count': n}, ...], most common first
+                                  (ties in value order)
+
+        Raises:
+            ValueError: If field is empty, criteria is not a dictionary or k is less than 1
+            Exception: If the aggregation fails due to database errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> for row in shelter.top_values("breed", {"animal_type": "Dog"}, k=10):
+            ...     print(row["value"], row["count"])
+        """
+        self._check_analytics_args(criteria, [field], k)
+        pipeline = self._match_stage(criteria) + self._top_values_stages(field, k, include_missing)
+        return self._aggregate("top_values", criteria, pipeline)
+
+    def facet_counts(self, fields: Sequence[str], criteria: Optional[Dict[str, Any]] = None,
+                     k: int = 10) -> Dict[str, Any]:
+        """
+        Count the top values of several fields in one round trip.
+
+        All the counts come from one $facet pipeline, which reads the
+        matching documents once.
+
+        Args:
+            fields (Sequence[str]): Fields to count, e.g. ["breed", "outcome_type"]
+            criteria (Optional[Dict[str, Any]]): Query criteria. If None, counts all documents.
+            k (int): Number of values to return per field
+
+        Returns:
+            Dict[str, Any]: 'total' (number of matching documents) and 'facets', which
+                            maps each field to its top_values() rows
+
+        Raises:
+            ValueError: If fields is empty, criteria is not a dictionary or k is less than 1
+            Exception: If the aggregation fails due to database errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> counts = shelter.facet_counts(["breed", "outcome_type"], {"animal_type": "Dog"})
+            >>> counts["total"], counts["facets"]["outcome_type"][0]
+        """
+        fields = self._as_list(fields, "fields must be a list of field names")
+        self._check_analytics_args(criteria, fields, k)
+        facets = {f"f{index}": self._top_values_stages(field, k, False) for index, field in enumerate(fields)}
+        facets["total"] = [{"$count": "count"}]
+        pipeline = self._match_stage(criteria) + [{"$facet": facets}]
+
+        result = (self._aggregate("facet_counts", criteria, pipeline) or [{}])[0]
+        total = result.get("total") or [{"count": 0}]
+        return {
+            "total": total[0]["count"],
+            "facets": {field: result.get(f"f{index}", []) for index, field in enumerate(fields)},
+        }
+
+    def outcome_breakdown(self, criteria: Optional[Dict[str, Any]] = None,
+                          by: str = "animal_type") -> List[Dict[str, Any]]:
+        """
+        Count outcome types for each value of a grouping field.
+
+        Args:
+            criteria (Optional[Dict[str, Any]]): Query criteria. If None, counts all documents.
+            by (str): Field to group by (default: "animal_type")
+
+        Returns:
+            List[Dict[str, Any]]: [{'value': ..., 'total': n, 'outcomes': {'Adoption': n, ...}}, ...],
+                                  largest group first. A missing outcome type is counted under ''.
+
+        Raises:
+            ValueError: If by is empty or criteria is not a dictionary
+            Exception: If the aggregation fails due to database errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> for row in shelter.outcome_breakdown({"breed": {"$regex": "Labrador"}}):
+            ...     print(row["value"], row["total"], row["outcomes"].get("Adoption", 0))
+        """
+        self._check_analytics_args(criteria, [by], 1)
+        pipeline = self._match_stage(criteria) + [
+            {"$group": {"_id": {"value": f"${by}", "outcome": {"$ifNull": ["$outcome_type", ""]}},
+                        "count": {"$sum": 1}}},
+            {"$group": {"_id": "$_id.value", "total": {"$sum": "$count"},
+                        "outcomes": {"$push": {"k": "$_id.outcome", "v": "$count"}}}},
+            {"$sort": {"total": -1, "_id": 1}},
+            {"$project": {"_id": 0, "value": "$_id", "total": 1, "outcomes": {"$arrayToObject": "$outcomes"}}},
+        ]
+        return self._aggregate("outcome_breakdown", criteria, pipeline)
+
+    @staticmethod
+    def _check_analytics_args(criteria: Optional[Dict[str, Any]], fields: List[str], k: int) -> None:
+        if criteria is not None and not isinstance(criteria, dict):
+            raise ValueError("Criteria parameter must be a dictionary or None")
+        if not fields or not all(isinstance(field, str) and field and not field.startswith("$") for field in fields):
+            raise ValueError("fields must be non-empty field names")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+    @staticmethod
+    def _match_stage(criteria: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """A leading $match (which can use an index), or nothing when every document counts."""
+        return [{"$match": criteria}] if criteria else []
+
+    @staticmethod
+    def _top_values_stages(field: str, k: int, include_missing: bool) -> List[Dict[str, Any]]:
+        """Pipeline stages counting the k most common values of field."""
+        stages = [] if include_missing else [{"$match": {field: {"$nin": [None, ""]}}}]
+        return stages + [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": k},
+            {"$project": {"_id": 0, "value": "$_id", "count": 1}},
+        ]
+
+    def _aggregate(self, operation: str, criteria: Optional[Dict[str, Any]],
+                   pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run an analytics pipeline and return its (small) result as a list."""
+        explain_aggregate = {"aggregate": self.COL, "pipeline": pipeline, "cursor": {}}
+        try:
+            with self._profiled(operation, criteria or {}, explain=lambda: self._explain(explain_aggregate)):
+                rows = list(self.collection.aggregate(pipeline))
+        except Exception as e:
+            self.logger.error(f"Database error in {operation} method: {str(e)}")
+            raise Exception(f"Failed to aggregate documents: {str(e)}") from e
+        self.logger.info(f"{operation} returned {len(rows)} rows")
+        return rows
 
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the animals collection.
 
+        With summary stats enabled and built, the document count is read from
+        the summary collection instead of counting the animals collection.
+
         Returns:
             Dict[str, Any]: Collection statistics including document count
         """
         try:
+            if self.summary_stats is not None and self.summary_stats.is_ready():
+                total_documents = self.summary_stats.total()
+            else:
+                total_documents = self.collection.count_documents({})
             stats = {
-                "total_documents": self.collection.count_documents({}),
+                "total_documents": total_documents,
                 "database": self.DB,
                 "collection": self.COL,
                 "connection_host": self.HOST,
@@ -268,15 +1173,296 @@ class AnimalShelter(object):
             self.logger.error(f"Error getting collection stats: {str(e)}")
             raise
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get query cache counters, for sizing the cache in production.
+
+        Returns:
+            Dict[str, Any]: 'enabled', plus QueryCache.stats() (hits, misses,
+                            evictions, expirations, invalidations, hit_rate,
+                            entries, bytes and limits) when the cache is enabled
+        """
+        if self.query_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.query_cache.stats()}
+
+    def get_summary_stats(self, rebuild: bool = False) -> Dict[str, Any]:
+        """
+        Get the per-value document counts kept in the summary collection.
+
+        Args:
+            rebuild (bool): Recount everything from the animals collection first
+                            (needed once before the summary is trusted, and after
+                            writes that bypassed AnimalShelter)
+
+        Returns:
+            Dict[str, Any]: {'enabled': False} without summary stats, otherwise 'enabled'
+                            plus SummaryStats.summary(): 'total_documents', counts per
+                            animal_type, outcome_type, breed and month, 'built_at',
+                            'stale' and 'ready'
+
+        Raises:
+            Exception: If the summary cannot be read or rebuilt
+
+        Example:
+            >>> shelter = AnimalShelter(summary_stats=True)
+            >>> stats = shelter.get_summary_stats()
+            >>> if not stats["ready"]:
+            ...     stats = shelter.get_summary_stats(rebuild=True)
+            >>> print(stats["total_documents"], list(stats["animal_type"]))
+        """
+        if self.summary_stats is None:
+            return {"enabled": False}
+        summary = self.summary_stats.rebuild() if rebuild else self.summary_stats.summary()
+        return {"enabled": True, **summary}
+
+    def profile_report(self, top: int = 10, order_by: str = "total_ms") -> Dict[str, Any]:
+        """
+        Summarize the most expensive query shapes seen by the profiler.
+
+        Args:
+            top (int): Number of query shapes to return
+            order_by (str): 'total_ms', 'max_ms', 'mean_ms', 'count' or 'slow_count'
+
+        Returns:
+            Dict[str, Any]: {'enabled': False} without a profiler, otherwise 'enabled',
+                            the query and slow-query totals and the ranked 'shapes'
+                            (see QueryProfiler.report())
+
+        Example:
+            >>> shelter = AnimalShelter(profiler=True)
+            >>> dogs = shelter.read({"animal_type": "Dog"})
+            >>> for row in shelter.profile_report(top=5)["shapes"]:
+            ...     print(row["operation"], row["shape"], row["total_ms"], row["plan"])
+        """
+        if self.profiler is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.profiler.report(top, order_by)}
+
+    @contextmanager
+    def _profiled(self, operation: str, criteria: Dict[str, Any],
+                  sort: Optional[Sequence[Tuple[str, int]]] = None,
+                  explain: Optional[Callable[[], Dict[str, Any]]] = None) -> Iterator[None]:
+        """Time the MongoDB call in the with block and record it, if profiling is enabled."""
+        if self.profiler is None:
+            yield
+            return
+        start = self.profiler.clock()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration_ms = (self.profiler.clock() - start) * 1000
+            try:
+                self.profiler.record(operation, criteria, duration_ms, sort=sort, explain=explain, error=error)
+            except Exception as record_error:
+                self.logger.warning(f"Failed to record {operation} in the query profiler: {str(record_error)}")
+
+    def _find_command(self, query: Dict[str, Any], projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                      sort: Optional[Sequence[Tuple[str, int]]] = None, limit: int = 0) -> Dict[str, Any]:
+        """The find command equivalent to a find() call, for explain."""
+        command = {"find": self.COL, "filter": query}
+        if projection is not None:
+            command["projection"] = projection if isinstance(projection, dict) else {field: 1 for field in projection}
+        if sort:
+            command["sort"] = dict(sort)
+        if limit:
+            command["limit"] = limit
+        return command
+
+    def _explain(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the explain command with executionStats verbosity (writes are not applied)."""
+        return self.database.command("explain", command, verbosity="executionStats")
+
+    def _update_snapshot(self, criteria: Dict[str, Any], update_values: Any,
+                         many: bool) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]], Optional[List[Any]]]:
+        """
+        Read the documents an update may change, before the update.
+
+        A single-document update reads only the first match and is pinned
+        to its _id, so the snapshot, the write and the refresh all see the
+        same document.
+
+        Returns:
+            Tuple: The criteria to update with, the summary snapshot (None when
+                   counts are unaffected or could not be read) and the _ids whose
+                   derived fields to refresh (None when _refresh_stage() is empty)
+        """
+        limit = 0 if many else 1
+        before = self._summary_snapshot(criteria, limit=limit) \
+            if self.summary_stats is not None and SummaryStats.affected_by(update_values) else None
+        refresh_ids = None
+        if self._refresh_stage(update_values):
+            refresh_ids = [document["_id"] for document in before] if before is not None \
+                else self._refresh_snapshot(criteria, limit=limit)
+        matched = before if before is not None else [{"_id": _id} for _id in refresh_ids or []]
+        if matched and not many:
+            # Update exactly the document whose counts were read and whose derived fields will be refreshed
+            criteria = {"$and": [criteria, {"_id": matched[0]["_id"]}]}
+        return criteria, before, refresh_ids
+
+    def _bulk_update_snapshot(self, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]], many: bool) \
+            -> Tuple[List[Tuple[Dict[str, Any], Dict[str, Any]]], Optional[List[Dict[str, Any]]], List[Any]]:
+        """
+        Read the documents a bulk update may change, as _update_snapshot() does for one pair.
+
+        UpdateMany pairs share one $or read. UpdateOne pairs are read and
+        pinned one at a time, so each reads a single document instead of
+        every match.
+
+        Returns:
+            Tuple: The (possibly pinned) pairs, the summary snapshot (None when
+                   counts are unaffected or could not be read) and the _ids whose
+                   derived fields to refresh
+        """
+        summary_pairs = self.summary_stats is not None and \
+            any(SummaryStats.affected_by(update_values) for _, update_values in updates)
+        refresh_pairs = any(self._refresh_stage(update_values) for _, update_values in updates)
+        if not updates or not (summary_pairs or refresh_pairs):
+            return updates, None, []
+        if many:
+            query = {"$or": [criteria for criteria, _ in updates]}
+            before = self._summary_snapshot(query) if summary_pairs else None
+            # Refreshing is idempotent, so every document matching any of the filters may be refreshed
+            refresh_ids = ([document["_id"] for document in before] if before is not None
+                          else self._refresh_snapshot(query) or []) if refresh_pairs else []
+            return updates, before, refresh_ids
+
+        pinned, snapshots, refresh_ids, complete = [], {}, [], True
+        for criteria, update_values in updates:
+            criteria, before, ids = self._update_snapshot(criteria, update_values, many=False)
+            pinned.append((criteria, update_values))
+            if before is None and self.summary_stats is not None and SummaryStats.affected_by(update_values):
+                complete = False
+            # Pairs pinned to the same document count it once
+            snapshots.update((document["_id"], document) for document in before or [])
+            refresh_ids.extend(ids or [])
+        before = list(snapshots.values()) if summary_pairs and complete else None
+        return pinned, before, list(dict.fromkeys(refresh_ids))
+
+    @staticmethod
+    def _bulk_refresh_stage(updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> Dict[str, Any]:
+        """The _refresh_stage() fields of every pair, applied to every refreshed document (refreshing is idempotent)."""
+        return {field: expression for _, update_values in updates
+                for field, expression in AnimalShelter._refresh_stage(update_values).items()}
+
+    def _refresh_snapshot(self, criteria: Dict[str, Any], limit: int = 0) -> Optional[List[Any]]:
+        """_ids of the documents whose derived fields an update may leave stale, read before the update."""
+        try:
+            cursor = self.collection.find(criteria, ["_id"])
+            if limit:
+                cursor = cursor.limit(limit)
+            return [document["_id"] for document in cursor]
+        except Exception as e:
+            self.logger.warning(f"Failed to read documents to refresh, derived fields may be stale: {str(e)}")
+            return None
+
+    @staticmethod
+    def _refresh_stage(update_values: Any) -> Dict[str, Any]:
+        """
+        Derived fields an update may leave stale, with the expressions that recompute them.
+
+        rescue_categories depends on three source fields. location only needs
+        this when the update changes a coordinate in a way location_updates()
+        cannot mirror, such as setting one coordinate or unsetting one.
+
+        Returns:
+            Dict[str, Any]: {field: expression} for a $set stage (empty when nothing is stale)
+        """
+        stage = {}
+        if affects_rescue_categories(update_values):
+            stage[RESCUE_CATEGORIES_FIELD] = refresh_expression()
+        if location_needs_refresh(update_values):
+            stage[LOCATION_FIELD] = location_expression()
+        return stage
+
+    def _refresh_derived(self, ids: Optional[List[Any]], stage: Dict[str, Any]) -> None:
+        """
+        Recompute derived fields on the documents with the given _ids after a write.
+
+        The write has already happened, so a failure is logged rather than
+        raised. refresh_rescue_categories() and backfill_locations() repair
+        the fields.
+        """
+        if not ids or not stage:
+            return
+        pipeline = [{"$set": stage}]
+        for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+            chunk = ids[start:start + REFRESH_CHUNK_SIZE]
+            query = {"_id": {"$in": chunk}}
+            try:
+                with self._profiled("update_many", query):
+                    self.collection.update_many(query, pipeline)
+            except Exception as e:
+                self.logger.warning(f"{', '.join(stage)} may be stale for {len(chunk)} documents: {str(e)}")
+            finally:
+                if self.query_cache is not None:
+                    self.query_cache.invalidate_updates([(query, {"$set": dict.fromkeys(stage)})])
+
+    def _summary_snapshot(self, criteria: Dict[str, Any], limit: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """Counted fields of the documents a write may change, read before the write (None on failure)."""
+        snapshot: List[List[Dict[str, Any]]] = []
+        if self.summary_stats.apply_safely(lambda stats: snapshot.append(stats.snapshot(criteria, limit))):
+            return snapshot[0]
+        return None
+
+    def _summary_record_changes(self, before: Optional[List[Dict[str, Any]]], new_ids: Sequence[Any] = ()) -> None:
+        """
+        Apply the count deltas of a write from its before snapshot and a re-read of the same documents.
+
+        Re-reading by _id also covers writes that failed part way. Documents
+        written by other clients between the snapshot and the write are not
+        counted; get_summary_stats(rebuild=True) corrects any such drift.
+        """
+        if before is None:
+            return
+        ids = [document["_id"] for document in before] + list(new_ids)
+        self.summary_stats.apply_safely(lambda stats: stats.record_changes(before, stats.snapshot_ids(ids)))
+
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get on-disk and in-memory size statistics for the animals collection.
+
+        Sizes are in bytes, as reported by the collStats command. Use this to
+        compare collection and index size before and after a sparse import.
+
+        Returns:
+            Dict[str, Any]: Document count, data size, average document size,
+                            storage size, total index size and per-index sizes
+
+        Raises:
+            Exception: If the collStats command fails
+        """
+        try:
+            stats = self.database.command("collStats", self.COL)
+            return {
+                "count": stats.get("count", 0),
+                "size": stats.get("size", 0),
+                "avg_obj_size": stats.get("avgObjSize", 0),
+                "storage_size": stats.get("storageSize", 0),
+                "total_index_size": stats.get("totalIndexSize", 0),
+                "index_sizes": dict(stats.get("indexSizes", {}))
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting storage stats: {str(e)}")
+            raise Exception(f"Failed to get storage stats: {str(e)}") from e
+
     def close_connection(self) -> None:
         """
         Close the MongoDB connection.
 
         This method should be called when the AnimalShelter object is no longer needed
-        to properly clean up database connections.
+        to properly clean up database connections. A shared client stays open for
+        other instances; close_all_clients() closes it.
         """
         try:
             if hasattr(self, 'client'):
+                if self.shared_client:
+                    self.logger.info("Released shared MongoDB connection")
+                    return
                 self.client.close()
                 self.logger.info("MongoDB connection closed successfully")
         except Exception as e:
@@ -306,12 +1492,23 @@ class AnimalShelter(object):
             if not any(str(k).startswith("$") for k in update_values.keys()):
                 raise ValueError("update_values must contain at least one MongoDB update operator (e.g., $set, $unset, $inc)")
 
+            update_values = self._with_derived_updates(update_values)
             self.logger.info(f"Updating documents with criteria: {criteria} using operators: {list(update_values.keys())} (many={many})")
 
-            if many:
-                result = self.collection.update_many(criteria, update_values)
-            else:
-                result = self.collection.update_one(criteria, update_values)
+            criteria, before, refresh_ids = self._update_snapshot(criteria, update_values, many)
+            explain_update = {"update": self.COL, "updates": [{"q": criteria, "u": update_values, "multi": many}]}
+            try:
+                with self._profiled("update_many" if many else "update_one", criteria,
+                                    explain=lambda: self._explain(explain_update)):
+                    if many:
+                        result = self.collection.update_many(criteria, update_values)
+                    else:
+                        result = self.collection.update_one(criteria, update_values)
+            finally:
+                if self.query_cache is not None:
+                    self.query_cache.invalidate_updates([(criteria, update_values)])
+                self._summary_record_changes(before)
+                self._refresh_derived(refresh_ids, self._refresh_stage(update_values))
 
             modified = int(result.modified_count or 0)
             self.logger.info(f"Update modified_count: {modified}")
@@ -344,10 +1541,23 @@ class AnimalShelter(object):
 
             self.logger.info(f"Deleting documents with criteria: {criteria} (many={many})")
 
-            if many:
-                result = self.collection.delete_many(criteria)
-            else:
-                result = self.collection.delete_one(criteria)
+            explain_delete = {"delete": self.COL, "deletes": [{"q": criteria, "limit": 0 if many else 1}]}
+            before = self._summary_snapshot(criteria, limit=0 if many else 1) \
+                if self.summary_stats is not None else None
+            if before and not many:
+                # Delete exactly the document whose counts were read
+                criteria = {"$and": [criteria, {"_id": before[0]["_id"]}]}
+            try:
+                with self._profiled("delete_many" if many else "delete_one", criteria,
+                                    explain=lambda: self._explain(explain_delete)):
+                    if many:
+                        result = self.collection.delete_many(criteria)
+                    else:
+                        result = self.collection.delete_one(criteria)
+            finally:
+                if self.query_cache is not None:
+                    self.query_cache.invalidate_deletes([criteria])
+                self._summary_record_changes(before)
 
             deleted = int(result.deleted_count or 0)
             self.logger.info(f"Delete deleted_count: {deleted}")
@@ -359,24 +1569,328 @@ class AnimalShelter(object):
             self.logger.error(f"Database error in delete method: {str(e)}")
             raise Exception(f"Failed to delete documents: {str(e)}") from e
 
+    def create_many(self, documents: Sequence[Dict[str, Any]], ordered: bool = True) -> Dict[str, Any]:
+        """
+        Insert many documents with bulk_write instead of one create() per document.
+
+        Args:
+            documents (Sequence[Dict[str, Any]]): Non-empty documents to insert
+            ordered (bool): If True, stop at the first failed insert; if False,
+                            attempt every insert and report all failures
+
+        Returns:
+            Dict[str, Any]: Result summary (see _bulk_summary)
+
+        Raises:
+            ValueError: If documents is not a sequence of non-empty dictionaries
+            Exception: If the bulk write fails for a reason other than individual write errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> summary = shelter.create_many([{"animal_id": "A1"}, {"animal_id": "A2"}], ordered=False)
+            >>> print(summary["inserted"], summary["errors"])
+        """
+        documents = self._as_list(documents, "documents must be a list of dictionaries")
+        operations = self._insert_operations(documents)
+        self.logger.info(f"Bulk inserting {len(operations)} documents (ordered={ordered})")
+        summary = self._bulk_write(operations, ordered, "insert documents",
+                                   lambda cache: cache.invalidate_inserts(documents))
+        if self.summary_stats is not None and summary["inserted"]:
+            inserted = self._inserted_documents(documents, summary, ordered)
+            self.summary_stats.apply_safely(lambda stats: stats.record_inserts(inserted))
+        return summary
+
+    def bulk_update(self, updates: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]], ordered: bool = True,
+                    many: bool = False, upsert: bool = False) -> Dict[str, Any]:
+        """
+        Apply many (filter, update) pairs in bulk_write batches.
+
+        Args:
+            updates (Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]): (criteria, update spec)
+                pairs; each update spec must use MongoDB update operators (e.g. $set)
+            ordered (bool): If True, stop at the first failed update; if False,
+                            attempt every update and report all failures
+            many (bool): If True, each pair updates every matching document
+                         (UpdateMany); otherwise the first match (UpdateOne)
+            upsert (bool): Insert a document when a filter matches nothing
+
+        Returns:
+            Dict[str, Any]: Result summary (see _bulk_summary)
+
+        Raises:
+            ValueError: If a pair has a non-dict filter or an update without operators
+            Exception: If the bulk write fails for a reason other than individual write errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> fixes = [({"animal_id": "A1"}, {"$set": {"name": "Max"}}),
+            ...          ({"animal_id": "A2"}, {"$unset": {"outcome_subtype": ""}})]
+            >>> summary = shelter.bulk_update(fixes, ordered=False)
+        """
+        updates = self._as_list(updates, "updates must be a list of (criteria, update_values) pairs")
+        operations = self._update_operations(updates, many, upsert)
+        pinned, before, refresh_ids = self._bulk_update_snapshot(updates, many)
+        if pinned is not updates:
+            operations = self._update_operations(pinned, many, upsert)
+        self.logger.info(f"Bulk updating with {len(operations)} operations (ordered={ordered}, many={many})")
+        summary = self._bulk_write(operations, ordered, "update documents",
+                                   lambda cache: cache.invalidate_updates(updates))
+        self._summary_record_changes(before, list(summary["upserted_ids"].values()))
+        self._refresh_derived((refresh_ids or []) + list(summary["upserted_ids"].values()),
+                              self._bulk_refresh_stage(updates))
+        return summary
+
+    def delete_by_ids(self, ids: Sequence[Any], field: str = "_id", ordered: bool = True,
+                      chunk_size: int = 1000) -> Dict[str, Any]:
+        """
+        Delete every document whose field value is in ids.
+
+        The ids are sent as one DeleteMany({field: {"$in": chunk}}) per chunk of
+        chunk_size ids, so error indexes in the summary refer to chunks.
+
+        Args:
+            ids (Sequence[Any]): Values to delete by, e.g. ObjectIds or animal_ids
+            field (str): Field the ids are matched against (default: "_id")
+            ordered (bool): If True, stop at the first failed chunk
+            chunk_size (int): Ids per DeleteMany operation
+
+        Returns:
+            Dict[str, Any]: Result summary (see _bulk_summary)
+
+        Raises:
+            ValueError: If ids is not a list of ids or chunk_size is less than 1
+            Exception: If the bulk write fails for a reason other than individual write errors
+
+        Example:
+            >>> shelter = AnimalShelter()
+            >>> summary = shelter.delete_by_ids(["A1", "A2"], field="animal_id")
+            >>> print(summary["deleted"])
+        """
+        ids = self._as_list(ids, "ids must be a list of values")
+        operations = self._delete_operations(ids, field, chunk_size)
+        self.logger.info(f"Bulk deleting {len(ids)} ids on '{field}' in {len(operations)} operations (ordered={ordered})")
+        before = self._summary_snapshot({field: {"$in": ids}}) if self.summary_stats is not None and ids else None
+        summary = self._bulk_write(operations, ordered, "delete documents",
+                                   lambda cache: cache.invalidate_deletes([{field: {"$in": ids}}]))
+        self._summary_record_changes(before)
+        return summary
+
+    @staticmethod
+    def _as_list(values: Any, message: str) -> List[Any]:
+        """Materialize a bulk method's input, rejecting None or a lone dict or string."""
+        if values is None or isinstance(values, (dict, str, bytes)):
+            raise ValueError(message)
+        return list(values)
+
+    @staticmethod
+    def _insert_operations(documents: List[Dict[str, Any]]) -> List[InsertOne]:
+        """Validate create_many() documents and build their InsertOne operations."""
+        operations = []
+        for index, document in enumerate(documents):
+            if not isinstance(document, dict) or not document:
+                raise ValueError(f"documents[{index}] must be a non-empty dictionary")
+            operations.append(InsertOne(AnimalShelter._add_derived_fields(document)))
+        return operations
+
+    @staticmethod
+    def _update_operations(updates: List[Tuple[Dict[str, Any], Dict[str, Any]]], many: bool,
+                           upsert: bool) -> List[Union[UpdateOne, UpdateMany]]:
+        """Validate bulk_update() pairs and build their UpdateOne/UpdateMany operations."""
+        operation_class = UpdateMany if many else UpdateOne
+        operations = []
+        for index, pair in enumerate(updates):
+            if not isinstance(pair, (tuple, list)) or len(pair) != 2:
+                raise ValueError(f"updates[{index}] must be a (criteria, update_values) pair")
+            criteria, update_values = pair
+            if not isinstance(criteria, dict):
+                raise ValueError(f"updates[{index}]: criteria must be a dictionary")
+            if not isinstance(update_values, dict) or not any(str(k).startswith("$") for k in update_values):
+                raise ValueError(f"updates[{index}]: update_values must contain at least one MongoDB update "
+                                 f"operator (e.g., $set, $unset, $inc)")
+            operations.append(operation_class(criteria, AnimalShelter._with_derived_updates(update_values),
+                                              upsert=upsert))
+        return operations
+
+    @staticmethod
+    def _inserted_documents(documents: List[Dict[str, Any]], summary: Dict[str, Any],
+                            ordered: bool) -> List[Dict[str, Any]]:
+        """The documents a create_many() bulk write inserted, from its result summary."""
+        failed = {error["index"] for error in summary["errors"]}
+        # An ordered bulk write stops at its first error
+        attempted = documents[:min(failed)] if ordered and failed else documents
+        return [document for index, document in enumerate(attempted) if index not in failed]
+
+    @staticmethod
+    def _add_derived_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the breed token, intact, rescue category and location fields to a document about to be inserted."""
+        return add_location(add_rescue_categories(add_breed_fields(document)))
+
+    @staticmethod
+    def _with_derived_updates(update_values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extend an update that sets breed, sex_upon_outcome or both coordinates to keep the derived fields current.
+
+        Other coordinate changes are refreshed after the write (see _refresh_stage()).
+
+        Derived fields the update already names are left as the caller wrote them.
+        """
+        set_values = update_values.get("$set")
+        if not isinstance(set_values, dict):
+            return update_values
+        mentioned = {field for fields in update_values.values() if isinstance(fields, dict) for field in fields}
+        merged = dict(update_values)
+        for derived in (breed_field_updates(set_values), location_updates(update_values)):
+            for operator, fields in derived.items():
+                fields = {field: value for field, value in fields.items() if field not in mentioned}
+                if fields:
+                    merged[operator] = {**merged.get(operator, {}), **fields}
+        return merged
+
+    @staticmethod
+    def _delete_operations(ids: List[Any], field: str, chunk_size: int) -> List[DeleteMany]:
+        """Build one DeleteMany per chunk of ids."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        return [DeleteMany({field: {"$in": ids[start:start + chunk_size]}})
+                for start in range(0, len(ids), chunk_size)]
+
+    def _bulk_write(self, operations: List[Any], ordered: bool, action: str,
+                    invalidate: Optional[Callable[[QueryCache], Any]] = None) -> Dict[str, Any]:
+        """Run operations as one bulk_write, drop affected cached reads and summarize the outcome."""
+        if not operations:
+            return self._bulk_summary(0)
+        try:
+            try:
+                result = self.collection.bulk_write(operations, ordered=ordered)
+            finally:
+                # Also after errors: some operations of a failed bulk write may have been applied
+                if self.query_cache is not None and invalidate is not None:
+                    invalidate(self.query_cache)
+            summary = self._bulk_summary(len(operations), result=result)
+        except BulkWriteError as bwe:
+            summary = self._bulk_summary(len(operations), details=bwe.details or {}, ordered=ordered)
+            for error in summary['errors']:
+                self.logger.error(f"Bulk operation {error['index']} failed: {error['message']}")
+        except Exception as e:
+            self.logger.error(f"Database error in bulk write: {str(e)}")
+            raise Exception(f"Failed to {action}: {str(e)}") from e
+
+        self.logger.info(f"Bulk write summary: {self._bulk_log_line(summary)}")
+        return summary
+
+    @staticmethod
+    def _bulk_summary(requested: int, result: Any = None, details: Optional[Dict[str, Any]] = None,
+                      ordered: bool = True) -> Dict[str, Any]:
+        """
+        Summarize a bulk_write from its BulkWriteResult or BulkWriteError details.
+
+        Returns:
+            Dict[str, Any]: requested, inserted, matched, modified, deleted and
+                            upserted counts; upserted_ids (operation index -> _id);
+                            failed; not_attempted (operations after the first
+                            failure of an ordered write); and errors, a list of
+                            {index, code, message} per failed operation
+        """
+        summary = {
+            "requested": requested, "inserted": 0, "matched": 0, "modified": 0, "deleted": 0,
+            "upserted": 0, "upserted_ids": {}, "failed": 0, "not_attempted": 0, "errors": []
+        }
+        if result is not None:
+            summary.update(
+                inserted=result.inserted_count, matched=result.matched_count,
+                modified=result.modified_count, deleted=result.deleted_count,
+                upserted=result.upserted_count, upserted_ids=dict(result.upserted_ids or {})
+            )
+        elif details is not None:
+            write_errors = details.get("writeErrors", [])
+            summary.update(
+                inserted=int(details.get("nInserted", 0)), matched=int(details.get("nMatched", 0)),
+                modified=int(details.get("nModified", 0)), deleted=int(details.get("nRemoved", 0)),
+                upserted=int(details.get("nUpserted", 0)),
+                upserted_ids={u["index"]: u["_id"] for u in details.get("upserted", [])},
+                failed=len(write_errors),
+                errors=[{"index": e.get("index"), "code": e.get("code"), "message": e.get("errmsg", "Unknown error")}
+                        for e in write_errors]
+            )
+            summary["errors"] += [{"index": None, "code": e.get("code"), "message": e.get("errmsg", "Unknown error")}
+                                  for e in details.get("writeConcernErrors", [])]
+            if ordered and write_errors:
+                summary["not_attempted"] = requested - write_errors[0]["index"] - 1
+        return summary
+
+    @staticmethod
+    def _bulk_log_line(summary: Dict[str, Any]) -> str:
+        """One-line summary of a bulk write for the log."""
+        counts = ("inserted", "matched", "modified", "deleted", "upserted", "failed", "not_attempted")
+        return ", ".join(f"{key}={summary[key]}" for key in counts if summary[key]) or "no changes"
+
     def ensure_indexes(self) -> None:
         """
         Create recommended indexes to optimize common queries.
         Safe to call multiple times.
+
+        These are a fixed baseline. advise_indexes() proposes compound
+        indexes for the queries the application actually runs.
+
+        An index is skipped when the collection already has one on the same
+        key pattern (for example the importer's unique natural key index),
+        since MongoDB allows only one index per key pattern.
         """
         try:
             self.logger.info("Ensuring indexes on common query fields...")
-            # Not enforcing unique to avoid conflicts with existing datasets unless guaranteed unique
-            self.collection.create_index([("animal_id", 1)], name="idx_animal_id")
-            self.collection.create_index([("animal_type", 1)], name="idx_animal_type")
-            self.collection.create_index([("breed", 1)], name="idx_breed")
-            self.collection.create_index([("outcome_type", 1)], name="idx_outcome_type")
-            self.collection.create_index([("age_upon_outcome", 1)], name="idx_age_upon_outcome")
+            existing_patterns = {
+                tuple(key_pattern(info['key'])) for info in self.collection.index_information().values()
+            }
+            for name, keys in self.RECOMMENDED_INDEXES:
+                if tuple(keys) not in existing_patterns:
+                    self.collection.create_index(keys, name=name)
             self.logger.info("Indexes ensured successfully.")
         except Exception as e:
             # Index creation failures should not crash the app; log as warning
             self.logger.warning(f"Failed to create indexes: {e}")
 
+    def advise_indexes(self, build: bool = False, drop_replaced: bool = False,
+                       sparse_ratio: float = 0.5, min_count: int = 1) -> Dict[str, Any]:
+        """
+        Propose indexes for the profiled workload and flag indexes that only cost writes.
+
+        Proposals come from the query shapes recorded by the profiler, so
+        create the AnimalShelter with profiler=True and run a representative
+        workload first. See IndexAdvisor for how keys are chosen.
+
+        Args:
+            build (bool): Create the proposed indexes
+            drop_replaced (bool): With build, also drop the existing indexes that a new
+                                  index makes redundant
+            sparse_ratio (float): Make an index partial on fields present in fewer than
+                                  this fraction of documents (0 disables partial indexes)
+            min_count (int): Ignore query shapes recorded fewer times than this
+
+        Returns:
+            Dict[str, Any]: 'proposals' (see IndexAdvisor.recommend()), 'unused' (see
+                            IndexAdvisor.unused_indexes()), and 'created' and 'dropped'
+                            index names
+
+        Raises:
+            ValueError: If profiling is not enabled
+            Exception: If index statistics cannot be read or an index cannot be built
+
+        Example:
+            >>> shelter = AnimalShelter(profiler=True)
+            >>> ...  # run the dashboard or a replay of its queries
+            >>> advice = shelter.advise_indexes()
+            >>> for proposal in advice["proposals"]:
+            ...     print(proposal["name"], proposal["keys"], proposal["queries"])
+        """
+        if self.profiler is None:
+            raise ValueError("advise_indexes() needs query profiling; create the AnimalShelter with profiler=True")
+
+        advisor = IndexAdvisor(self.collection, self.profiler, sparse_ratio=sparse_ratio,
+                               min_count=min_count, logger=self.logger)
+        proposals = advisor.recommend()
+        changes = advisor.apply(proposals, drop_unused=drop_replaced) if build else {"created": [], "dropped": []}
+        return {"proposals": proposals, "unused": advisor.unused_indexes(), **changes}
+
     def __enter__(self):
         """Context manager entry point."""
         return self
@@ -407,9 +1921,9 @@ if __name__ == "__main__":
         create_result = shelter.create(test_animal)
         print(f"Create operation result: {create_result}")
 
-        # Test read method
-        all_animals = shelter.read()
-        print(f"Total animals in collection: {len(all_animals)}")
+        # Test read method (streamed, so large collections are not loaded into memory)
+        total_animals = sum(1 for _ in shelter.read_iter(projection={"_id": 1}, batch_size=1000))
+        print(f"Total animals in collection: {total_animals}")
 
         # Test read with criteria
         dogs = shelter.read({"animal_type": "Dog"})
@@ -0,0 +1,696 @@
+"""
+Asyncio AnimalShelter CRUD Operations Module
+CS 340 Module Four Milestone
+
+This module implements the AnimalShelter CRUD operations as coroutines on
+Motor, the asyncio MongoDB driver. A request handler waiting on MongoDB
+yields to the event loop instead of holding a worker thread, so one loop and
+one connection pool can serve hundreds of concurrent queries.
+
+The methods take the same arguments, validate them the same way and return
+the same values as AnimalShelter; test_crud_contract.py runs one suite
+against both classes.
+
+Requirements following EARS format:
+- The AsyncAnimalShelter class shall provide the AnimalShelter CRUD operations as coroutines
+- When a coroutine is awaited with invalid arguments, the AsyncAnimalShelter shall raise the same ValueError as AnimalShelter
+- When connect() is awaited and MongoDB is unreachable, the AsyncAnimalShelter shall raise ConnectionError
+- While queries are awaiting MongoDB, the AsyncAnimalShelter shall not block the event loop
+- When create_many(), bulk_update() or delete_by_ids() is awaited, the AsyncAnimalShelter shall return the same result summary as AnimalShelter
+- When a document is written, the AsyncAnimalShelter shall keep its derived fields, such as location and rescue_categories, current as AnimalShelter does
+- Where summary stats are enabled, when a write is awaited, the AsyncAnimalShelter shall apply the write's count deltas as AnimalShelter does
+"""
+
+import logging
+import os
+import sys
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from pymongo.errors import BulkWriteError
+
+from .animal_shelter import AnimalShelter, connection_settings
+from .client_registry import client_options_from_env
+from .index_advisor import key_pattern
+from .rescue import REFRESH_CHUNK_SIZE
+from .schema import fill_missing_fields, projected_fields
+from .summary_stats import AsyncSummaryStats
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    HAS_MOTOR = True
+except ImportError:  # pragma: no cover - depends on the environment
+    AsyncIOMotorClient = None
+    HAS_MOTOR = False
+
+
+class AsyncAnimalShelter(object):
+    """
+    Asyncio CRUD operations for Animal collection in MongoDB
+
+    Create one instance per application (or per event loop) and share it
+    between request handlers; the Motor client pools connections internally.
+    Motor clients are bound to the event loop they first run on, so an
+    instance must not be shared across loops.
+    """
+
+    def __init__(self, user: str = None, password: str = None, host: str = None, port: int = None,
+                 check_connection: Optional[bool] = None, client_options: Optional[Dict[str, Any]] = None,
+                 summary_stats: Optional[Union[bool, AsyncSummaryStats]] = None):
+        """
+        Initialize the AsyncAnimalShelter. No I/O happens until the first
+        coroutine is awaited; use `async with` or connect() to check the
+        connection up front.
+
+        Args:
+            user (str): Username for authentication (default: from environment).
+            password (str): Password for authentication (default: from environment).
+            host (str): MongoDB host address (default: from environment).
+            port (int): MongoDB port number (default: from environment).
+            check_connection (Optional[bool]): Ping the server on `async with` entry
+                (default: MONGO_CHECK_CONNECTION env var or True).
+            client_options (Optional[Dict[str, Any]]): Extra client options such as
+                maxPoolSize, on top of the MONGO_* pool and timeout env vars.
+            summary_stats (Optional[Union[bool, AsyncSummaryStats]]): Keep the summary counts
+                that AnimalShelter.get_summary_stats() reads current with every write
+                (default: SUMMARY_STATS env var or False).
+
+        Raises:
+            ImportError: If Motor is not installed
+            ConnectionError: If the client cannot be created
+        """
+        if AsyncIOMotorClient is None:
+            raise ImportError("AsyncAnimalShelter requires Motor: pip install motor")
+
+        settings = connection_settings(user, password, host, port)
+        self.USER = settings['user']
+        self.PASS = settings['password']
+        self.HOST = settings['host']
+        self.PORT = settings['port']
+        self.DB = settings['database']
+        self.COL = settings['collection']
+        if check_connection is None:
+            check_connection = os.getenv('MONGO_CHECK_CONNECTION', 'true').lower() in ('1', 'true', 'yes')
+        self.check_connection = bool(check_connection)
+
+        self._setup_logging()
+
+        try:
+            options = {**client_options_from_env(), **(client_options or {})}
+            self.client = AsyncIOMotorClient(settings['connection_string'], **options)
+            self.database = self.client[self.DB]
+            self.collection = self.database[self.COL]
+            if isinstance(summary_stats, AsyncSummaryStats):
+                self.summary_stats = summary_stats
+            else:
+                if summary_stats is None:
+                    summary_stats = os.getenv('SUMMARY_STATS', 'false').lower() in ('1', 'true', 'yes')
+                self.summary_stats = AsyncSummaryStats.for_collection(self.database, self.COL, self.logger) \
+                    if summary_stats else None
+        except Exception as e:
+            self.logger.error(f"Failed to create MongoDB client: {str(e)}")
+            raise ConnectionError(f"Unable to connect to MongoDB at {self.HOST}:{self.PORT}") from e
+
+    @classmethod
+    async def open(cls, *args, **kwargs) -> 'AsyncAnimalShelter':
+        """
+        Create an AsyncAnimalShelter and check its connection.
+
+        Takes the same arguments as the constructor.
+
+        Returns:
+            AsyncAnimalShelter: A connected instance
+
+        Raises:
+            ConnectionError: If unable to connect to MongoDB
+        """
+        shelter = cls(*args, **kwargs)
+        if shelter.check_connection:
+            await shelter.connect()
+        return shelter
+
+    def _setup_logging(self) -> None:
+        """Configure logging for the AsyncAnimalShelter class."""
+        self.logger = logging.getLogger(__name__)
+        log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+        self.logger.setLevel(getattr(logging, log_level, logging.INFO))
+
+        if not self.logger.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setLevel(logging.INFO)
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+
+    async def connect(self) -> None:
+        """
+        Ping the server and check that the collection exists.
+
+        Raises:
+            ConnectionError: If unable to connect to MongoDB
+        """
+        try:
+            await self.client.admin.command('ping')
+            self.logger.info(f"Successfully connected to MongoDB at {self.HOST}:{self.PORT}")
+
+            if self.COL not in await self.database.list_collection_names():
+                self.logger.warning(f"Collection '{self.COL}' does not exist. It will be created on first insert.")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to MongoDB: {str(e)}")
+            raise ConnectionError(f"Unable to connect to MongoDB at {self.HOST}:{self.PORT}") from e
+
+    async def create(self, data: Dict[str, Any]) -> bool:
+        """
+        Insert one document (see AnimalShelter.create).
+
+        Args:
+            data (Dict[str, Any]): Document data to insert into the collection.
+
+        Returns:
+            bool: True if successful insert, False otherwise
+
+        Raises:
+            ValueError: If data is None, empty or not a dictionary
+            Exception: If insertion fails due to database errors
+        """
+        try:
+            if data is None:
+                raise ValueError("Data parameter cannot be None")
+
+            if not isinstance(data, dict):
+                raise ValueError("Data parameter must be a dictionary")
+
+            if not data:
+                raise ValueError("Data parameter cannot be empty")
+
+            self.logger.info(f"Attempting to insert document: {list(data.keys())}")
+
+            AnimalShelter._add_derived_fields(data)
+            result = await self.collection.insert_one(data)
+
+            if result.inserted_id:
+                self.logger.info(f"Successfully inserted document with ID: {result.inserted_id}")
+                if self.summary_stats is not None:
+                    await self.summary_stats.apply_safely(lambda stats: stats.record_inserts([data]))
+                return True
+            else:
+                self.logger.error("Insert operation completed but no document ID returned")
+                return False
+
+        except ValueError as ve:
+            self.logger.error(f"Validation error in create method: {str(ve)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Database error in create method: {str(e)}")
+            raise Exception(f"Failed to insert document: {str(e)}") from e
+
+    async def read(self, criteria: Optional[Dict[str, Any]] = None, fill_missing: bool = False,
+                   projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Return matching documents as a list (see AnimalShelter.read).
+
+        Args:
+            criteria (Optional[Dict[str, Any]]): Query criteria. If None, returns all documents.
+            fill_missing (bool): If True, add any AAC field a document lacks with '' or None
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return,
+                                 as a find() projection or a list of field names
+
+        Returns:
+            List[Dict[str, Any]]: List of matching documents. Empty list if no matches found.
+
+        Raises:
+            ValueError: If criteria is not a dictionary when provided
+            Exception: If query fails due to database errors
+        """
+        try:
+            if criteria is not None and not isinstance(criteria, dict):
+                raise ValueError("Criteria parameter must be a dictionary or None")
+
+            query = criteria if criteria is not None else {}
+
+            if criteria:
+                self.logger.info(f"Querying documents with criteria: {criteria}")
+            else:
+                self.logger.info("Querying all documents")
+
+            cursor = self.collection.find(query, projection) if projection is not None else self.collection.find(query)
+            documents = await cursor.to_list(length=None)
+            if fill_missing:
+                for document in documents:
+                    fill_missing_fields(document, projected_fields(projection))
+
+            self.logger.info(f"Query returned {len(documents)} documents")
+            return documents
+
+        except ValueError as ve:
+            self.logger.error(f"Validation error in read method: {str(ve)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Database error in read method: {str(e)}")
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+    def read_iter(self, criteria: Optional[Dict[str, Any]] = None,
+                  projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                  sort: Optional[Union[str, Sequence[Tuple[str, int]]]] = None,
+                  limit: int = 0, batch_size: Optional[int] = None,
+                  fill_missing: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream matching documents with `async for` (see AnimalShelter.read_iter).
+
+        Arguments are validated when read_iter() is called; the query runs on
+        first iteration.
+
+        Args:
+            criteria (Optional[Dict[str, Any]]): Query criteria. If None, matches all documents.
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+            sort (Optional[Union[str, Sequence[Tuple[str, int]]]]): A field name (ascending) or
+                                                                    a list of (field, direction) pairs
+            limit (int): Maximum number of documents to return (0 means no limit)
+            batch_size (Optional[int]): Documents fetched per server round trip
+            fill_missing (bool): If True, add any AAC field a document lacks with '' or None
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Async generator over the matching documents
+
+        Raises:
+            ValueError: If criteria is not a dictionary, or limit or batch_size is negative
+            Exception: If the query fails due to database errors (raised while iterating)
+        """
+        if criteria is not None and not isinstance(criteria, dict):
+            raise ValueError("Criteria parameter must be a dictionary or None")
+        if limit < 0:
+            raise ValueError("limit must not be negative")
+        if batch_size is not None and batch_size < 0:
+            raise ValueError("batch_size must not be negative")
+
+        query = criteria if criteria is not None else {}
+        self.logger.info(f"Streaming documents with criteria: {query}")
+        return self._iter_cursor(query, projection, sort, limit, batch_size, fill_missing)
+
+    async def _iter_cursor(self, query: Dict[str, Any], projection, sort, limit: int,
+                           batch_size: Optional[int], fill_missing: bool) -> AsyncIterator[Dict[str, Any]]:
+        """Run a find() and yield its documents (the async generator behind read_iter)."""
+        try:
+            cursor = self.collection.find(query, projection) if projection is not None else self.collection.find(query)
+            if sort is not None:
+                cursor = cursor.sort(sort)
+            if limit:
+                cursor = cursor.limit(limit)
+            if batch_size:
+                cursor = cursor.batch_size(batch_size)
+
+            try:
+                async for document in cursor:
+                    yield fill_missing_fields(document, projected_fields(projection)) if fill_missing else document
+            finally:
+                await cursor.close()
+
+        except Exception as e:
+            self.logger.error(f"Database error in read_iter method: {str(e)}")
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+    async def read_by_id(self, animal_id: str, projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                         fill_missing: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Read a single animal by its animal_id with one find_one() (see AnimalShelter.read_by_id).
+
+        Args:
+            animal_id (str): The animal_id to search for
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+            fill_missing (bool): If True, add any AAC field the document lacks with '' or None
+
+        Returns:
+            Optional[Dict[str, Any]]: The matching document or None if not found
+        """
+        query = {"animal_id": animal_id}
+        try:
+            document = await (self.collection.find_one(query, projection) if projection is not None
+                              else self.collection.find_one(query))
+            if document is not None and fill_missing:
+                fill_missing_fields(document, projected_fields(projection))
+            return document
+        except Exception as e:
+            self.logger.error(f"Error in read_by_id method: {str(e)}")
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+    async def read_by_ids(self, ids: Sequence[Any], field: str = "animal_id",
+                          projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+                          fill_missing: bool = False, chunk_size: int = 1000) -> Dict[Any, Optional[Dict[str, Any]]]:
+        """
+        Read many documents by id with $in queries (see AnimalShelter.read_by_ids).
+
+        Args:
+            ids (Sequence[Any]): Ids to look up; repeated ids are fetched once
+            field (str): Field the ids are matched against (default: "animal_id")
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): Fields to return
+            fill_missing (bool): If True, add any AAC field a document lacks with '' or None
+            chunk_size (int): Ids per $in query
+
+        Returns:
+            Dict[Any, Optional[Dict[str, Any]]]: Each requested id mapped to its document or None
+        """
+        ids = AnimalShelter._as_list(ids, "ids must be a list of values")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        results = dict.fromkeys(ids)
+        unique_ids = list(results)
+        find_projection, strip_fields = AnimalShelter._projection_with_field(projection, field)
+
+        try:
+            for start in range(0, len(unique_ids), chunk_size):
+                query = {field: {"$in": unique_ids[start:start + chunk_size]}}
+                cursor = self.collection.find(query, find_projection) if find_projection is not None \
+                    else self.collection.find(query)
+                async for document in cursor:
+                    key = document.get(field)
+                    if key in results and results[key] is None:
+                        for strip_field in strip_fields:
+                            document.pop(strip_field, None)
+                        results[key] = fill_missing_fields(document, projected_fields(projection)) if fill_missing else document
+        except Exception as e:
+            self.logger.error(f"Database error in read_by_ids method: {str(e)}")
+            raise Exception(f"Failed to query documents: {str(e)}") from e
+
+        missing = sum(1 for document in results.values() if document is None)
+        self.logger.info(f"read_by_ids found {len(results) - missing} of {len(results)} ids ({missing} missing)")
+        return results
+
+    async def get_collection_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the animals collection.
+
+        Returns:
+            Dict[str, Any]: Collection statistics including document count
+        """
+        try:
+            return {
+                "total_documents": await self.collection.count_documents({}),
+                "database": self.DB,
+                "collection": self.COL,
+                "connection_host": self.HOST,
+                "connection_port": self.PORT
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting collection stats: {str(e)}")
+            raise
+
+    async def update(self, criteria: Dict[str, Any], update_values: Dict[str, Any], many: bool = False) -> int:
+        """
+        Update matching documents (see AnimalShelter.update).
+
+        Args:
+            criteria (Dict[str, Any]): Query filter for documents to update.
+            update_values (Dict[str, Any]): MongoDB update spec (e.g., {"$set": {...}}).
+            many (bool): If True, update many documents; otherwise update one.
+
+        Returns:
+            int: Number of documents modified.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            Exception: If the database update fails.
+        """
+        try:
+            if criteria is None or not isinstance(criteria, dict):
+                raise ValueError("Criteria parameter must be a non-empty dictionary")
+            if not isinstance(update_values, dict) or not update_values:
+                raise ValueError("update_values must be a non-empty dictionary containing MongoDB update operators (e.g., $set)")
+            if not any(str(k).startswith("$") for k in update_values.keys()):
+                raise ValueError("update_values must contain at least one MongoDB update operator (e.g., $set, $unset, $inc)")
+
+            update_values = AnimalShelter._with_derived_updates(update_values)
+            self.logger.info(f"Updating documents with criteria: {criteria} using operators: {list(update_values.keys())} (many={many})")
+
+            criteria, before, refresh_ids = await self._update_snapshot(criteria, update_values, many)
+            try:
+                if many:
+                    result = await self.collection.update_many(criteria, update_values)
+                else:
+                    result = await self.collection.update_one(criteria, update_values)
+            finally:
+                await self._summary_record_changes(before)
+                await self._refresh_derived(refresh_ids, AnimalShelter._refresh_stage(update_values))
+
+            modified = int(result.modified_count or 0)
+            self.logger.info(f"Update modified_count: {modified}")
+            return modified
+
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Database error in update method: {str(e)}")
+            raise Exception(f"Failed to update documents: {str(e)}") from e
+
+    async def delete(self, criteria: Dict[str, Any], many: bool = False) -> int:
+        """
+        Delete matching documents (see AnimalShelter.delete).
+
+        Args:
+            criteria (Dict[str, Any]): Query filter for documents to delete.
+            many (bool): If True, delete many documents; otherwise delete one.
+
+        Returns:
+            int: Number of documents deleted.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            Exception: If the database delete fails.
+        """
+        try:
+            if criteria is None or not isinstance(criteria, dict):
+                raise ValueError("Criteria parameter must be a non-empty dictionary")
+
+            self.logger.info(f"Deleting documents with criteria: {criteria} (many={many})")
+
+            before = await self._summary_snapshot(criteria, limit=0 if many else 1) \
+                if self.summary_stats is not None else None
+            if before and not many:
+                # Delete exactly the document whose counts were read
+                criteria = {"$and": [criteria, {"_id": before[0]["_id"]}]}
+            try:
+                if many:
+                    result = await self.collection.delete_many(criteria)
+                else:
+                    result = await self.collection.delete_one(criteria)
+            finally:
+                await self._summary_record_changes(before)
+
+            deleted = int(result.deleted_count or 0)
+            self.logger.info(f"Delete deleted_count: {deleted}")
+            return deleted
+
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Database error in delete method: {str(e)}")
+            raise Exception(f"Failed to delete documents: {str(e)}") from e
+
+    async def create_many(self, documents: Sequence[Dict[str, Any]], ordered: bool = True) -> Dict[str, Any]:
+        """
+        Insert many documents with bulk_write (see AnimalShelter.create_many).
+
+        Args:
+            documents (Sequence[Dict[str, Any]]): Non-empty documents to insert
+            ordered (bool): If True, stop at the first failed insert
+
+        Returns:
+            Dict[str, Any]: Result summary (see AnimalShelter._bulk_summary)
+        """
+        documents = AnimalShelter._as_list(documents, "documents must be a list of dictionaries")
+        operations = AnimalShelter._insert_operations(documents)
+        self.logger.info(f"Bulk inserting {len(operations)} documents (ordered={ordered})")
+        summary = await self._bulk_write(operations, ordered, "insert documents")
+        if self.summary_stats is not None and summary["inserted"]:
+            inserted = AnimalShelter._inserted_documents(documents, summary, ordered)
+            await self.summary_stats.apply_safely(lambda stats: stats.record_inserts(inserted))
+        return summary
+
+    async def bulk_update(self, updates: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]], ordered: bool = True,
+                          many: bool = False, upsert: bool = False) -> Dict[str, Any]:
+        """
+        Apply many (filter, update) pairs with bulk_write (see AnimalShelter.bulk_update).
+
+        Args:
+            updates (Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]): (criteria, update spec) pairs
+            ordered (bool): If True, stop at the first failed update
+            many (bool): If True, each pair updates every matching document
+            upsert (bool): Insert a document when a filter matches nothing
+
+        Returns:
+            Dict[str, Any]: Result summary (see AnimalShelter._bulk_summary)
+        """
+        updates = AnimalShelter._as_list(updates, "updates must be a list of (criteria, update_values) pairs")
+        operations = AnimalShelter._update_operations(updates, many, upsert)
+        pinned, before, refresh_ids = await self._bulk_update_snapshot(updates, many)
+        if pinned is not updates:
+            operations = AnimalShelter._update_operations(pinned, many, upsert)
+        self.logger.info(f"Bulk updating with {len(operations)} operations (ordered={ordered}, many={many})")
+        summary = await self._bulk_write(operations, ordered, "update documents")
+        await self._summary_record_changes(before, list(summary["upserted_ids"].values()))
+        await self._refresh_derived((refresh_ids or []) + list(summary["upserted_ids"].values()),
+                                    AnimalShelter._bulk_refresh_stage(updates))
+        return summary
+
+    async def delete_by_ids(self, ids: Sequence[Any], field: str = "_id", ordered: bool = True,
+                            chunk_size: int = 1000) -> Dict[str, Any]:
+        """
+        Delete every document whose field value is in ids (see AnimalShelter.delete_by_ids).
+
+        Args:
+            ids (Sequence[Any]): Values to delete by, e.g. ObjectIds or animal_ids
+            field (str): Field the ids are matched against (default: "_id")
+            ordered (bool): If True, stop at the first failed chunk
+            chunk_size (int): Ids per DeleteMany operation
+
+        Returns:
+            Dict[str, Any]: Result summary (see AnimalShelter._bulk_summary)
+        """
+        ids = AnimalShelter._as_list(ids, "ids must be a list of values")
+        operations = AnimalShelter._delete_operations(ids, field, chunk_size)
+        self.logger.info(f"Bulk deleting {len(ids)} ids on '{field}' in {len(operations)} operations (ordered={ordered})")
+        before = await self._summary_snapshot({field: {"$in": ids}}) \
+            if self.summary_stats is not None and ids else None
+        summary = await self._bulk_write(operations, ordered, "delete documents")
+        await self._summary_record_changes(before)
+        return summary
+
+    async def _update_snapshot(self, criteria: Dict[str, Any], update_values: Any, many: bool) \
+            -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]], Optional[List[Any]]]:
+        """Read the documents an update may change and pin a single-document update (see AnimalShelter._update_snapshot)."""
+        limit = 0 if many else 1
+        before = await self._summary_snapshot(criteria, limit=limit) \
+            if self.summary_stats is not None and AsyncSummaryStats.affected_by(update_values) else None
+        refresh_ids = None
+        if AnimalShelter._refresh_stage(update_values):
+            refresh_ids = [document["_id"] for document in before] if before is not None \
+                else await self._refresh_snapshot(criteria, limit=limit)
+        matched = before if before is not None else [{"_id": _id} for _id in refresh_ids or []]
+        if matched and not many:
+            criteria = {"$and": [criteria, {"_id": matched[0]["_id"]}]}
+        return criteria, before, refresh_ids
+
+    async def _bulk_update_snapshot(self, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]], many: bool) \
+            -> Tuple[List[Tuple[Dict[str, Any], Dict[str, Any]]], Optional[List[Dict[str, Any]]], List[Any]]:
+        """Read and pin the documents a bulk update may change (see AnimalShelter._bulk_update_snapshot)."""
+        summary_pairs = self.summary_stats is not None and \
+            any(AsyncSummaryStats.affected_by(update_values) for _, update_values in updates)
+        refresh_pairs = any(AnimalShelter._refresh_stage(update_values) for _, update_values in updates)
+        if not updates or not (summary_pairs or refresh_pairs):
+            return updates, None, []
+        if many:
+            query = {"$or": [criteria for criteria, _ in updates]}
+            before = await self._summary_snapshot(query) if summary_pairs else None
+            refresh_ids = ([document["_id"] for document in before] if before is not None
+                          else await self._refresh_snapshot(query) or []) if refresh_pairs else []
+            return updates, before, refresh_ids
+
+        pinned, snapshots, refresh_ids, complete = [], {}, [], True
+        for criteria, update_values in updates:
+            criteria, before, ids = await self._update_snapshot(criteria, update_values, many=False)
+            pinned.append((criteria, update_values))
+            if before is None and self.summary_stats is not None and AsyncSummaryStats.affected_by(update_values):
+                complete = False
+            snapshots.update((document["_id"], document) for document in before or [])
+            refresh_ids.extend(ids or [])
+        before = list(snapshots.values()) if summary_pairs and complete else None
+        return pinned, before, list(dict.fromkeys(refresh_ids))
+
+    async def _summary_snapshot(self, criteria: Dict[str, Any], limit: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """Counted fields of the documents a write may change, read before the write (None on failure)."""
+        snapshot: List[List[Dict[str, Any]]] = []
+
+        async def read(stats: AsyncSummaryStats) -> None:
+            snapshot.append(await stats.snapshot(criteria, limit))
+
+        return snapshot[0] if await self.summary_stats.apply_safely(read) else None
+
+    async def _summary_record_changes(self, before: Optional[List[Dict[str, Any]]],
+                                      new_ids: Sequence[Any] = ()) -> None:
+        """Apply a write's count deltas from its before snapshot (see AnimalShelter._summary_record_changes)."""
+        if before is None:
+            return
+        ids = [document["_id"] for document in before] + list(new_ids)
+
+        async def record(stats: AsyncSummaryStats) -> None:
+            await stats.record_changes(before, await stats.snapshot_ids(ids))
+
+        await self.summary_stats.apply_safely(record)
+
+    async def _refresh_snapshot(self, criteria: Dict[str, Any], limit: int = 0) -> Optional[List[Any]]:
+        """_ids of the documents whose derived fields an update may leave stale (see AnimalShelter._refresh_snapshot)."""
+        try:
+            cursor = self.collection.find(criteria, ["_id"])
+            if limit:
+                cursor = cursor.limit(limit)
+            return [document["_id"] async for document in cursor]
+        except Exception as e:
+            self.logger.warning(f"Failed to read documents to refresh, derived fields may be stale: {str(e)}")
+            return None
+
+    async def _refresh_derived(self, ids: Optional[List[Any]], stage: Dict[str, Any]) -> None:
+        """Recompute derived fields on the given _ids after a write, logging rather than raising failures."""
+        if not ids or not stage:
+            return
+        pipeline = [{"$set": stage}]
+        for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+            chunk = ids[start:start + REFRESH_CHUNK_SIZE]
+            try:
+                await self.collection.update_many({"_id": {"$in": chunk}}, pipeline)
+            except Exception as e:
+                self.logger.warning(f"{', '.join(stage)} may be stale for {len(chunk)} documents: {str(e)}")
+
+    async def _bulk_write(self, operations: List[Any], ordered: bool, action: str) -> Dict[str, Any]:
+        """Run operations as one bulk_write and summarize the outcome."""
+        if not operations:
+            return AnimalShelter._bulk_summary(0)
+        try:
+            result = await self.collection.bulk_write(operations, ordered=ordered)
+            summary = AnimalShelter._bulk_summary(len(operations), result=result)
+        except BulkWriteError as bwe:
+            summary = AnimalShelter._bulk_summary(len(operations), details=bwe.details or {}, ordered=ordered)
+            for error in summary['errors']:
+                self.logger.error(f"Bulk operation {error['index']} failed: {error['message']}")
+        except Exception as e:
+            self.logger.error(f"Database error in bulk write: {str(e)}")
+            raise Exception(f"Failed to {action}: {str(e)}") from e
+
+        self.logger.info(f"Bulk write summary: {AnimalShelter._bulk_log_line(summary)}")
+        return summary
+
+    async def ensure_indexes(self) -> None:
+        """
+        Create the indexes AnimalShelter.ensure_indexes() recommends.
+        Safe to call multiple times; failures are logged, not raised.
+        """
+        try:
+            self.logger.info("Ensuring indexes on common query fields...")
+            existing_patterns = {
+                tuple(key_pattern(info['key'])) for info in (await self.collection.index_information()).values()
+            }
+            for name, keys in AnimalShelter.RECOMMENDED_INDEXES:
+                if tuple(keys) not in existing_patterns:
+                    await self.collection.create_index(keys, name=name)
+            self.logger.info("Indexes ensured successfully.")
+        except Exception as e:
+            self.logger.warning(f"Failed to create indexes: {e}")
+
+    def close_connection(self) -> None:
+        """Close the Motor client and its connection pool."""
+        try:
+            if hasattr(self, 'client'):
+                self.client.close()
+                self.logger.info("MongoDB connection closed successfully")
+        except Exception as e:
+            self.logger.error(f"Error closing MongoDB connection: {str(e)}")
+
+    async def __aenter__(self):
+        """Async context manager entry point; checks the connection if enabled."""
+        if self.check_connection:
+            await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit point."""
+        self.close_connection()
@@ -0,0 +1,135 @@
+"""
+Breed Tokens and Intact Flag for AAC Documents
+CS 340 Module Four Milestone
+
+Rescue filters used to match breed and sex_upon_outcome with unanchored,
+case-insensitive regular expressions, which no index can serve. Documents
+now also carry fields that equality lookups can use:
+
+- breed_tokens: the lowercase base breeds, e.g. "Labrador Retriever/Pit Bull Mix"
+  gives ['labrador retriever', 'pit bull']
+- breed_mix: True for a mix ("... Mix" or two breeds joined by '/')
+- intact: True for "Intact ...", False for "Neutered ..." or "Spayed ...",
+  and absent when the sex is unknown
+
+breed_tokens is an array, so an index on it is multikey and
+{breed_tokens: {$in: [...]}} is an indexed equality lookup.
+
+Requirements following EARS format:
+- When a document has a breed, add_breed_fields() shall store its lowercase base breeds in breed_tokens and whether it is a mix in breed_mix
+- When a document's sex_upon_outcome says Intact, Neutered or Spayed, add_breed_fields() shall store the matching intact flag
+- If sex_upon_outcome is unknown or missing, add_breed_fields() shall leave intact unset
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+BREED_FIELD = 'breed'
+SEX_FIELD = 'sex_upon_outcome'
+
+BREED_TOKENS_FIELD = 'breed_tokens'
+BREED_MIX_FIELD = 'breed_mix'
+INTACT_FIELD = 'intact'
+
+# Suffix AAC appends to a breed of unknown mix
+MIX_SUFFIX = ' mix'
+# Separator between the breeds of a known mix
+BREED_SEPARATOR = '/'
+
+
+def breed_tokens(breed: Any) -> Tuple[List[str], bool]:
+    """
+    Split an AAC breed into lowercase base breeds and a mix flag.
+
+    Args:
+        breed (Any): Breed text, e.g. "Labrador Retriever/Pit Bull Mix"
+
+    Returns:
+        Tuple[List[str], bool]: Base breeds in their original order, each once, and
+                                whether the breed is a mix ([] and False for no breed)
+    """
+    if not isinstance(breed, str):
+        return [], False
+    text = ' '.join(breed.lower().split())
+    mix = text.endswith(MIX_SUFFIX) or text == MIX_SUFFIX.strip()
+    if text.endswith(MIX_SUFFIX):
+        text = text[:-len(MIX_SUFFIX)]
+    tokens = []
+    for token in text.split(BREED_SEPARATOR):
+        token = token.strip()
+        if token and token != MIX_SUFFIX.strip() and token not in tokens:
+            tokens.append(token)
+    return tokens, mix or len(tokens) > 1
+
+
+def is_intact(sex_upon_outcome: Any) -> Optional[bool]:
+    """
+    Whether an animal was intact at outcome, from its sex_upon_outcome.
+
+    Returns:
+        Optional[bool]: True for "Intact ...", False for "Neutered ..." or "Spayed ...",
+                        None when unknown
+    """
+    if not isinstance(sex_upon_outcome, str):
+        return None
+    status = sex_upon_outcome.strip().lower()
+    if status.startswith('intact'):
+        return True
+    if status.startswith(('neutered', 'spayed')):
+        return False
+    return None
+
+
+def breed_fields(breed: Any, sex_upon_outcome: Any) -> Dict[str, Any]:
+    """
+    The derived fields for a breed and sex_upon_outcome.
+
+    Returns:
+        Dict[str, Any]: breed_tokens and breed_mix, plus intact when it is known
+    """
+    tokens, mix = breed_tokens(breed)
+    fields: Dict[str, Any] = {BREED_TOKENS_FIELD: tokens, BREED_MIX_FIELD: mix}
+    intact = is_intact(sex_upon_outcome)
+    if intact is not None:
+        fields[INTACT_FIELD] = intact
+    return fields
+
+
+def add_breed_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add breed_tokens, breed_mix and intact to a document, in place.
+
+    Fields the document already has are kept.
+
+    Returns:
+        Dict[str, Any]: The same document, for chaining
+    """
+    if BREED_FIELD in document or SEX_FIELD in document:
+        for field, value in breed_fields(document.get(BREED_FIELD), document.get(SEX_FIELD)).items():
+            document.setdefault(field, value)
+    return document
+
+
+def breed_field_updates(set_values: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Keep the derived fields current for an update that sets breed or sex_upon_outcome.
+
+    Args:
+        set_values (Dict[str, Any]): The update's $set document
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Update operators to merge into the update: $set for
+                                   breed_tokens, breed_mix and a known intact status,
+                                   $unset for intact when the new status is unknown
+                                   (empty when neither source field is set)
+    """
+    updates: Dict[str, Dict[str, Any]] = {}
+    if BREED_FIELD in set_values:
+        tokens, mix = breed_tokens(set_values[BREED_FIELD])
+        updates.setdefault('$set', {}).update({BREED_TOKENS_FIELD: tokens, BREED_MIX_FIELD: mix})
+    if SEX_FIELD in set_values:
+        intact = is_intact(set_values[SEX_FIELD])
+        if intact is None:
+            updates['$unset'] = {INTACT_FIELD: ''}
+        else:
+            updates.setdefault('$set', {})[INTACT_FIELD] = intact
+    return updates
@@ -0,0 +1,112 @@
+"""
+Shared MongoClient Registry
+CS 340 Module Four Milestone
+
+A MongoClient owns a connection pool and background monitor threads, and is
+meant to be created once per process and reused. This module keeps one client
+per (connection string, client options, process) so AnimalShelter instances
+created with shared_client=True reuse a warm pool instead of opening a new
+one each time.
+
+Requirements following EARS format:
+- When get_client() is called twice with the same connection parameters, the MongoClientRegistry shall return the same client
+- When a process is forked, the MongoClientRegistry shall create new clients in the child rather than reuse the parent's
+- When close_all() is called, the MongoClientRegistry shall close and forget every client
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+# Environment variables mapped to MongoClient pool and timeout options
+CLIENT_OPTION_ENV_VARS = {
+    'MONGO_MAX_POOL_SIZE': 'maxPoolSize',
+    'MONGO_MIN_POOL_SIZE': 'minPoolSize',
+    'MONGO_MAX_IDLE_TIME_MS': 'maxIdleTimeMS',
+    'MONGO_CONNECT_TIMEOUT_MS': 'connectTimeoutMS',
+    'MONGO_SERVER_SELECTION_TIMEOUT_MS': 'serverSelectionTimeoutMS',
+    'MONGO_SOCKET_TIMEOUT_MS': 'socketTimeoutMS',
+}
+
+
+def client_options_from_env() -> Dict[str, int]:
+    """
+    Read MongoClient pool size and timeout options from the environment.
+
+    Returns:
+        Dict[str, int]: MongoClient keyword arguments for the variables that are set
+    """
+    return {
+        option: int(os.environ[env_var])
+        for env_var, option in CLIENT_OPTION_ENV_VARS.items()
+        if os.getenv(env_var)
+    }
+
+
+class MongoClientRegistry:
+    """
+    Process-wide cache of MongoClient instances keyed by connection parameters.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._clients: Dict[Tuple, Any] = {}
+        self._checked: set = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(connection_string: str, options: Dict[str, Any]) -> Tuple:
+        # The pid keeps forked children (e.g. preloaded web workers) from sharing the parent's sockets
+        return (os.getpid(), connection_string, tuple(sorted(options.items())))
+
+    def get_client(self, connection_string: str, factory: Callable[..., Any],
+                   options: Dict[str, Any] = None) -> Any:
+        """
+        Return the shared client for these connection parameters, creating it once.
+
+        Args:
+            connection_string (str): MongoDB connection string
+            factory (Callable[..., Any]): Client constructor, normally pymongo.MongoClient
+            options (Dict[str, Any]): MongoClient keyword arguments (pool size, timeouts)
+
+        Returns:
+            Any: The shared client
+        """
+        options = options or {}
+        key = self._key(connection_string, options)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory(connection_string, **options)
+                self._clients[key] = client
+            return client
+
+    def is_checked(self, client: Any) -> bool:
+        """Whether a health check has already passed for this client."""
+        return id(client) in self._checked
+
+    def mark_checked(self, client: Any) -> None:
+        """Record that a health check passed for this client."""
+        self._checked.add(id(client))
+
+    def close_all(self) -> None:
+        """Close and forget every client held by the registry."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._checked.clear()
+        for client in clients:
+            client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+# Registry shared by every AnimalShelter in this process
+client_registry = MongoClientRegistry()
+
+
+def close_all_clients() -> None:
+    """Close every shared MongoClient (call at application shutdown)."""
+    client_registry.close_all()
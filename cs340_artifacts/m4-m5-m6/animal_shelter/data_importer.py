@@ -6,16 +6,144 @@ This module provides functionality to import the AAC shelter outcomes CSV file
 into MongoDB using the AnimalShelter CRUD operations.
 """
 
+import numpy as np
 import pandas as pd
+import csv
+import hashlib
+import json
 import logging
 import sys
 import os
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from tqdm import tqdm
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Set, Tuple
 import time
+from pymongo import ASCENDING, InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
 
-from .animal_shelter import AnimalShelter
+from .animal_shelter import AnimalShelter, load_environment
+from .breeds import BREED_FIELD, SEX_FIELD, breed_fields
+from .client_registry import close_all_clients
+from .geo import LAT_FIELD, LOCATION_FIELD, LONG_FIELD
+from .index_advisor import key_pattern as index_key_pattern
+from .rescue import ANIMAL_TYPE_FIELD, RESCUE_CATEGORIES_FIELD, RESCUE_SOURCE_FIELDS, rescue_categories
+from .schema import AAC_COLUMN_SCHEMA
+from .snapshot_cache import CsvSnapshotCache, HAS_PYARROW
+from .summary_stats import SOURCE_FIELDS as SUMMARY_FIELDS
+
+
+# Supported write strategies for import_data()
+IMPORT_STRATEGIES = ('bulk', 'single', 'delta', 'upsert')
+
+# Strategies that are keyed on the natural key and safe to re-run over existing data
+KEYED_STRATEGIES = ('delta', 'upsert')
+
+# Name of the unique index backing the natural key
+NATURAL_KEY_INDEX = 'idx_natural_key'
+
+# Document field holding the fingerprint of an imported record's content
+CONTENT_HASH_FIELD = 'content_hash'
+
+# CSV parse engines accepted by AACDataImporter ('auto' picks pyarrow when installed)
+CSV_ENGINES = ('auto', 'c', 'pyarrow')
+
+# DataFrame.attrs flag marking a frame whose columns are already typed by _apply_schema
+TYPED_FRAME_ATTR = 'aac_typed'
+
+# Resolved CSV locations, keyed by the search path list (see _find_csv_file)
+_CSV_PATH_CACHE: Dict[str, Path] = {}
+
+# Weeks per unit for parsing free-text ages such as "3 years" or "2 weeks"
+AGE_UNIT_WEEKS = {
+    'day': 1 / 7,
+    'week': 1.0,
+    'month': 365.25 / 12 / 7,
+    'year': 365.25 / 7,
+}
+
+# Counters that only some write strategies report, summed into the import stats
+OPTIONAL_BATCH_COUNTERS = ('inserted', 'updated', 'unchanged')
+
+
+def compute_content_hash(record: Dict[str, Any]) -> str:
+    """
+    Fingerprint the content of a cleaned record.
+    
+    The hash covers every field except _id and the hash itself, in sorted key
+    order. Empty values are skipped, so a record hashes the same whether or
+    not blank fields are stored.
+    
+    Args:
+        record (Dict[str, Any]): Cleaned record
+    
+    Returns:
+        str: Hex digest of the record content
+    """
+    content = {
+        key: value for key, value in record.items()
+        if key not in ('_id', CONTENT_HASH_FIELD) and value is not None and value != ''
+    }
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def parse_age_weeks(ages: pd.Series) -> pd.Series:
+    """
+    Vectorized conversion of AAC age strings ("2 years", "1 month") to weeks.
+    
+    Args:
+        ages (pd.Series): Free-text ages as found in age_upon_outcome
+    
+    Returns:
+        pd.Series: Age in weeks as floats, NaN where the text cannot be parsed
+    """
+    parts = ages.astype(str).str.strip().str.lower().str.extract(r'^(\d+(?:\.\d+)?)\s*([a-z]+?)s?$')
+    return pd.to_numeric(parts[0], errors='coerce') * parts[1].map(AGE_UNIT_WEEKS)
+
+
+class SeenKeySet:
+    """
+    Compact set of record keys seen so far during a streaming import.
+    
+    Keys are stored as 64-bit hashes in sorted NumPy arrays (8 bytes per key)
+    instead of Python strings, so de-duplicating millions of animal_ids stays
+    small. New keys are kept as separate sorted runs that are merged
+    pairwise as they grow, like a binary counter. Adding a key is therefore
+    amortized O(log n) and there are never more than O(log n) runs to search.
+    A 64-bit hash collision would drop one record; at ten million keys the
+    odds are roughly one in a million.
+    """
+    
+    def __init__(self):
+        """Initialize an empty key set."""
+        self._runs: List[np.ndarray] = []
+    
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+    
+    @staticmethod
+    def hash_keys(keys: pd.Series) -> np.ndarray:
+        """Vectorized 64-bit hash of a Series of keys."""
+        return pd.util.hash_pandas_object(keys.astype(str), index=False).to_numpy(dtype=np.uint64)
+    
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Return a boolean mask of which hashes have already been seen."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == hashes
+        return found
+    
+    def add(self, hashes: np.ndarray) -> None:
+        """Add hashes to the set."""
+        if len(hashes) == 0:
+            return
+        self._runs.append(np.unique(hashes))
+        while len(self._runs) > 1 and len(self._runs[-1]) >= len(self._runs[-2]):
+            newest = self._runs.pop()
+            self._runs[-1] = np.union1d(self._runs[-1], newest)
 
 
 class AACDataImporter:
@@ -26,18 +154,54 @@ class AACDataImporter:
     MongoDB using the AnimalShelter CRUD operations.
     """
     
-    def __init__(self, csv_path: Optional[str] = None):
+    def __init__(self, csv_path: Optional[str] = None, natural_key: Optional[Sequence[str]] = None,
+                 sparse: Optional[bool] = None, snapshot_dir: Optional[str] = None,
+                 csv_engine: Optional[str] = None):
         """
         Initialize the AAC data importer.
         
         Args:
             csv_path (Optional[str]): Path to the AAC CSV file. If None, will look
                                     in common locations including /usr/local/datasets/
+            natural_key (Optional[Sequence[str]]): Fields that identify one record, used
+                                                   for de-duplication and by the delta and
+                                                   upsert strategies (default:
+                                                   IMPORT_NATURAL_KEY env var or 'animal_id')
+            sparse (Optional[bool]): If True, leave missing fields out of the documents
+                                     instead of storing '' or null placeholders
+                                     (default: IMPORT_SPARSE env var or False)
+            snapshot_dir (Optional[str]): Directory for typed columnar snapshots of the
+                                          CSV; later loads of an unchanged CSV skip parsing
+                                          (default: SNAPSHOT_CACHE_DIR env var, unset disables)
+            csv_engine (Optional[str]): CSV parser for load_csv_data(): 'c' (pandas,
+                                        single-threaded), 'pyarrow' (multi-threaded) or
+                                        'auto' (default: CSV_ENGINE env var or 'auto')
+        
+        Raises:
+            ValueError: If natural_key is empty or csv_engine is unknown
         """
+        load_environment()
         self.csv_path = self._find_csv_file(csv_path)
         self.shelter = None
+        if natural_key is None:
+            natural_key = os.getenv('IMPORT_NATURAL_KEY', 'animal_id').split(',')
+        self.natural_key: Tuple[str, ...] = tuple(field.strip().lower() for field in natural_key if field.strip())
+        if not self.natural_key:
+            raise ValueError("natural_key must name at least one field")
+        if sparse is None:
+            sparse = os.getenv('IMPORT_SPARSE', 'false').lower() in ('1', 'true', 'yes')
+        self.sparse = bool(sparse)
         self._setup_logging()
         
+        if snapshot_dir is None:
+            snapshot_dir = os.getenv('SNAPSHOT_CACHE_DIR') or None
+        self.snapshot_cache = CsvSnapshotCache(snapshot_dir, self.logger) if snapshot_dir else None
+        self.csv_engine = self._resolve_csv_engine(csv_engine or os.getenv('CSV_ENGINE', 'auto'))
+        
+        # Natural keys written by the current delta import (for delete_vanished)
+        self._delta_seen_keys = SeenKeySet()
+        self._delta_lock = threading.Lock()
+        
     def _find_csv_file(self, csv_path: Optional[str]) -> Path:
         """
         Find the AAC CSV file in common locations.
@@ -62,10 +226,16 @@ class AACDataImporter:
         csv_search_paths = os.getenv('CSV_SEARCH_PATHS', 
             '/usr/local/datasets/aac_shelter_outcomes.csv,./aac_shelter_outcomes.csv,./data/aac_shelter_outcomes.csv,./assets/aac_shelter_outcomes.csv')
         
+        # Reuse the location found by an earlier importer while it still exists
+        cached_path = _CSV_PATH_CACHE.get(csv_search_paths)
+        if cached_path is not None and cached_path.exists():
+            return cached_path
+        
         search_paths = [Path(path.strip()) for path in csv_search_paths.split(',')]
         
         for path in search_paths:
             if path.exists():
+                _CSV_PATH_CACHE[csv_search_paths] = path
                 return path
         
         # If not found, provide helpful error message
@@ -74,6 +244,50 @@ class AACDataImporter:
             f"Please ensure the file 'aac_shelter_outcomes.csv' is available in one of these locations."
         )
         
+    def _resolve_csv_engine(self, engine: str) -> str:
+        """Map a requested CSV engine to one that is installed."""
+        engine = engine.lower()
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown CSV engine '{engine}'. Choose from: {', '.join(CSV_ENGINES)}")
+        if engine == 'auto':
+            return 'pyarrow' if HAS_PYARROW else 'c'
+        if engine == 'pyarrow' and not HAS_PYARROW:
+            self.logger.warning("pyarrow is not installed; using the pandas C CSV engine")
+            return 'c'
+        return engine
+    
+    def _read_csv_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments for pd.read_csv() shared by every CSV read path.
+        
+        String and date columns are read as str so the parser skips type
+        inference on them; _apply_schema() parses dates and numbers afterwards
+        with errors coerced to null. Only columns present in the header are
+        listed, since the pyarrow engine rejects unknown dtype keys.
+        """
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f), [])
+        dtypes = {
+            column: str for column in header
+            if AAC_COLUMN_SCHEMA.get(column.lower(), 'string') in ('string', 'datetime')
+        }
+        return {'encoding': 'utf-8', 'dtype': dtypes}
+    
+    def _frame_memory_mb(self, df: pd.DataFrame) -> str:
+        """
+        Describe a frame's memory use for logging.
+        
+        The exact (deep) size scans every string cell, so it is only computed
+        when DEBUG logging is on; otherwise the shallow column size is reported.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            return f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB"
+        return f"{df.memory_usage(deep=False).sum() / 1024 / 1024:.2f} MB (shallow)"
+    
+    def _worker_kwargs(self) -> Dict[str, Any]:
+        """Constructor arguments that recreate this importer in a worker process."""
+        return {'csv_path': str(self.csv_path), 'natural_key': list(self.natural_key), 'sparse': self.sparse}
+    
     def _setup_logging(self) -> None:
         """Configure logging for the data import process."""
         self.logger = logging.getLogger(__name__)
@@ -122,6 +336,11 @@ class AACDataImporter:
         """
         Load the CSV data into a pandas DataFrame.
         
+        With a snapshot cache configured, an unchanged CSV is loaded from its
+        typed columnar snapshot instead of being parsed; otherwise the parsed
+        frame is typed and written as the new snapshot. Frames from the cache
+        path are already typed (see _apply_schema).
+        
         Returns:
             pd.DataFrame: Loaded CSV data
         
@@ -129,17 +348,30 @@ class AACDataImporter:
             Exception: If CSV loading fails
         """
         try:
-            self.logger.info(f"Loading CSV data from: {self.csv_path}")
+            if self.snapshot_cache is not None:
+                df = self.snapshot_cache.load(self.csv_path)
+                if df is not None:
+                    df.attrs[TYPED_FRAME_ATTR] = True
+                    return df
             
-            # Load CSV with pandas
-            df = pd.read_csv(self.csv_path, encoding='utf-8')
+            self.logger.info(f"Loading CSV data from: {self.csv_path} (engine: {self.csv_engine})")
+            
+            # Load CSV with pandas (the pyarrow engine parses on all cores)
+            df = pd.read_csv(self.csv_path, engine=self.csv_engine, **self._read_csv_kwargs())
             
             self.logger.info(f"Successfully loaded {len(df)} records with {len(df.columns)} columns")
             self.logger.info(f"Columns: {list(df.columns)}")
             
             # Display basic statistics
             self.logger.info(f"DataFrame shape: {df.shape}")
-            self.logger.info(f"Memory usage: {df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB")
+            self.logger.info(f"Memory usage: {self._frame_memory_mb(df)}")
+            
+            if self.snapshot_cache is not None:
+                df = self._apply_schema(df)
+                try:
+                    self.snapshot_cache.store(self.csv_path, df)
+                except Exception as e:
+                    self.logger.warning(f"Could not write CSV snapshot: {str(e)}")
             
             return df
             
@@ -147,6 +379,38 @@ class AACDataImporter:
             self.logger.error(f"Failed to load CSV data: {str(e)}")
             raise Exception(f"CSV loading failed: {str(e)}") from e
     
+    def iter_csv_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Read the CSV file in fixed-size chunks instead of all at once.
+        
+        When a current snapshot exists, the chunks are slices of the typed
+        snapshot instead.
+        
+        Args:
+            chunk_size (int): Number of rows per chunk
+        
+        Yields:
+            pd.DataFrame: Raw CSV rows, at most chunk_size per frame
+        
+        Raises:
+            Exception: If CSV loading fails
+        """
+        try:
+            snapshot = self.snapshot_cache.load(self.csv_path) if self.snapshot_cache is not None else None
+            if snapshot is not None:
+                snapshot.attrs[TYPED_FRAME_ATTR] = True
+                for start in range(0, len(snapshot), chunk_size):
+                    yield snapshot.iloc[start:start + chunk_size]
+                return
+            
+            self.logger.info(f"Streaming CSV data from: {self.csv_path} in chunks of {chunk_size} rows")
+            # The pyarrow engine cannot read in chunks, so streaming uses the C engine
+            with pd.read_csv(self.csv_path, chunksize=chunk_size, **self._read_csv_kwargs()) as reader:
+                yield from reader
+        except Exception as e:
+            self.logger.error(f"Failed to stream CSV data: {str(e)}")
+            raise Exception(f"CSV loading failed: {str(e)}") from e
+    
     def clean_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
         Clean and prepare the data for MongoDB import.
@@ -160,30 +424,15 @@ class AACDataImporter:
         try:
             self.logger.info("Starting data cleaning process...")
             
-            # Make a copy to avoid modifying original
-            cleaned_df = df.copy()
+            initial_count = len(df)
+            cleaned_df = self._clean_frame(df)
+            final_count = len(cleaned_df)
             
-            # Handle missing values
-            cleaned_df = cleaned_df.fillna('')
-            
-            # Convert column names to lowercase for consistency
-            cleaned_df.columns = cleaned_df.columns.str.lower()
-            
-            # Ensure animal_id is unique and not empty
-            if 'animal_id' in cleaned_df.columns:
-                # Remove rows with empty animal_id
-                initial_count = len(cleaned_df)
-                cleaned_df = cleaned_df[cleaned_df['animal_id'].astype(str).str.strip() != '']
-                
-                # Remove duplicates based on animal_id
-                cleaned_df = cleaned_df.drop_duplicates(subset=['animal_id'])
-                final_count = len(cleaned_df)
-                
-                if initial_count != final_count:
-                    self.logger.info(f"Removed {initial_count - final_count} duplicate/empty animal_id records")
+            if initial_count != final_count:
+                self.logger.info(f"Removed {initial_count - final_count} duplicate/empty {'+'.join(self.natural_key)} records")
             
             # Convert DataFrame to list of dictionaries
-            records = cleaned_df.to_dict('records')
+            records = self._frame_to_records(cleaned_df)
             
             self.logger.info(f"Data cleaning completed. {len(records)} records ready for import")
             return records
@@ -192,30 +441,110 @@ class AACDataImporter:
             self.logger.error(f"Error during data cleaning: {str(e)}")
             raise
     
-    def import_data(self, records: List[Dict[str, Any]], batch_size: int = None) -> Dict[str, Any]:
+    def stream_records(self, chunk_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Stream cleaned records from the CSV file one chunk at a time.
+        
+        Each chunk is cleaned and converted on its own, and natural keys seen in
+        earlier chunks are tracked in a SeenKeySet, so memory use is bounded by
+        the chunk size rather than the file size.
+        
+        Args:
+            chunk_size (int): Number of CSV rows to read per chunk
+        
+        Yields:
+            Dict[str, Any]: Cleaned records ready for MongoDB
+        """
+        seen_keys = SeenKeySet()
+        rows_read = 0
+        records_yielded = 0
+        
+        self.logger.info("Starting streaming data cleaning process...")
+        
+        for chunk in self.iter_csv_chunks(chunk_size):
+            rows_read += len(chunk)
+            cleaned_chunk = self._clean_frame(chunk, seen_keys)
+            records_yielded += len(cleaned_chunk)
+            yield from self._frame_to_records(cleaned_chunk)
+        
+        if rows_read != records_yielded:
+            self.logger.info(f"Removed {rows_read - records_yielded} duplicate/empty {'+'.join(self.natural_key)} records")
+        self.logger.info(f"Streaming data cleaning completed. {records_yielded} records cleaned from {rows_read} rows")
+    
+    def _clean_frame(self, df: pd.DataFrame, seen_keys: Optional[SeenKeySet] = None) -> pd.DataFrame:
+        """
+        Apply the cleaning rules to a DataFrame (a whole file or one chunk).
+        
+        Args:
+            df (pd.DataFrame): Raw CSV rows
+            seen_keys (Optional[SeenKeySet]): Natural keys already kept from earlier
+                                              chunks; updated in place
+        
+        Returns:
+            pd.DataFrame: Cleaned rows
+        """
+        # Lowercase column names and convert each column to its declared BSON type
+        cleaned_df = self._apply_schema(df)
+        
+        # Ensure animal_id is not empty
+        if 'animal_id' in cleaned_df.columns:
+            # Remove rows with empty animal_id
+            cleaned_df = cleaned_df[cleaned_df['animal_id'].astype(str).str.strip() != '']
+        
+        # Ensure the natural key is unique
+        key_fields = [field for field in self.natural_key if field in cleaned_df.columns]
+        if key_fields:
+            # Remove duplicates based on the natural key, including ones kept from earlier chunks
+            if seen_keys is None:
+                cleaned_df = cleaned_df.drop_duplicates(subset=key_fields)
+            else:
+                hashes = SeenKeySet.hash_keys(self._key_series(cleaned_df, key_fields))
+                keep = ~(seen_keys.contains(hashes) | pd.Series(hashes).duplicated().to_numpy())
+                cleaned_df = cleaned_df[keep]
+                seen_keys.add(hashes[keep])
+        
+        return cleaned_df
+    
+    def import_data(self, records: Iterable[Dict[str, Any]], batch_size: int = None,
+                    strategy: Optional[str] = None) -> Dict[str, Any]:
         """
         Import data into MongoDB using the AnimalShelter class.
         
         Args:
-            records (List[Dict[str, Any]]): List of records to import
+            records (Iterable[Dict[str, Any]]): Records to import. A list, or a
+                                                generator such as stream_records()
+                                                which is consumed one batch at a time
             batch_size (int): Number of records to process in each batch
+            strategy (Optional[str]): Write strategy. 'bulk' sends each batch as one
+                                      unordered insert_many; 'single' calls
+                                      AnimalShelter.create() per record; 'delta'
+                                      writes only new or changed records; 'upsert'
+                                      replaces or inserts every record by natural key
+                                      (default: IMPORT_STRATEGY env var or 'bulk')
         
         Returns:
             Dict[str, Any]: Import statistics
         """
         try:
-            self.logger.info(f"Starting data import of {len(records)} records...")
+            total_records = len(records) if hasattr(records, '__len__') else None
+            if total_records is None:
+                self.logger.info("Starting streaming data import...")
+            else:
+                self.logger.info(f"Starting data import of {total_records} records...")
             
-            # Get batch size from environment or use default
-            if batch_size is None:
-                batch_size = int(os.getenv('BATCH_SIZE', '1000'))
+            batch_size, strategy = self._resolve_import_options(batch_size, strategy)
             
             # Initialize AnimalShelter connection
-            self.shelter = AnimalShelter()
+            self.shelter = AnimalShelter(shared_client=True)
+            
+            # Keyed strategies look documents up by natural key on every batch
+            if strategy in KEYED_STRATEGIES:
+                self._prepare_keyed_import(strategy)
             
             # Import statistics
             stats = {
-                'total_records': len(records),
+                'total_records': 0,
+                'strategy': strategy,
                 'successful_imports': 0,
                 'failed_imports': 0,
                 'errors': [],
@@ -225,36 +554,28 @@ class AACDataImporter:
             }
             
             # Process records in batches with progress bar
-            total_batches = (len(records) + batch_size - 1) // batch_size
+            total_batches = (total_records + batch_size - 1) // batch_size if total_records is not None else None
             
-            with tqdm(total=len(records), desc="Importing records", unit="record") as pbar:
-                for i in range(0, len(records), batch_size):
-                    batch = records[i:i + batch_size]
-                    batch_num = (i // batch_size) + 1
-                    
-                    self.logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} records)")
+            # Imported here so loading and cleaning data does not pay for it
+            from tqdm import tqdm
+            
+            with tqdm(total=total_records, desc="Importing records", unit="record") as pbar:
+                for batch_num, batch in enumerate(self._iter_batches(records, batch_size), start=1):
+                    if total_batches is None:
+                        self.logger.info(f"Processing batch {batch_num} ({len(batch)} records)")
+                    else:
+                        self.logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} records)")
                     
-                    for record in batch:
-                        try:
-                            # Use the create method from AnimalShelter
-                            result = self.shelter.create(record)
-                            if result:
-                                stats['successful_imports'] += 1
-                            else:
-                                stats['failed_imports'] += 1
-                                stats['errors'].append(f"Failed to import record: {record.get('animal_id', 'Unknown')}")
-                        
-                        except Exception as e:
-                            stats['failed_imports'] += 1
-                            error_msg = f"Error importing record {record.get('animal_id', 'Unknown')}: {str(e)}"
-                            stats['errors'].append(error_msg)
-                            self.logger.error(error_msg)
-                        
-                        pbar.update(1)
+                    batch_result = self._write_batch(batch, strategy)
+                    self._merge_batch_result(stats, batch_result, len(batch))
+                    pbar.update(len(batch))
                     
                     # Progress update
-                    progress = (i + len(batch)) / len(records) * 100
-                    self.logger.info(f"Import progress: {progress:.1f}%")
+                    if total_records:
+                        progress = stats['total_records'] / total_records * 100
+                        self.logger.info(f"Import progress: {progress:.1f}%")
+                    else:
+                        self.logger.info(f"Import progress: {stats['total_records']} records")
             
             # Calculate final statistics
             stats['end_time'] = time.time()
@@ -263,6 +584,9 @@ class AACDataImporter:
             self.logger.info("Data import completed!")
             self.logger.info(f"Successful imports: {stats['successful_imports']}")
             self.logger.info(f"Failed imports: {stats['failed_imports']}")
+            if strategy in KEYED_STRATEGIES:
+                self.logger.info(f"{strategy.capitalize()}: {stats.get('inserted', 0)} inserted, {stats.get('updated', 0)} updated, "
+                                 f"{stats.get('unchanged', 0)} unchanged")
             self.logger.info(f"Duration: {stats['duration']:.2f} seconds")
             
             return stats
@@ -274,21 +598,529 @@ class AACDataImporter:
             if self.shelter:
                 self.shelter.close_connection()
     
+    @staticmethod
+    def _resolve_import_options(batch_size: Optional[int], strategy: Optional[str]) -> Tuple[int, str]:
+        """
+        Fill in batch size and write strategy from the environment when not given.
+        
+        Raises:
+            ValueError: If the strategy is not one of IMPORT_STRATEGIES
+        """
+        # Get batch size from environment or use default
+        if batch_size is None:
+            batch_size = int(os.getenv('BATCH_SIZE', '1000'))
+        
+        # Get write strategy from environment or use default
+        if strategy is None:
+            strategy = os.getenv('IMPORT_STRATEGY', 'bulk')
+        if strategy not in IMPORT_STRATEGIES:
+            raise ValueError(f"Unknown import strategy '{strategy}'. Expected one of: {', '.join(IMPORT_STRATEGIES)}")
+        
+        return batch_size, strategy
+    
+    def _prepare_keyed_import(self, strategy: str) -> None:
+        """
+        Ensure the unique natural key index before a keyed import.
+        
+        Upserts require the index; without it concurrent writers could insert
+        the same key twice. Delta imports only need it for speed, so a failure
+        is logged and the import continues.
+        """
+        try:
+            self.ensure_natural_key_index()
+        except Exception as e:
+            if strategy == 'upsert':
+                raise
+            self.logger.warning(f"Could not ensure natural key index, delta lookups may be slow: {e}")
+    
+    @staticmethod
+    def _merge_batch_result(stats: Dict[str, Any], batch_result: Dict[str, Any], batch_length: int) -> None:
+        """Add one batch result from _write_batch() into the running import stats."""
+        stats['total_records'] += batch_length
+        stats['successful_imports'] += batch_result['successful']
+        stats['failed_imports'] += batch_result['failed']
+        stats['errors'].extend(batch_result['errors'])
+        for counter in OPTIONAL_BATCH_COUNTERS:
+            if counter in batch_result:
+                stats[counter] = stats.get(counter, 0) + batch_result[counter]
+    
+    @staticmethod
+    def _iter_batches(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield successive lists of at most batch_size records."""
+        iterator = iter(records)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def _write_batch(self, batch: List[Dict[str, Any]], strategy: str) -> Dict[str, Any]:
+        """
+        Write one batch of records using the given strategy.
+        
+        Args:
+            batch (List[Dict[str, Any]]): Records to write
+            strategy (str): One of IMPORT_STRATEGIES
+        
+        Returns:
+            Dict[str, Any]: Batch result with 'successful', 'failed' and 'errors'
+        """
+        if strategy == 'single':
+            return self._insert_single(batch)
+        if strategy == 'delta':
+            return self._write_delta(batch)
+        if strategy == 'upsert':
+            return self._write_upsert(batch)
+        return self._insert_bulk(batch)
+    
+    def _insert_single(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert records one at a time through AnimalShelter.create()."""
+        result = {'successful': 0, 'failed': 0, 'errors': []}
+        
+        for record in batch:
+            try:
+                # Use the create method from AnimalShelter
+                if self.shelter.create(record):
+                    result['successful'] += 1
+                else:
+                    result['failed'] += 1
+                    result['errors'].append(f"Failed to import record: {record.get('animal_id', 'Unknown')}")
+            
+            except Exception as e:
+                result['failed'] += 1
+                error_msg = f"Error importing record {record.get('animal_id', 'Unknown')}: {str(e)}"
+                result['errors'].append(error_msg)
+                self.logger.error(error_msg)
+        
+        return result
+    
+    def _insert_bulk(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Insert a batch with a single unordered insert_many round trip.
+        
+        Unordered inserts let MongoDB continue past individual document
+        failures; those are reported per document from the BulkWriteError.
+        """
+        result = {'successful': 0, 'failed': 0, 'errors': []}
+        
+        try:
+            insert_result = self.shelter.collection.insert_many(batch, ordered=False)
+            result['successful'] = len(insert_result.inserted_ids)
+            self._record_summary_changes([], batch)
+        
+        except BulkWriteError as bwe:
+            details = bwe.details or {}
+            write_errors = details.get('writeErrors', [])
+            result['successful'] = int(details.get('nInserted', 0))
+            result['failed'] = len(write_errors)
+            for write_error in write_errors:
+                record = batch[write_error['index']]
+                error_msg = f"Error importing record {record.get('animal_id', 'Unknown')}: {write_error.get('errmsg', 'Unknown error')}"
+                result['errors'].append(error_msg)
+                self.logger.error(error_msg)
+            for concern_error in details.get('writeConcernErrors', []):
+                error_msg = f"Write concern error: {concern_error.get('errmsg', 'Unknown error')}"
+                result['errors'].append(error_msg)
+                self.logger.error(error_msg)
+            self._record_summary_changes([], batch, {write_error['index'] for write_error in write_errors})
+        
+        except Exception as e:
+            result['failed'] = len(batch)
+            error_msg = f"Error importing batch of {len(batch)} records: {str(e)}"
+            result['errors'].append(error_msg)
+            self.logger.error(error_msg)
+            self._mark_summary_stale(error_msg)
+        
+        return result
+    
+    def _record_summary_changes(self, before: Sequence[Optional[Dict[str, Any]]], after: Sequence[Dict[str, Any]],
+                                failed_indexes: Set[int] = frozenset()) -> None:
+        """
+        Apply the summary count deltas of the operations of a batch write that did not fail.
+        
+        Args:
+            before (Sequence[Optional[Dict[str, Any]]]): Document each operation replaced, by
+                                                         operation index (None or absent for inserts)
+            after (Sequence[Dict[str, Any]]): Record written by each operation
+            failed_indexes (Set[int]): Operation indexes reported in writeErrors
+        """
+        summary_stats = self.shelter.summary_stats
+        if summary_stats is None:
+            return
+        replaced = [document for index, document in enumerate(before)
+                    if document is not None and index not in failed_indexes]
+        written = [record for index, record in enumerate(after) if index not in failed_indexes]
+        summary_stats.apply_safely(lambda stats: stats.record_changes(replaced, written))
+    
+    def _mark_summary_stale(self, reason: str) -> None:
+        """Mark the summary stale after a write whose effect is unknown."""
+        summary_stats = self.shelter.summary_stats
+        if summary_stats is not None:
+            summary_stats.apply_safely(lambda stats: stats.mark_stale(reason))
+    
+    @staticmethod
+    def _apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert columns to the types declared in AAC_COLUMN_SCHEMA (vectorized).
+        
+        Column names are lowercased for consistency. Dates become datetimes, numeric columns become ints or floats, and
+        age_upon_outcome_in_weeks is filled from the age_upon_outcome text where
+        it is missing. Unparseable values become nulls rather than strings, so
+        dates and ages can be range-queried through an index.
+        
+        Args:
+            df (pd.DataFrame): Raw CSV rows
+        
+        Returns:
+            pd.DataFrame: A new frame with lowercase names and typed columns
+                          (frames already typed, e.g. snapshots, are returned as is)
+        """
+        if df.attrs.get(TYPED_FRAME_ATTR):
+            return df
+        
+        typed = {}
+        for source_column in df.columns:
+            column = str(source_column).lower()
+            kind = AAC_COLUMN_SCHEMA.get(column, 'string')
+            values = df[source_column]
+            if kind == 'datetime':
+                typed[column] = pd.to_datetime(values, format='ISO8601', errors='coerce')
+            elif kind == 'int':
+                typed[column] = pd.to_numeric(values, errors='coerce').round().astype('Int64')
+            elif kind == 'float':
+                typed[column] = pd.to_numeric(values, errors='coerce').astype('float64')
+            else:
+                typed[column] = values.fillna('').astype(str)
+        typed_df = pd.DataFrame(typed, index=df.index)
+        typed_df.attrs[TYPED_FRAME_ATTR] = True
+        
+        if 'age_upon_outcome' in typed_df.columns:
+            parsed_weeks = parse_age_weeks(typed_df['age_upon_outcome'])
+            if 'age_upon_outcome_in_weeks' in typed_df.columns:
+                typed_df['age_upon_outcome_in_weeks'] = typed_df['age_upon_outcome_in_weeks'].fillna(parsed_weeks)
+            else:
+                typed_df['age_upon_outcome_in_weeks'] = parsed_weeks
+        
+        return typed_df
+    
+    def _frame_to_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Convert a typed DataFrame to BSON-ready dictionaries.
+        
+        NaN/NaT/NA become None (BSON null) and NumPy scalars become native
+        Python values, which is what PyMongo can encode. In sparse mode,
+        None and '' values are left out of the documents entirely.
+        Rows with valid coordinates also get a GeoJSON location point, and rows
+        with a breed or sex get breed_tokens, breed_mix and intact, plus their
+        rescue_categories tags.
+        """
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        if self.sparse:
+            records = [
+                {field: value for field, value in record.items() if value is not None and value != ''}
+                for record in records
+            ]
+        if LAT_FIELD in df.columns and LONG_FIELD in df.columns:
+            lat = pd.to_numeric(df[LAT_FIELD], errors='coerce')
+            long = pd.to_numeric(df[LONG_FIELD], errors='coerce')
+            # between() is False for NaN, so rows without coordinates get no location
+            valid = lat.between(-90, 90) & long.between(-180, 180)
+            for record, has_point, y, x in zip(records, valid.to_numpy(), lat.to_numpy(), long.to_numpy()):
+                if has_point:
+                    record[LOCATION_FIELD] = {'type': 'Point', 'coordinates': [float(x), float(y)]}
+        if BREED_FIELD in df.columns or SEX_FIELD in df.columns:
+            # Few distinct (breed, sex) pairs repeat across many rows, so derive each pair once
+            derived = {}
+            for record in records:
+                if BREED_FIELD not in record and SEX_FIELD not in record:
+                    continue
+                pair = (record.get(BREED_FIELD), record.get(SEX_FIELD))
+                fields = derived.get(pair)
+                if fields is None:
+                    fields = derived[pair] = breed_fields(*pair)
+                for field, value in fields.items():
+                    record.setdefault(field, list(value) if isinstance(value, list) else value)
+        # Tags depend on three fields only, so each combination is also derived once
+        tagged = {}
+        for record in records:
+            if not any(field in record for field in RESCUE_SOURCE_FIELDS):
+                continue
+            source = (record.get(ANIMAL_TYPE_FIELD), record.get(BREED_FIELD), record.get(SEX_FIELD))
+            tags = tagged.get(source)
+            if tags is None:
+                tags = tagged[source] = rescue_categories(record)
+            record.setdefault(RESCUE_CATEGORIES_FIELD, list(tags))
+        return records
+    
+    def _key_of(self, document: Dict[str, Any]) -> str:
+        """Natural key of a record or document as one comparable string."""
+        return '\x1f'.join(str(document.get(field, '')) for field in self.natural_key)
+    
+    @staticmethod
+    def _key_series(df: pd.DataFrame, key_fields: List[str]) -> pd.Series:
+        """Vectorized natural key strings for the rows of a DataFrame."""
+        keys = df[key_fields[0]].astype(str)
+        for field in key_fields[1:]:
+            keys = keys + '\x1f' + df[field].astype(str)
+        return keys
+    
+    def _record_key_filter(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Query matching the document with the same natural key as a record."""
+        return {field: record.get(field) for field in self.natural_key}
+    
+    def _natural_key_filter(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Query matching every document that shares a natural key with the batch."""
+        if len(self.natural_key) == 1:
+            field = self.natural_key[0]
+            return {field: {'$in': [record.get(field) for record in batch]}}
+        return {'$or': [self._record_key_filter(record) for record in batch]}
+    
+    def _write_delta(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write only the records in a batch that are new or whose content changed.
+        
+        Each record is fingerprinted with compute_content_hash() and the hash is
+        stored alongside the document. Existing hashes for the batch are fetched
+        with one query, and only inserts and replacements are sent, as a single
+        unordered bulk_write.
+        """
+        result = {'successful': 0, 'failed': 0, 'errors': [], 'inserted': 0, 'updated': 0, 'unchanged': 0}
+        
+        # Remember every source key, including ones that fail to write, so
+        # delete_vanished() never removes a record that is still in the CSV
+        keys = [self._key_of(record) for record in batch]
+        with self._delta_lock:
+            self._delta_seen_keys.add(SeenKeySet.hash_keys(pd.Series(keys)))
+        
+        try:
+            projection = {field: 1 for field in self.natural_key}
+            projection[CONTENT_HASH_FIELD] = 1
+            if self.shelter.summary_stats is not None:
+                projection.update({field: 1 for field in SUMMARY_FIELDS})
+            existing = {
+                self._key_of(doc): doc
+                for doc in self.shelter.collection.find(self._natural_key_filter(batch), projection)
+            }
+            
+            operations = []
+            operation_records = []
+            replaced_documents = []
+            for key, record in zip(keys, batch):
+                record[CONTENT_HASH_FIELD] = compute_content_hash(record)
+                current = existing.get(key)
+                if current is None:
+                    operations.append(InsertOne(record))
+                elif current.get(CONTENT_HASH_FIELD) != record[CONTENT_HASH_FIELD]:
+                    operations.append(ReplaceOne({'_id': current['_id']}, record))
+                else:
+                    result['unchanged'] += 1
+                    continue
+                operation_records.append(record)
+                replaced_documents.append(current)
+            
+            if operations:
+                bulk_result = self.shelter.collection.bulk_write(operations, ordered=False)
+                result['inserted'] = bulk_result.inserted_count
+                result['updated'] = bulk_result.matched_count
+                self._record_summary_changes(replaced_documents, operation_records)
+        
+        except BulkWriteError as bwe:
+            details = bwe.details or {}
+            write_errors = details.get('writeErrors', [])
+            result['inserted'] = int(details.get('nInserted', 0))
+            result['updated'] = int(details.get('nMatched', 0))
+            result['failed'] = len(write_errors)
+            for write_error in write_errors:
+                record = operation_records[write_error['index']]
+                error_msg = f"Error importing record {record.get('animal_id', 'Unknown')}: {write_error.get('errmsg', 'Unknown error')}"
+                result['errors'].append(error_msg)
+                self.logger.error(error_msg)
+            self._record_summary_changes(replaced_documents, operation_records,
+                                         {write_error['index'] for write_error in write_errors})
+        
+        except Exception as e:
+            result['failed'] = len(batch) - result['unchanged']
+            error_msg = f"Error importing batch of {len(batch)} records: {str(e)}"
+            result['errors'].append(error_msg)
+            self.logger.error(error_msg)
+            self._mark_summary_stale(error_msg)
+        
+        result['successful'] = result['inserted'] + result['updated'] + result['unchanged']
+        return result
+    
+    def _write_upsert(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Replace-or-insert every record in a batch by its natural key.
+        
+        The batch is sent as one unordered bulk_write of ReplaceOne(upsert=True)
+        operations. Re-importing identical data matches every document and
+        modifies none, so a re-run costs about as much as a compare.
+        """
+        result = {'successful': 0, 'failed': 0, 'errors': [], 'inserted': 0, 'updated': 0, 'unchanged': 0}
+        
+        replaced_documents = []
+        try:
+            if self.shelter.summary_stats is not None:
+                # The summary needs the counted values each record replaces
+                projection = {field: 1 for field in (*self.natural_key, *SUMMARY_FIELDS)}
+                existing = {
+                    self._key_of(doc): doc
+                    for doc in self.shelter.collection.find(self._natural_key_filter(batch), projection)
+                }
+                replaced_documents = [existing.get(self._key_of(record)) for record in batch]
+            
+            operations = [ReplaceOne(self._record_key_filter(record), record, upsert=True) for record in batch]
+            bulk_result = self.shelter.collection.bulk_write(operations, ordered=False)
+            result['inserted'] = bulk_result.upserted_count
+            result['updated'] = bulk_result.modified_count
+            result['unchanged'] = bulk_result.matched_count - bulk_result.modified_count
+            self._record_summary_changes(replaced_documents, batch)
+        
+        except BulkWriteError as bwe:
+            details = bwe.details or {}
+            write_errors = details.get('writeErrors', [])
+            result['inserted'] = int(details.get('nUpserted', 0))
+            result['updated'] = int(details.get('nModified', 0))
+            result['unchanged'] = int(details.get('nMatched', 0)) - result['updated']
+            result['failed'] = len(write_errors)
+            for write_error in write_errors:
+                record = batch[write_error['index']]
+                error_msg = f"Error importing record {record.get('animal_id', 'Unknown')}: {write_error.get('errmsg', 'Unknown error')}"
+                result['errors'].append(error_msg)
+                self.logger.error(error_msg)
+            self._record_summary_changes(replaced_documents, batch,
+                                         {write_error['index'] for write_error in write_errors})
+        
+        except Exception as e:
+            result['failed'] = len(batch)
+            error_msg = f"Error importing batch of {len(batch)} records: {str(e)}"
+            result['errors'].append(error_msg)
+            self.logger.error(error_msg)
+            self._mark_summary_stale(error_msg)
+        
+        result['successful'] = result['inserted'] + result['updated'] + result['unchanged']
+        return result
+    
+    def ensure_natural_key_index(self, collection=None) -> str:
+        """
+        Create, or check, the unique index on the natural key.
+        
+        An existing unique index on the same fields is accepted as is. A
+        non-unique index on exactly the same fields (such as idx_animal_id from
+        AnimalShelter.ensure_indexes()) is replaced, because MongoDB allows only
+        one index per key pattern. The collection is checked for duplicate keys
+        first, so a failed check leaves the existing indexes untouched.
+        
+        Args:
+            collection: Collection to index (default: the current AnimalShelter's)
+        
+        Returns:
+            str: Name of the unique natural key index
+        
+        Raises:
+            ValueError: If the collection already holds duplicate natural keys
+        """
+        collection = collection if collection is not None else self.shelter.collection
+        key_pattern = [(field, ASCENDING) for field in self.natural_key]
+        
+        conflicting_index = None
+        for name, info in collection.index_information().items():
+            if index_key_pattern(info['key']) == key_pattern:
+                if info.get('unique'):
+                    self.logger.info(f"Unique natural key index '{name}' found on {list(self.natural_key)}")
+                    return name
+                conflicting_index = name
+                break
+        
+        duplicate = next(collection.aggregate([
+            {'$group': {'_id': {field: f'${field}' for field in self.natural_key}, 'count': {'$sum': 1}}},
+            {'$match': {'count': {'$gt': 1}}},
+            {'$limit': 1}
+        ], allowDiskUse=True), None)
+        if duplicate is not None:
+            raise ValueError(
+                f"Cannot create unique index on {list(self.natural_key)}: the collection already holds "
+                f"{duplicate['count']} documents with key {duplicate['_id']}. Remove the duplicates "
+                f"(or re-import into an empty collection) and try again."
+            )
+        
+        if conflicting_index is not None:
+            self.logger.info(f"Replacing non-unique index '{conflicting_index}' with unique '{NATURAL_KEY_INDEX}'")
+            collection.drop_index(conflicting_index)
+        
+        collection.create_index(key_pattern, name=NATURAL_KEY_INDEX, unique=True)
+        self.logger.info(f"Created unique natural key index '{NATURAL_KEY_INDEX}' on {list(self.natural_key)}")
+        return NATURAL_KEY_INDEX
+    
+    def delete_vanished(self, batch_size: int = 5000) -> int:
+        """
+        Delete imported documents whose natural key was not in the last delta import.
+        
+        Only documents carrying a content hash (i.e. written by an importer) are
+        considered, so records created through the CRUD API are never removed.
+        
+        Args:
+            batch_size (int): Number of documents examined per delete round trip
+        
+        Returns:
+            int: Number of documents deleted
+        """
+        shelter = AnimalShelter(shared_client=True)
+        deleted = 0
+        
+        try:
+            projection = {field: 1 for field in self.natural_key}
+            if shelter.summary_stats is not None:
+                projection.update({field: 1 for field in SUMMARY_FIELDS})
+            cursor = shelter.collection.find({CONTENT_HASH_FIELD: {'$exists': True}}, projection).batch_size(batch_size)
+            
+            for docs in self._iter_batches(cursor, batch_size):
+                hashes = SeenKeySet.hash_keys(pd.Series([self._key_of(doc) for doc in docs]))
+                vanished = ~self._delta_seen_keys.contains(hashes)
+                vanished_docs = [doc for doc, gone in zip(docs, vanished) if gone]
+                if vanished_docs:
+                    batch_deleted = shelter.collection.delete_many(
+                        {'_id': {'$in': [doc['_id'] for doc in vanished_docs]}}
+                    ).deleted_count
+                    deleted += batch_deleted
+                    if shelter.summary_stats is None:
+                        continue
+                    if batch_deleted == len(vanished_docs):
+                        shelter.summary_stats.apply_safely(lambda stats: stats.record_deletes(vanished_docs))
+                    else:
+                        # Some were deleted by another client, which cannot be told apart here
+                        shelter.summary_stats.apply_safely(
+                            lambda stats: stats.mark_stale("documents deleted during delete_vanished()"))
+            
+            self.logger.info(f"Deleted {deleted} documents no longer present in the source CSV")
+            return deleted
+        
+        finally:
+            shelter.close_connection()
+    
     def check_existing_data(self) -> Dict[str, Any]:
         """
         Check if AAC data already exists in the database.
         
+        With summary stats enabled and current, the count and the animal and
+        outcome types are read from the summary collection.
+        
         Returns:
             Dict[str, Any]: Information about existing data including count and sample
         """
         try:
             self.logger.info("Checking for existing AAC data...")
             
-            # Create new connection for checking
-            shelter = AnimalShelter()
+            # Reuse the shared connection for checking
+            shelter = AnimalShelter(shared_client=True)
             
-            # Get total document count
-            total_docs = shelter.collection.count_documents({})
+            # Get total document count, from the summary collection when it is current
+            summary = None
+            if shelter.summary_stats is not None and shelter.summary_stats.is_ready():
+                summary = shelter.summary_stats.summary()
+                total_docs = summary['total_documents']
+            else:
+                total_docs = shelter.collection.count_documents({})
             
             if total_docs == 0:
                 shelter.close_connection()
@@ -299,7 +1131,7 @@ class AACDataImporter:
                 }
             
             # Check if this looks like AAC data by examining sample documents
-            sample_docs = list(shelter.collection.find().limit(5))
+            sample_docs = list(shelter.read_iter(limit=5))
             
             # Look for AAC-specific fields
             aac_fields = ['animal_id', 'rec_num', 'outcome_type', 'animal_type']
@@ -310,8 +1142,12 @@ class AACDataImporter:
             
             if has_aac_structure:
                 # Get some statistics about the data
-                animal_types = shelter.collection.distinct("animal_type")
-                outcome_types = shelter.collection.distinct("outcome_type")
+                if summary is not None:
+                    animal_types = [value for value in summary['animal_type'] if value != '']
+                    outcome_types = [value for value in summary['outcome_type'] if value != '']
+                else:
+                    animal_types = shelter.collection.distinct("animal_type")
+                    outcome_types = shelter.collection.distinct("outcome_type")
                 
                 shelter.close_connection()
                 return {
@@ -348,19 +1184,23 @@ class AACDataImporter:
         try:
             self.logger.info("Verifying imported data...")
             
-            # Create new connection for verification
-            shelter = AnimalShelter()
+            # Reuse the shared connection for verification
+            shelter = AnimalShelter(shared_client=True)
+            
+            # Count the import into the summary collection if it is not current
+            if shelter.summary_stats is not None and not shelter.summary_stats.is_ready():
+                shelter.summary_stats.rebuild()
             
             # Get collection statistics
             stats = shelter.get_collection_stats()
             
             # Sample some records to verify data quality
-            sample_records = shelter.read({})
-            sample_size = min(5, len(sample_records))
+            sample_records = list(shelter.read_iter(limit=5))
+            sample_size = len(sample_records)
             
             verification_results = {
                 'collection_stats': stats,
-                'sample_records': sample_records[:sample_size] if sample_records else [],
+                'sample_records': sample_records,
                 'verification_passed': True,
                 'sample_size': sample_size
             }
@@ -374,22 +1214,40 @@ class AACDataImporter:
             self.logger.error(f"Error during verification: {str(e)}")
             return {'verification_passed': False, 'error': str(e)}
     
-    def run_full_import(self, batch_size: int = None, force_import: bool = False) -> Dict[str, Any]:
+    def run_full_import(self, batch_size: int = None, force_import: bool = False,
+                        strategy: Optional[str] = None, chunk_size: Optional[int] = None,
+                        workers: Optional[int] = None, writers: Optional[int] = None,
+                        delete_missing: bool = False) -> Dict[str, Any]:
         """
         Run the complete data import process.
         
         Args:
             batch_size (int): Number of records to process in each batch
             force_import (bool): If True, import even if data already exists
+            strategy (Optional[str]): Write strategy passed to import_data()
+            chunk_size (Optional[int]): If set, stream the CSV in chunks of this many
+                                        rows instead of loading it all into memory
+                                        (default: IMPORT_CHUNK_SIZE env var, unset)
+            workers (Optional[int]): Number of parse/clean processes. More than one
+                                     worker or writer runs the ParallelImportEngine
+                                     (default: IMPORT_WORKERS env var or 1)
+            writers (Optional[int]): Number of MongoDB writer threads
+                                     (default: IMPORT_WRITERS env var or 1)
+            delete_missing (bool): With the 'delta' strategy, also delete imported
+                                   documents that are no longer in the CSV
         
         Returns:
             Dict[str, Any]: Complete import results
         """
         try:
             self.logger.info("Starting full AAC data import process...")
+            self._delta_seen_keys = SeenKeySet()
+            
+            if strategy is None:
+                strategy = os.getenv('IMPORT_STRATEGY', 'bulk')
             
-            # Step 1: Check for existing data (unless forced)
-            if not force_import:
+            # Step 1: Check for existing data (unless forced, or refreshing it with a keyed import)
+            if not force_import and strategy not in KEYED_STRATEGIES:
                 existing_data = self.check_existing_data()
                 if existing_data.get("data_exists", False):
                     self.logger.info(f"Data already exists: {existing_data['message']}")
@@ -405,14 +1263,41 @@ class AACDataImporter:
             if not self.validate_csv_file():
                 raise Exception("CSV file validation failed")
             
-            # Step 3: Load CSV data
-            df = self.load_csv_data()
+            if chunk_size is None and os.getenv('IMPORT_CHUNK_SIZE'):
+                chunk_size = int(os.getenv('IMPORT_CHUNK_SIZE'))
+            if workers is None:
+                workers = int(os.getenv('IMPORT_WORKERS', '1'))
+            if writers is None:
+                writers = int(os.getenv('IMPORT_WRITERS', '1'))
             
-            # Step 4: Clean data
-            records = self.clean_data(df)
+            if workers > 1 or writers > 1:
+                # Steps 3-5: Parse, clean and write concurrently
+                from .parallel_import import ParallelImportEngine
+                
+                batch_size, strategy = self._resolve_import_options(batch_size, strategy)
+                engine = ParallelImportEngine(
+                    self, workers=workers, writers=writers,
+                    chunk_size=chunk_size or 50000, batch_size=batch_size, strategy=strategy
+                )
+                import_stats = engine.run()
+            else:
+                if chunk_size:
+                    # Steps 3-4: Stream, clean and de-duplicate the CSV chunk by chunk
+                    records = self.stream_records(chunk_size)
+                else:
+                    # Step 3: Load CSV data
+                    df = self.load_csv_data()
+                    
+                    # Step 4: Clean data
+                    records = self.clean_data(df)
+                    del df
+                
+                # Step 5: Import data
+                import_stats = self.import_data(records, batch_size, strategy)
             
-            # Step 5: Import data
-            import_stats = self.import_data(records, batch_size)
+            # Step 5b: Remove records that disappeared from the source (delta only)
+            if strategy == 'delta' and delete_missing:
+                import_stats['deleted'] = self.delete_vanished()
             
             # Step 6: Verify import
             verification_results = self.verify_import()
@@ -424,7 +1309,7 @@ class AACDataImporter:
                 'success': True,
                 'skipped': False,
                 'csv_file': str(self.csv_path),
-                'total_records_processed': len(records)
+                'total_records_processed': import_stats['total_records']
             }
             
             self.logger.info("Full import process completed successfully!")
@@ -456,6 +1341,11 @@ class AACDataImporter:
         stats = results['import_stats']
         verification = results['verification_results']
         
+        delta_line = ''
+        if 'inserted' in stats:
+            delta_line = (f"🔁 {stats['strategy'].capitalize()}: {stats['inserted']:,} inserted, {stats.get('updated', 0):,} updated, "
+                          f"{stats.get('unchanged', 0):,} unchanged, {stats.get('deleted', 0):,} deleted\n")
+        
         summary = f"""
 🎉 AAC DATA IMPORT COMPLETED SUCCESSFULLY
 {'='*50}
@@ -463,7 +1353,7 @@ class AACDataImporter:
 📊 Total Records Processed: {results['total_records_processed']:,}
 Successful Imports: {stats['successful_imports']:,}
 ❌ Failed Imports: {stats['failed_imports']:,}
-⏱️  Duration: {stats['duration']:.2f} seconds
+{delta_line}⏱️  Duration: {stats['duration']:.2f} seconds
 📈 Collection Documents: {verification['collection_stats']['total_documents']:,}
 🎯 Success Rate: {(stats['successful_imports']/stats['total_records'])*100:.1f}%
 {'='*50}
@@ -483,12 +1373,33 @@ def main():
                        help='Only check if data exists, do not import')
     parser.add_argument('--batch-size', type=int, default=None,
                        help='Number of records to process in each batch')
+    parser.add_argument('--strategy', choices=IMPORT_STRATEGIES, default=None,
+                       help='Write strategy: bulk (one insert_many per batch), single (one insert per record), '
+                            'delta (write only new or changed records) or upsert (replace/insert by natural key)')
+    parser.add_argument('--natural-key', default=None,
+                       help='Comma-separated fields identifying a record, e.g. animal_id,datetime')
+    parser.add_argument('--sparse', action='store_true', default=None,
+                       help='Omit empty fields from documents instead of storing placeholders')
+    parser.add_argument('--csv-engine', choices=CSV_ENGINES, default=None,
+                       help='CSV parser: c (single-threaded), pyarrow (multi-threaded) or auto')
+    parser.add_argument('--snapshot-dir', default=None,
+                       help='Cache a typed columnar snapshot of the CSV in this directory')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help='Stream the CSV in chunks of this many rows to keep memory flat')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of parse/clean worker processes')
+    parser.add_argument('--writers', type=int, default=None,
+                       help='Number of MongoDB writer threads')
+    parser.add_argument('--delete-missing', action='store_true',
+                       help='With --strategy delta, delete imported records no longer in the CSV')
     
     args = parser.parse_args()
     
     try:
         # Create importer instance
-        importer = AACDataImporter()
+        natural_key = args.natural_key.split(',') if args.natural_key else None
+        importer = AACDataImporter(natural_key=natural_key, sparse=args.sparse, snapshot_dir=args.snapshot_dir,
+                                   csv_engine=args.csv_engine)
         
         if args.check_only:
             # Only check existing data
@@ -501,7 +1412,10 @@ def main():
             return
         
         # Run full import process
-        results = importer.run_full_import(force_import=args.force, batch_size=args.batch_size)
+        results = importer.run_full_import(force_import=args.force, batch_size=args.batch_size,
+                                           strategy=args.strategy, chunk_size=args.chunk_size,
+                                           workers=args.workers, writers=args.writers,
+                                           delete_missing=args.delete_missing)
         
         # Handle skipped imports
         if results.get('skipped', False):
@@ -522,6 +1436,8 @@ def main():
     except Exception as e:
         print(f"Critical error in main: {str(e)}")
         sys.exit(1)
+    finally:
+        close_all_clients()
 
 
 if __name__ == "__main__":
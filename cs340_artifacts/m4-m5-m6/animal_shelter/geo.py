@@ -0,0 +1,245 @@
+"""
+GeoJSON Locations for AAC Documents
+CS 340 Module Four Milestone
+
+The AAC CSV gives each outcome's location as two floats, location_lat and
+location_long. MongoDB can only index and query them together as a GeoJSON
+Point, so documents also carry
+
+    location: {type: 'Point', coordinates: [location_long, location_lat]}
+
+(GeoJSON puts longitude first). AnimalShelter.ensure_indexes() builds a
+2dsphere index on it. Documents without valid coordinates get no location
+field, so the index leaves them out.
+
+An update that $sets both coordinates gets the matching location $set (or
+$unset) added by location_updates(). Any other change to a coordinate, such
+as setting only one or unsetting one, is followed by a server-side recompute
+of location_expression() on the updated documents.
+
+Points and areas passed to the query helpers use (lat, long) pairs, the
+order the dashboard map uses. GeoJSON geometries are passed through unchanged.
+
+Requirements following EARS format:
+- When a document has a valid latitude and longitude, add_location() shall store them as a GeoJSON Point in location
+- If a coordinate is missing, not a number or out of range, geo_point() shall return None
+- When an update changes location_lat or location_long, the package shall keep location current
+- When near_filter() or within_filter() is called, the helper shall return a filter a 2dsphere index on location can serve
+"""
+
+import math
+from typing import Any, Dict, Optional, Sequence, Union
+
+from .query_cache import _updated_fields
+
+LOCATION_FIELD = 'location'
+LAT_FIELD = 'location_lat'
+LONG_FIELD = 'location_long'
+
+COORDINATE_FIELDS = frozenset({LAT_FIELD, LONG_FIELD})
+
+GEO_INDEX_NAME = 'idx_location_2dsphere'
+
+# A (lat, long) pair, or a GeoJSON Point
+PointLike = Union[Sequence[float], Dict[str, Any]]
+
+
+def _coordinate(value: Any, limit: float) -> Optional[float]:
+    """value as a float within [-limit, limit], or None."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) and -limit <= number <= limit else None
+
+
+def geo_point(lat: Any, long: Any) -> Optional[Dict[str, Any]]:
+    """
+    Build a GeoJSON Point from a latitude and longitude.
+
+    Args:
+        lat (Any): Latitude in degrees
+        long (Any): Longitude in degrees
+
+    Returns:
+        Optional[Dict[str, Any]]: {'type': 'Point', 'coordinates': [long, lat]}, or None
+                                  if either coordinate is missing or out of range
+    """
+    lat, long = _coordinate(lat, 90), _coordinate(long, 180)
+    if lat is None or long is None:
+        return None
+    return {'type': 'Point', 'coordinates': [long, lat]}
+
+
+def add_location(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add a location Point to a document, in place, from its location_lat and location_long.
+
+    A document that already has a location, or has no valid coordinates,
+    is left unchanged.
+
+    Returns:
+        Dict[str, Any]: The same document, for chaining
+    """
+    if LOCATION_FIELD not in document:
+        point = geo_point(document.get(LAT_FIELD), document.get(LONG_FIELD))
+        if point is not None:
+            document[LOCATION_FIELD] = point
+    return document
+
+
+def location_updates(update_values: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Keep location current for an update that $sets both coordinates.
+
+    Args:
+        update_values (Dict[str, Any]): Update spec
+
+    Returns:
+        Dict[str, Dict[str, Any]]: {'$set': {location: point}}, or {'$unset': {location: ''}}
+                                   when the new coordinates are invalid (empty unless both
+                                   coordinates are in $set)
+    """
+    set_values = update_values.get('$set')
+    if not isinstance(set_values, dict) or LAT_FIELD not in set_values or LONG_FIELD not in set_values:
+        return {}
+    point = geo_point(set_values[LAT_FIELD], set_values[LONG_FIELD])
+    return {'$set': {LOCATION_FIELD: point}} if point is not None else {'$unset': {LOCATION_FIELD: ''}}
+
+
+def location_needs_refresh(update_values: Any) -> bool:
+    """
+    Whether an update may change a coordinate without location_updates() covering it.
+
+    That is any update touching location_lat or location_long other than a
+    $set of both, unless it names location itself. Unknown specs, such as
+    pipelines, count as yes.
+    """
+    fields = _updated_fields(update_values) if isinstance(update_values, dict) else None
+    if fields is None:
+        return True
+    if LOCATION_FIELD in fields or not fields & COORDINATE_FIELDS:
+        return False
+    operators = [operator for operator, spec in update_values.items()
+                 if _updated_fields({operator: spec}) & COORDINATE_FIELDS]
+    return operators != ['$set'] or not location_updates(update_values)
+
+
+def _valid_coordinate(field: str, limit: float) -> Dict[str, Any]:
+    """Expression: the field is a number within [-limit, limit]."""
+    return {'$and': [
+        {'$in': [{'$type': f'${field}'}, ['double', 'int', 'long', 'decimal']]},
+        {'$gte': [f'${field}', -limit]},
+        {'$lte': [f'${field}', limit]},
+    ]}
+
+
+def location_expression() -> Dict[str, Any]:
+    """
+    Aggregation expression computing location on the server, as add_location() does.
+
+    Documents without valid numeric coordinates get no location ($$REMOVE).
+
+    Returns:
+        Dict[str, Any]: Expression for a $set stage of a pipeline update
+    """
+    return {'$cond': [
+        {'$and': [_valid_coordinate(LAT_FIELD, 90), _valid_coordinate(LONG_FIELD, 180)]},
+        {'type': 'Point', 'coordinates': [f'${LONG_FIELD}', f'${LAT_FIELD}']},
+        '$$REMOVE',
+    ]}
+
+
+def as_point(point: PointLike) -> Dict[str, Any]:
+    """
+    Normalize a (lat, long) pair or a GeoJSON Point.
+
+    Raises:
+        ValueError: If point is neither, or its coordinates are out of range
+    """
+    if isinstance(point, dict):
+        if point.get('type') != 'Point':
+            raise ValueError("point must be a (lat, long) pair or a GeoJSON Point")
+        return point
+    if isinstance(point, (str, bytes)) or not isinstance(point, Sequence) or len(point) != 2:
+        raise ValueError("point must be a (lat, long) pair or a GeoJSON Point")
+    geometry = geo_point(point[0], point[1])
+    if geometry is None:
+        raise ValueError(f"point {tuple(point)} is not a valid (lat, long) pair")
+    return geometry
+
+
+def as_polygon(area: Union[Sequence[PointLike], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Normalize an area to a GeoJSON Polygon.
+
+    Args:
+        area: A GeoJSON Polygon or MultiPolygon; a bounding box as two corners
+              ((south, west), (north, east)), which is the map bounds format; or a
+              ring of three or more (lat, long) vertices (closed automatically)
+
+    Returns:
+        Dict[str, Any]: GeoJSON geometry
+
+    Raises:
+        ValueError: If area is none of the above
+    """
+    if isinstance(area, dict):
+        if area.get('type') not in ('Polygon', 'MultiPolygon'):
+            raise ValueError("area must be a GeoJSON Polygon, a bounding box or a list of (lat, long) vertices")
+        return area
+    if isinstance(area, (str, bytes)) or not isinstance(area, Sequence) or len(area) < 2:
+        raise ValueError("area must be a GeoJSON Polygon, a bounding box or a list of (lat, long) vertices")
+
+    vertices = [as_point(vertex)['coordinates'] for vertex in area]
+    if len(vertices) == 2:
+        (west, south), (east, north) = vertices
+        if south > north or west > east:
+            raise ValueError("bounding box must be ((south, west), (north, east))")
+        vertices = [[west, south], [east, south], [east, north], [west, north]]
+    if vertices[0] != vertices[-1]:
+        vertices.append(vertices[0])
+    if len(vertices) < 4:
+        raise ValueError("a polygon needs at least three distinct vertices")
+    return {'type': 'Polygon', 'coordinates': [vertices]}
+
+
+def near_filter(point: PointLike, max_distance: Optional[float] = None,
+                min_distance: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Filter for documents ordered by distance from a point, nearest first.
+
+    Args:
+        point (PointLike): (lat, long) pair or GeoJSON Point
+        max_distance (Optional[float]): Farthest distance in meters (default: no limit)
+        min_distance (Optional[float]): Closest distance in meters (default: 0)
+
+    Returns:
+        Dict[str, Any]: {location: {$near: ...}}
+
+    Raises:
+        ValueError: If the point or a distance is invalid
+    """
+    near: Dict[str, Any] = {'$geometry': as_point(point)}
+    for operator, distance in (('$maxDistance', max_distance), ('$minDistance', min_distance)):
+        if distance is not None:
+            if isinstance(distance, bool) or not isinstance(distance, (int, float)) or distance < 0:
+                raise ValueError(f"{operator[1:]} must be a non-negative number of meters")
+            near[operator] = distance
+    return {LOCATION_FIELD: {'$near': near}}
+
+
+def within_filter(area: Union[Sequence[PointLike], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Filter for documents located inside an area (see as_polygon()).
+
+    Polygon edges are geodesics, so over long distances an edge bulges away
+    from the line of constant latitude a map draws. At city scale the
+    difference is negligible.
+
+    Returns:
+        Dict[str, Any]: {location: {$geoWithin: {$geometry: ...}}}
+    """
+    return {LOCATION_FIELD: {'$geoWithin': {'$geometry': as_polygon(area)}}}
@@ -0,0 +1,330 @@
+"""
+Workload-Driven Index Advisor for AnimalShelter
+CS 340 Module Four Milestone
+
+ensure_indexes() creates a fixed set of single-field indexes. The dashboard's
+real queries combine several fields (the rescue filters match animal_type,
+breed and sex_upon_outcome together), and a single-field index serves only
+one of them. IndexAdvisor reads the query shapes recorded by a QueryProfiler
+and proposes the compound indexes that workload needs.
+
+- Keys follow the ESR rule: equality fields first, then sort fields, then
+  range fields. Equality fields used by more queries come first, so one
+  index can serve several shapes through its prefix.
+- A proposal whose keys are a prefix of another proposal, or of an existing
+  index, is dropped, because the longer index already serves it. An existing
+  partial index only serves queries that match its filter, so it only counts
+  when the proposal would get the same filter.
+- When a filtered field is present in fewer than sparse_ratio of the
+  documents (sparse imports omit blank fields), the index is made partial
+  on {field: {$exists: true}}. The index is then smaller, and queries that
+  match the field on a value still use it.
+- unused_indexes() reads $indexStats and flags indexes that have served no
+  queries since the server started, plus indexes that are a prefix of
+  another index. Either kind only adds write overhead. The _id and unique
+  indexes are never flagged, because they enforce constraints. For the
+  same reason a proposal never replaces them, and a partial proposal
+  replaces nothing.
+
+Requirements following EARS format:
+- When recommend() is called, the IndexAdvisor shall propose compound indexes in equality, sort, range order for the recorded query shapes
+- When a proposed index is already served by an existing index, the IndexAdvisor shall not propose it
+- When unused_indexes() is called, the IndexAdvisor shall report indexes with no recorded accesses and indexes that prefix another index
+- When apply() is called, the IndexAdvisor shall create the proposed indexes that do not exist yet and drop nothing unless asked to
+"""
+
+import logging
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Free-text fields whose typed counterpart should be used for ranges and sorts
+TYPED_ALTERNATIVES = {
+    'age_upon_outcome': 'age_upon_outcome_in_weeks',
+}
+
+# Indexes that are never reported as unused
+PROTECTED_INDEXES = frozenset({'_id_'})
+
+
+def key_pattern(key: Iterable[Sequence[Any]]) -> List[Tuple[str, Any]]:
+    """
+    An index's (field, direction) pairs with numeric directions as ints.
+
+    Special index types such as '2dsphere' or 'text' keep their string value.
+    """
+    return [(field, int(direction) if isinstance(direction, (int, float)) else direction)
+            for field, direction in key]
+
+
+def esr_keys(equality: Sequence[str], sort_keys: Sequence[Sequence[Any]],
+             range_fields: Sequence[str]) -> List[Tuple[str, int]]:
+    """
+    Order index keys as equality, sort, range.
+
+    Args:
+        equality (Sequence[str]): Fields matched on a value, in the order to use
+        sort_keys (Sequence[Sequence[Any]]): (field, direction) pairs of the query's sort
+        range_fields (Sequence[str]): Fields matched on a range or pattern
+
+    Returns:
+        List[Tuple[str, int]]: Index key pattern, each field once
+    """
+    keys, seen = [], set()
+    for field, direction in [(field, 1) for field in equality] + [tuple(pair) for pair in sort_keys] + \
+            [(field, 1) for field in range_fields]:
+        if field not in seen:
+            seen.add(field)
+            keys.append((field, int(direction)))
+    return keys
+
+
+def index_name(keys: Sequence[Tuple[str, int]]) -> str:
+    """Name an index after its fields, e.g. idx_animal_type_breed or idx_datetime_desc_id_desc."""
+    return 'idx_' + '_'.join(field.strip('_').replace('.', '_') + ('_desc' if direction == -1 else '')
+                             for field, direction in keys)
+
+
+def serves(index_keys: Sequence[Tuple[str, int]], keys: Sequence[Tuple[str, int]]) -> bool:
+    """
+    Whether an index on index_keys can serve everything an index on keys would.
+
+    That is the case when keys is a prefix of index_keys, with the same
+    directions or with every direction reversed (an index can be walked
+    backwards).
+
+    Args:
+        index_keys (Sequence[Tuple[str, int]]): Key pattern of the existing index
+        keys (Sequence[Tuple[str, int]]): Key pattern of the wanted index
+
+    Returns:
+        bool: True if the wanted index is redundant
+    """
+    if len(keys) > len(index_keys):
+        return False
+    prefix = key_pattern(index_keys[:len(keys)])
+    wanted = key_pattern(keys)
+    reversed_keys = [(field, -direction if isinstance(direction, int) else direction) for field, direction in wanted]
+    return prefix == wanted or prefix == reversed_keys
+
+
+class IndexAdvisor:
+    """
+    Proposes, builds and audits indexes for the query shapes an application actually runs.
+    """
+
+    def __init__(self, collection, profiler=None, sparse_ratio: float = 0.5, min_count: int = 1,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize an advisor for a collection.
+
+        Args:
+            collection: pymongo Collection to advise on
+            profiler (Optional[QueryProfiler]): Source of the recorded query shapes
+            sparse_ratio (float): Make an index partial when a filtered field is present in
+                                  fewer than this fraction of documents (0 disables partial indexes)
+            min_count (int): Ignore query shapes recorded fewer times than this
+            logger (Optional[logging.Logger]): Logger to report proposals and changes to
+
+        Raises:
+            ValueError: If sparse_ratio is not between 0 and 1 or min_count is less than 1
+        """
+        if not 0 <= sparse_ratio <= 1 or min_count < 1:
+            raise ValueError("sparse_ratio must be between 0 and 1 and min_count at least 1")
+        self.collection = collection
+        self.profiler = profiler
+        self.sparse_ratio = sparse_ratio
+        self.min_count = min_count
+        self.logger = logger or logging.getLogger(__name__)
+
+    def recommend(self, shapes: Optional[Iterable[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Propose indexes for the recorded query shapes.
+
+        Args:
+            shapes (Optional[Iterable[Dict[str, Any]]]): Rows shaped like QueryProfiler.report()
+                                                       'shapes' (default: every shape the
+                                                       profiler has recorded)
+
+        Returns:
+            List[Dict[str, Any]]: Proposals, costliest first, each with 'name', 'keys',
+                                  'partial_filter' (or None), 'queries' (calls served),
+                                  'total_ms', 'operations', 'replaces' (existing indexes the
+                                  proposal makes redundant) and 'warnings'
+
+        Raises:
+            ValueError: If no shapes are given and the advisor has no profiler
+        """
+        if shapes is None:
+            if self.profiler is None:
+                raise ValueError("recommend() needs query shapes or a QueryProfiler")
+            shapes = self.profiler.report(top=sys.maxsize)['shapes']
+        shapes = [shape for shape in shapes if shape.get('count', 1) >= self.min_count]
+
+        # Equality fields shared by more calls lead, so related shapes share an index prefix
+        weight: Dict[str, int] = {}
+        for shape in shapes:
+            for field in shape.get('equality', []):
+                weight[field] = weight.get(field, 0) + shape.get('count', 1)
+
+        proposals: Dict[Tuple[Tuple[str, int], ...], Dict[str, Any]] = {}
+        for shape in shapes:
+            equality = sorted(shape.get('equality', []), key=lambda field: (-weight[field], field))
+            keys = tuple(esr_keys(equality, shape.get('sort_keys', []), shape.get('range', [])))
+            if not keys:
+                continue
+            proposal = proposals.setdefault(keys, {
+                'keys': list(keys), 'filtered': set(shape.get('equality', [])) | set(shape.get('range', [])),
+                'queries': 0, 'total_ms': 0.0, 'operations': set(), 'warnings': set(),
+            })
+            # Only fields every shape filters on may go into a partial filter
+            proposal['filtered'] &= set(shape.get('equality', [])) | set(shape.get('range', []))
+            proposal['queries'] += shape.get('count', 1)
+            proposal['total_ms'] += shape.get('total_ms', 0.0)
+            proposal['operations'].add(shape.get('operation', 'read'))
+            for field in shape.get('range', []) + [field for field, _ in shape.get('sort_keys', [])]:
+                if field in TYPED_ALTERNATIVES:
+                    proposal['warnings'].add(
+                        f"{field} is free text; range and sort on {TYPED_ALTERNATIVES[field]} instead")
+
+        # Fold proposals served by a longer proposal into it
+        for keys in sorted(proposals, key=len):
+            longer = [other for other in proposals if other != keys and serves(other, keys)]
+            if longer:
+                target = proposals[max(longer, key=len)]
+                source = proposals.pop(keys)
+                target['queries'] += source['queries']
+                target['total_ms'] += source['total_ms']
+                target['operations'] |= source['operations']
+                target['warnings'] |= source['warnings']
+                target['filtered'] &= source['filtered']
+
+        info = self.collection.index_information()
+        existing = {name: key_pattern(spec['key']) for name, spec in info.items()}
+        # Unique indexes enforce constraints (the importer's natural key), so they are never replaced
+        replaceable = {name: index_keys for name, index_keys in existing.items()
+                       if name not in PROTECTED_INDEXES and not info[name].get('unique')}
+        results = []
+        for keys, proposal in proposals.items():
+            partial_filter = self._partial_filter(keys, proposal['filtered'])
+            # A partial index only serves the queries its filter matches, so it must have the proposal's filter
+            if any(serves(index_keys, keys) and (info[name].get('partialFilterExpression') or None) == partial_filter
+                   for name, index_keys in existing.items()):
+                continue
+            results.append({
+                'name': index_name(keys),
+                'keys': list(keys),
+                'partial_filter': partial_filter,
+                'queries': proposal['queries'],
+                'total_ms': round(proposal['total_ms'], 3),
+                'operations': sorted(proposal['operations']),
+                # A partial index cannot stand in for a full one
+                'replaces': [] if partial_filter else sorted(
+                    name for name, index_keys in replaceable.items() if serves(keys, index_keys)),
+                'warnings': sorted(proposal['warnings']),
+            })
+
+        results.sort(key=lambda proposal: (proposal['total_ms'], proposal['queries']), reverse=True)
+        self.logger.info(f"Index advisor proposed {len(results)} indexes for {len(shapes)} query shapes")
+        return results
+
+    def unused_indexes(self, min_ops: int = 0) -> List[Dict[str, Any]]:
+        """
+        Flag indexes that cost writes without serving reads.
+
+        Access counts come from $indexStats and restart from zero when the
+        server restarts, so check 'since' before dropping anything.
+
+        Args:
+            min_ops (int): Flag indexes used at most this many times
+
+        Returns:
+            List[Dict[str, Any]]: 'name', 'keys', 'ops', 'since' and 'reasons' for each
+                                  flagged index
+
+        Raises:
+            Exception: If $indexStats or the index list cannot be read
+        """
+        try:
+            info = self.collection.index_information()
+            stats = {row['name']: row for row in self.collection.aggregate([{'$indexStats': {}}])}
+        except Exception as e:
+            self.logger.error(f"Failed to read index statistics: {str(e)}")
+            raise Exception(f"Failed to read index statistics: {str(e)}") from e
+
+        existing = {name: key_pattern(spec['key']) for name, spec in info.items()}
+        # A partial index only serves some queries, so it never makes another index redundant
+        full = {name: keys for name, keys in existing.items() if not info[name].get('partialFilterExpression')}
+        flagged = []
+        for name, keys in existing.items():
+            if name in PROTECTED_INDEXES or info[name].get('unique'):
+                continue
+            accesses = stats.get(name, {}).get('accesses', {})
+            ops = int(accesses.get('ops', 0))
+            reasons = []
+            if ops <= min_ops:
+                reasons.append(f"{ops} accesses since {accesses.get('since', 'server start')}")
+            covering = sorted(other for other, other_keys in full.items()
+                              if other != name and len(other_keys) > len(keys) and serves(other_keys, keys))
+            if covering:
+                reasons.append(f"prefix of {', '.join(covering)}")
+            typed = [TYPED_ALTERNATIVES[field] for field, _ in keys if field in TYPED_ALTERNATIVES]
+            if typed:
+                reasons.append(f"indexes free text; query {', '.join(typed)} instead")
+            if reasons:
+                flagged.append({'name': name, 'keys': keys, 'ops': ops, 'since': accesses.get('since'),
+                                'reasons': reasons})
+
+        self.logger.info(f"Index advisor flagged {len(flagged)} of {len(existing)} indexes")
+        return flagged
+
+    def apply(self, proposals: Optional[Sequence[Dict[str, Any]]] = None,
+              drop_unused: bool = False) -> Dict[str, List[str]]:
+        """
+        Build proposed indexes and, optionally, drop the ones they replace.
+
+        Args:
+            proposals (Optional[Sequence[Dict[str, Any]]]): Output of recommend()
+                                                          (default: a fresh recommend())
+            drop_unused (bool): Also drop the existing indexes each new index replaces
+                                (indexes flagged only as unused are never dropped)
+
+        Returns:
+            Dict[str, List[str]]: 'created' and 'dropped' index names
+
+        Raises:
+            Exception: If creating or dropping an index fails
+        """
+        if proposals is None:
+            proposals = self.recommend()
+        created, dropped = [], []
+        try:
+            for proposal in proposals:
+                options = {'name': proposal['name']}
+                if proposal.get('partial_filter'):
+                    options['partialFilterExpression'] = proposal['partial_filter']
+                self.collection.create_index(proposal['keys'], **options)
+                created.append(proposal['name'])
+            if drop_unused:
+                for name in sorted({name for proposal in proposals for name in proposal.get('replaces', [])}):
+                    self.collection.drop_index(name)
+                    dropped.append(name)
+        except Exception as e:
+            self.logger.error(f"Failed to apply index advice: {str(e)}")
+            raise Exception(f"Failed to apply index advice: {str(e)}") from e
+
+        self.logger.info(f"Index advisor created {len(created)} and dropped {len(dropped)} indexes")
+        return {'created': created, 'dropped': dropped}
+
+    def _partial_filter(self, keys: Sequence[Tuple[str, int]], filtered: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """$exists filter on the filtered index fields that most documents lack, or None."""
+        if not self.sparse_ratio:
+            return None
+        total = self.collection.estimated_document_count()
+        if not total:
+            return None
+        partial = {}
+        for field, _ in keys:
+            if field in filtered and \
+                    self.collection.count_documents({field: {'$exists': True}}) < self.sparse_ratio * total:
+                partial[field] = {'$exists': True}
+        return partial or None
@@ -0,0 +1,318 @@
+"""
+Parallel Import Engine for Austin Animal Center (AAC) Dataset
+CS 340 Module Four Milestone
+
+This module runs the AAC import as a three-stage pipeline so that parsing,
+cleaning and writing overlap instead of running one after another:
+
+- The main thread reads the CSV file as raw text blocks
+- A process pool parses and cleans each block with pandas
+- A pool of writer threads sends batches to MongoDB over one pooled MongoClient
+
+Stages are connected by bounded queues, so a slow stage applies back-pressure
+to the stages before it and memory stays bounded.
+
+Requirements following EARS format:
+- When run() is called, the ParallelImportEngine shall import every cleaned record exactly once
+- When the writers fall behind, the ParallelImportEngine shall block the readers rather than buffer without limit
+- When run() completes, the ParallelImportEngine shall report per-stage throughput in the stats dictionary
+"""
+
+import io
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+from tqdm import tqdm
+
+from .animal_shelter import AnimalShelter
+from .data_importer import AACDataImporter, KEYED_STRATEGIES, SeenKeySet
+
+
+# Per-process importer used by the parse/clean workers (set by _init_worker)
+_worker_importer: Optional[AACDataImporter] = None
+
+
+def _init_worker(importer_kwargs: Dict[str, Any]) -> None:
+    """Create the importer used for cleaning in a worker process."""
+    global _worker_importer
+    _worker_importer = AACDataImporter(**importer_kwargs)
+
+
+def _parse_and_clean(header: str, text: str) -> Dict[str, Any]:
+    """
+    Parse one block of CSV text and clean it (runs in a worker process).
+
+    Args:
+        header (str): CSV header line
+        text (str): CSV data lines for this block
+
+    Returns:
+        Dict[str, Any]: Cleaned 'records', raw 'rows' count and busy 'seconds'
+    """
+    started = time.perf_counter()
+    df = pd.read_csv(io.StringIO(header + text), **_worker_importer._read_csv_kwargs())
+    cleaned_df = _worker_importer._clean_frame(df)
+    return {
+        'records': _worker_importer._frame_to_records(cleaned_df),
+        'rows': len(df),
+        'seconds': time.perf_counter() - started
+    }
+
+
+def iter_csv_text_blocks(csv_path: Path, chunk_size: int) -> Iterator[str]:
+    """
+    Split a CSV file into blocks of about chunk_size rows without parsing it.
+
+    A block never ends inside a quoted field, so rows with embedded newlines
+    stay intact.
+
+    Args:
+        csv_path (Path): CSV file to read
+        chunk_size (int): Number of rows per block
+
+    Yields:
+        str: The header line first, then blocks of data lines
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        yield f.readline()
+
+        lines: List[str] = []
+        in_quotes = False
+        for line in f:
+            lines.append(line)
+            if line.count('"') % 2:
+                in_quotes = not in_quotes
+            if not in_quotes and len(lines) >= chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+
+class ParallelImportEngine:
+    """
+    Pipelined, multi-process/multi-thread importer for the AAC dataset.
+
+    The engine reuses the AACDataImporter cleaning rules and write strategies,
+    so its results match a serial import; only the scheduling differs.
+    """
+
+    def __init__(self, importer: AACDataImporter, workers: int = 2, writers: int = 2,
+                 chunk_size: int = 50000, batch_size: int = 1000, strategy: str = 'bulk'):
+        """
+        Initialize the parallel import engine.
+
+        Args:
+            importer (AACDataImporter): Importer providing the CSV path, cleaning and write logic
+            workers (int): Number of parse/clean worker processes
+            writers (int): Number of MongoDB writer threads
+            chunk_size (int): Number of CSV rows parsed per worker task
+            batch_size (int): Number of records per write batch
+            strategy (str): Write strategy passed to AACDataImporter._write_batch()
+        """
+        self.importer = importer
+        self.logger = importer.logger
+        self.workers = max(1, int(workers))
+        self.writers = max(1, int(writers))
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.strategy = strategy
+
+        # Bounded hand-off points between stages (back-pressure)
+        self.max_pending_chunks = self.workers * 2
+        self.write_queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(maxsize=self.writers * 2)
+
+        self._lock = threading.Lock()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the parallel import.
+
+        Returns:
+            Dict[str, Any]: Import statistics in the same shape as
+                            AACDataImporter.import_data(), plus 'workers',
+                            'writers' and per-stage throughput under 'stages'
+        """
+        stats = {
+            'total_records': 0,
+            'strategy': self.strategy,
+            'workers': self.workers,
+            'writers': self.writers,
+            'successful_imports': 0,
+            'failed_imports': 0,
+            'errors': [],
+            'start_time': time.time(),
+            'end_time': None,
+            'duration': None
+        }
+        stage_times = {
+            'read_seconds': 0.0,
+            'parse_seconds': 0.0,
+            'write_seconds': 0.0,
+            'rows_parsed': 0,
+            'dispatch_blocked_seconds': 0.0,
+            'writer_idle_seconds': 0.0
+        }
+
+        self.logger.info(f"Starting parallel import with {self.workers} workers and {self.writers} writers...")
+
+        # One AnimalShelter (and so one pooled MongoClient) shared by every writer thread
+        shelter = AnimalShelter(shared_client=True)
+        self.importer.shelter = shelter
+        writer_threads: List[threading.Thread] = []
+
+        try:
+            if self.strategy in KEYED_STRATEGIES:
+                self.importer._prepare_keyed_import(self.strategy)
+
+            with tqdm(desc="Importing records", unit="record") as pbar:
+                for _ in range(self.writers):
+                    thread = threading.Thread(target=self._writer_loop, args=(stats, stage_times, pbar), daemon=True)
+                    thread.start()
+                    writer_threads.append(thread)
+
+                try:
+                    self._dispatch(stage_times)
+                finally:
+                    # Tell every writer to stop once the queue drains
+                    for _ in writer_threads:
+                        self.write_queue.put(None)
+                    for thread in writer_threads:
+                        thread.join()
+        finally:
+            self.importer.shelter = None
+            shelter.close_connection()
+
+        stats['end_time'] = time.time()
+        stats['duration'] = stats['end_time'] - stats['start_time']
+        stats['stages'] = self._stage_report(stats, stage_times)
+
+        self.logger.info("Parallel import completed!")
+        self.logger.info(f"Successful imports: {stats['successful_imports']}")
+        self.logger.info(f"Failed imports: {stats['failed_imports']}")
+        self.logger.info(f"Duration: {stats['duration']:.2f} seconds (bottleneck: {stats['stages']['bottleneck']})")
+
+        return stats
+
+    def _dispatch(self, stage_times: Dict[str, Any]) -> None:
+        """Read text blocks, fan them out to the process pool and queue cleaned batches in order."""
+        seen_keys = SeenKeySet()
+        pending = deque()
+
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(self.importer._worker_kwargs(),)) as pool:
+            blocks = iter_csv_text_blocks(self.importer.csv_path, self.chunk_size)
+            header = next(blocks, '')
+
+            while True:
+                read_started = time.perf_counter()
+                block = next(blocks, None)
+                stage_times['read_seconds'] += time.perf_counter() - read_started
+
+                if block is not None:
+                    pending.append(pool.submit(_parse_and_clean, header, block))
+
+                # Drain the oldest chunk when the pool is saturated or input is exhausted;
+                # taking results in submission order keeps "first occurrence wins" dedup.
+                while pending and (block is None or len(pending) >= self.max_pending_chunks):
+                    self._queue_chunk(pending.popleft().result(), seen_keys, stage_times)
+                    if block is not None:
+                        break
+
+                if block is None:
+                    break
+
+    def _queue_chunk(self, chunk: Dict[str, Any], seen_keys: SeenKeySet, stage_times: Dict[str, Any]) -> None:
+        """Drop natural keys kept from earlier chunks and queue the rest as write batches."""
+        stage_times['parse_seconds'] += chunk['seconds']
+        stage_times['rows_parsed'] += chunk['rows']
+
+        records = chunk['records']
+        if records:
+            hashes = SeenKeySet.hash_keys(pd.Series([self.importer._key_of(record) for record in records]))
+            keep = ~seen_keys.contains(hashes)
+            seen_keys.add(hashes[keep])
+            records = [record for record, kept in zip(records, keep) if kept]
+
+        for start in range(0, len(records), self.batch_size):
+            put_started = time.perf_counter()
+            self.write_queue.put(records[start:start + self.batch_size])
+            stage_times['dispatch_blocked_seconds'] += time.perf_counter() - put_started
+
+    def _writer_loop(self, stats: Dict[str, Any], stage_times: Dict[str, Any], pbar: tqdm) -> None:
+        """Write queued batches until a stop sentinel is received."""
+        while True:
+            wait_started = time.perf_counter()
+            batch = self.write_queue.get()
+            idle = time.perf_counter() - wait_started
+            if batch is None:
+                return
+
+            write_started = time.perf_counter()
+            try:
+                batch_result = self.importer._write_batch(batch, self.strategy)
+            except Exception as e:
+                batch_result = {
+                    'successful': 0,
+                    'failed': len(batch),
+                    'errors': [f"Error importing batch of {len(batch)} records: {str(e)}"]
+                }
+                self.logger.error(batch_result['errors'][0])
+            elapsed = time.perf_counter() - write_started
+
+            with self._lock:
+                AACDataImporter._merge_batch_result(stats, batch_result, len(batch))
+                stage_times['write_seconds'] += elapsed
+                stage_times['writer_idle_seconds'] += idle
+                pbar.update(len(batch))
+
+    def _stage_report(self, stats: Dict[str, Any], stage_times: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize per-stage throughput.
+
+        'busy_seconds' is summed across a stage's workers, and
+        'records_per_second' is the stage's capacity with all of its workers
+        busy. The slowest stage by capacity is reported as the bottleneck:
+        'parse' means the load is CPU-bound, 'write' means it is I/O-bound.
+        """
+        def rate(count: int, busy_seconds: float, parallelism: int) -> Optional[float]:
+            return count * parallelism / busy_seconds if busy_seconds > 0 else None
+
+        records = stats['total_records']
+        report = {
+            'read': {
+                'rows': stage_times['rows_parsed'],
+                'busy_seconds': stage_times['read_seconds'],
+                'records_per_second': rate(stage_times['rows_parsed'], stage_times['read_seconds'], 1)
+            },
+            'parse': {
+                'rows': stage_times['rows_parsed'],
+                'busy_seconds': stage_times['parse_seconds'],
+                'records_per_second': rate(stage_times['rows_parsed'], stage_times['parse_seconds'], self.workers)
+            },
+            'write': {
+                'records': records,
+                'busy_seconds': stage_times['write_seconds'],
+                'idle_seconds': stage_times['writer_idle_seconds'],
+                'records_per_second': rate(records, stage_times['write_seconds'], self.writers)
+            },
+            'dispatch_blocked_seconds': stage_times['dispatch_blocked_seconds'],
+            'overall_records_per_second': records / stats['duration'] if stats['duration'] else None
+        }
+
+        capacities = {
+            stage: report[stage]['records_per_second']
+            for stage in ('read', 'parse', 'write')
+            if report[stage]['records_per_second']
+        }
+        report['bottleneck'] = min(capacities, key=capacities.get) if capacities else None
+        return report
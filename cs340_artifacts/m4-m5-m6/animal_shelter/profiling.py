@@ -0,0 +1,382 @@
+"""
+Query Profiling and Slow-Query Log for AnimalShelter
+CS 340 Module Four Milestone
+
+QueryProfiler shows how AnimalShelter queries actually run. It is opt-in,
+and an AnimalShelter created with profiler=True (or QUERY_PROFILE=true)
+times every read, update and delete it sends to MongoDB.
+
+- Each call is recorded under its query shape. The shape is the filter with
+  every literal value replaced by '?', so {"animal_type": "Dog"} and
+  {"animal_type": "Cat"} count as the same query, and no document values end
+  up in the log.
+- A call that takes at least slow_ms is explained with executionStats
+  verbosity. Keys examined, documents examined and the plan stages, including
+  COLLSCAN, go into a ring buffer of the most recent slow queries and,
+  if a log path is set, a JSONL slow-query log.
+- report() ranks shapes by total time, so the shapes worth an index or a
+  rewrite come first.
+
+Explaining re-runs the query plan on the server, so only slow calls are
+explained, and explain errors are recorded instead of raised.
+
+Requirements following EARS format:
+- Where profiling is enabled, the AnimalShelter shall record the duration and query shape of each read, update and delete
+- When a profiled call takes at least slow_ms, the QueryProfiler shall keep its explain() summary in the slow-query ring buffer
+- Where a slow-query log path is set, the QueryProfiler shall append each slow query to it as one JSON line
+- When report() is called, the QueryProfiler shall return the query shapes ordered from most to least expensive
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+_LOGICAL_OPERATORS = ('$and', '$or', '$nor')
+# Operators that test a field against one value or a set of values
+_EQUALITY_OPERATORS = ('$eq', '$in')
+# Operators whose value is a filter on array elements rather than a literal
+_NESTED_FILTER_OPERATORS = ('$elemMatch', '$not')
+# Operators served by a 2dsphere index rather than an ordinary key
+_GEO_OPERATORS = ('$near', '$nearSphere', '$geoWithin', '$geoIntersects')
+
+REPORT_ORDERINGS = ('total_ms', 'max_ms', 'mean_ms', 'count', 'slow_count')
+
+PLACEHOLDER = '?'
+
+
+def query_shape(criteria: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return criteria with every literal value replaced by '?'.
+
+    Field names and operators are kept. Lists given to $in, $nin and $all
+    become a single '?', so the shape does not depend on how many values
+    were passed.
+
+    Args:
+        criteria (Optional[Dict[str, Any]]): Query filter
+
+    Returns:
+        Dict[str, Any]: The filter's shape
+
+    Example:
+        >>> query_shape({"animal_type": "Dog", "age_upon_outcome_in_weeks": {"$lt": 26}})
+        {'animal_type': '?', 'age_upon_outcome_in_weeks': {'$lt': '?'}}
+    """
+    shape = {}
+    for field, condition in (criteria or {}).items():
+        if field in _LOGICAL_OPERATORS and isinstance(condition, list):
+            shape[field] = [query_shape(clause) for clause in condition]
+        else:
+            shape[field] = _condition_shape(condition)
+    return shape
+
+
+def _condition_shape(condition: Any) -> Any:
+    """Shape of one field's condition: operator documents keep their operators."""
+    if isinstance(condition, dict) and condition and all(str(key).startswith('$') for key in condition):
+        return {
+            operator: (query_shape(value) if operator in _NESTED_FILTER_OPERATORS and isinstance(value, dict)
+                       else PLACEHOLDER)
+            for operator, value in condition.items()
+        }
+    return PLACEHOLDER
+
+
+def shape_fields(criteria: Optional[Dict[str, Any]],
+                 sort: Optional[Union[str, Sequence[Tuple[str, int]]]] = None) -> Dict[str, List[str]]:
+    """
+    Split the fields a query uses into equality, range and sort fields.
+
+    Only top-level conditions and $and clauses are classified, since an
+    index can serve those together. Plain values, $eq and $in are equality
+    conditions; any other operator counts as a range. Fields under $or or
+    $nor are left out, and so are geo conditions, which need a 2dsphere
+    index rather than an ordinary key.
+
+    Args:
+        criteria (Optional[Dict[str, Any]]): Query filter
+        sort (Optional[Union[str, Sequence[Tuple[str, int]]]]): A field name or (field, direction) pairs
+
+    Returns:
+        Dict[str, List[str]]: 'equality', 'range' and 'sort' field names, in query order
+    """
+    fields = {'equality': [], 'range': [], 'sort': []}
+
+    def classify(query: Dict[str, Any]) -> None:
+        for field, condition in query.items():
+            if field == '$and' and isinstance(condition, list):
+                for clause in condition:
+                    if isinstance(clause, dict):
+                        classify(clause)
+                continue
+            if str(field).startswith('$'):
+                continue
+            is_operator_document = isinstance(condition, dict) and condition and \
+                all(str(key).startswith('$') for key in condition)
+            if is_operator_document and set(condition) & set(_GEO_OPERATORS):
+                continue
+            if is_operator_document and not set(condition) <= set(_EQUALITY_OPERATORS):
+                kind = 'range'
+            else:
+                kind = 'equality'
+            if field not in fields[kind]:
+                fields[kind].append(field)
+
+    classify(criteria or {})
+    # A field with both kinds of condition can only use the index as a range
+    fields['equality'] = [field for field in fields['equality'] if field not in fields['range']]
+    if isinstance(sort, str):
+        fields['sort'] = [sort]
+    elif sort:
+        fields['sort'] = [field for field, _ in sort]
+    return fields
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pull the numbers that matter out of an executionStats explain() result.
+
+    Args:
+        explain (Dict[str, Any]): Output of the explain command
+
+    Returns:
+        Dict[str, Any]: keys_examined, docs_examined, n_returned, execution_ms,
+                        stages (winning plan, outermost first), indexes used and collscan
+    """
+    planner = explain.get('queryPlanner') or {}
+    winning_plan = planner.get('winningPlan') or {}
+    # Servers using the slot-based engine nest the plan under queryPlan
+    winning_plan = winning_plan.get('queryPlan', winning_plan)
+    stats = explain.get('executionStats') or {}
+
+    stages, indexes = [], []
+    pending = [winning_plan]
+    while pending:
+        stage = pending.pop(0)
+        if not isinstance(stage, dict):
+            continue
+        if 'stage' in stage:
+            stages.append(stage['stage'])
+        if stage.get('indexName'):
+            indexes.append(stage['indexName'])
+        if 'inputStage' in stage:
+            pending.append(stage['inputStage'])
+        pending.extend(stage.get('inputStages') or [])
+
+    return {
+        'keys_examined': stats.get('totalKeysExamined'),
+        'docs_examined': stats.get('totalDocsExamined'),
+        'n_returned': stats.get('nReturned'),
+        'execution_ms': stats.get('executionTimeMillis'),
+        'stages': stages,
+        'indexes': indexes,
+        'collscan': 'COLLSCAN' in stages,
+    }
+
+
+class _ShapeStats:
+    """Running totals for one (operation, shape, sort) combination."""
+
+    __slots__ = ('operation', 'shape', 'sort_keys', 'fields', 'count', 'errors', 'slow_count',
+                 'total_ms', 'max_ms', 'plan')
+
+    def __init__(self, operation: str, shape: Dict[str, Any], sort_keys: List[List[Any]],
+                 fields: Dict[str, List[str]]):
+        self.operation = operation
+        self.shape = shape
+        self.sort_keys = sort_keys
+        self.fields = fields
+        self.count = 0
+        self.errors = 0
+        self.slow_count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.plan: Optional[Dict[str, Any]] = None
+
+
+class QueryProfiler:
+    """
+    Thread-safe recorder of query timings, shapes and slow-query plans.
+    """
+
+    def __init__(self, slow_ms: float = 100.0, capacity: int = 100, log_path: Optional[str] = None,
+                 explain: bool = True, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize an empty profiler.
+
+        Args:
+            slow_ms (float): Calls taking at least this many milliseconds are slow
+            capacity (int): Number of slow queries kept in the ring buffer
+            log_path (Optional[str]): JSONL file slow queries are appended to (default: none)
+            explain (bool): Run explain() for slow queries
+            clock (Callable[[], float]): Time source in seconds (tests inject a fake clock)
+
+        Raises:
+            ValueError: If slow_ms is negative or capacity is not positive
+        """
+        if slow_ms < 0 or capacity < 1:
+            raise ValueError("slow_ms must not be negative and capacity must be positive")
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.explain = explain
+        self.clock = clock
+        self._slow_queries: deque = deque(maxlen=capacity)
+        self._shapes: Dict[str, _ShapeStats] = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'QueryProfiler':
+        """
+        Create a profiler configured by QUERY_PROFILE_SLOW_MS, QUERY_PROFILE_BUFFER,
+        QUERY_PROFILE_LOG and QUERY_PROFILE_EXPLAIN.
+
+        Returns:
+            QueryProfiler: A new profiler
+        """
+        return cls(
+            slow_ms=float(os.getenv('QUERY_PROFILE_SLOW_MS', '100')),
+            capacity=int(os.getenv('QUERY_PROFILE_BUFFER', '100')),
+            log_path=os.getenv('QUERY_PROFILE_LOG') or None,
+            explain=os.getenv('QUERY_PROFILE_EXPLAIN', 'true').lower() in ('1', 'true', 'yes')
+        )
+
+    def record(self, operation: str, criteria: Optional[Dict[str, Any]], duration_ms: float,
+               sort: Optional[Union[str, Sequence[Tuple[str, int]]]] = None,
+               explain: Optional[Callable[[], Dict[str, Any]]] = None,
+               error: Optional[BaseException] = None) -> Optional[Dict[str, Any]]:
+        """
+        Record one call.
+
+        Args:
+            operation (str): Operation name, e.g. "read" or "update_many"
+            criteria (Optional[Dict[str, Any]]): The call's filter (only its shape is kept)
+            duration_ms (float): How long the call took
+            sort (Optional[Union[str, Sequence[Tuple[str, int]]]]): The call's sort, if any
+            explain (Optional[Callable[[], Dict[str, Any]]]): Runs the explain command for
+                                                             this call; only called if it was slow
+            error (Optional[BaseException]): The exception the call raised, if any
+
+        Returns:
+            Optional[Dict[str, Any]]: The slow-query entry, or None if the call was not slow
+        """
+        shape = query_shape(criteria)
+        fields = shape_fields(criteria, sort)
+        sort_keys = [[sort, 1]] if isinstance(sort, str) else [[field, direction] for field, direction in sort or ()]
+        key = json.dumps([operation, shape, sort_keys], sort_keys=True, default=str)
+        is_slow = duration_ms >= self.slow_ms
+
+        plan = None
+        if is_slow:
+            plan = self._explain(explain)
+
+        with self._lock:
+            stats = self._shapes.get(key)
+            if stats is None:
+                stats = self._shapes[key] = _ShapeStats(operation, shape, sort_keys, fields)
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            if error is not None:
+                stats.errors += 1
+            if not is_slow:
+                return None
+            stats.slow_count += 1
+            if plan is not None and 'error' not in plan:
+                stats.plan = plan
+
+            entry = {
+                'time': datetime.now(timezone.utc).isoformat(),
+                'operation': operation,
+                'shape': shape,
+                'sort': fields['sort'],
+                'duration_ms': round(duration_ms, 3),
+                'plan': plan,
+                'error': str(error) if error is not None else None,
+            }
+            self._slow_queries.append(entry)
+
+        if self.log_path:
+            self._write_log(entry)
+        return entry
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """
+        The most recent slow queries, oldest first.
+
+        Returns:
+            List[Dict[str, Any]]: Slow-query entries (time, operation, shape, sort,
+                                  duration_ms, plan and error)
+        """
+        with self._lock:
+            return list(self._slow_queries)
+
+    def report(self, top: int = 10, order_by: str = 'total_ms') -> Dict[str, Any]:
+        """
+        Summarize the most expensive query shapes.
+
+        Args:
+            top (int): Number of shapes to return
+            order_by (str): One of 'total_ms', 'max_ms', 'mean_ms', 'count' or 'slow_count'
+
+        Returns:
+            Dict[str, Any]: 'queries' and 'slow_queries' totals, 'slow_ms', and 'shapes':
+                            per shape the operation, shape, equality/range/sort fields,
+                            sort_keys ([field, direction] pairs), count, errors, slow_count, total_ms, mean_ms, max_ms and the
+                            latest slow-query plan summary
+
+        Raises:
+            ValueError: If order_by is not a known ordering
+        """
+        if order_by not in REPORT_ORDERINGS:
+            raise ValueError(f"order_by must be one of {', '.join(REPORT_ORDERINGS)}")
+
+        with self._lock:
+            shapes = [{
+                'operation': stats.operation,
+                'shape': stats.shape,
+                'equality': list(stats.fields['equality']),
+                'range': list(stats.fields['range']),
+                'sort': list(stats.fields['sort']),
+                'sort_keys': [list(pair) for pair in stats.sort_keys],
+                'count': stats.count,
+                'errors': stats.errors,
+                'slow_count': stats.slow_count,
+                'total_ms': round(stats.total_ms, 3),
+                'mean_ms': round(stats.total_ms / stats.count, 3),
+                'max_ms': round(stats.max_ms, 3),
+                'plan': stats.plan,
+            } for stats in self._shapes.values()]
+
+        shapes.sort(key=lambda row: row[order_by], reverse=True)
+        return {
+            'queries': sum(row['count'] for row in shapes),
+            'slow_queries': sum(row['slow_count'] for row in shapes),
+            'slow_ms': self.slow_ms,
+            'shapes': shapes[:top],
+        }
+
+    def reset(self) -> None:
+        """Forget every recorded call and slow query (the log file is kept)."""
+        with self._lock:
+            self._shapes.clear()
+            self._slow_queries.clear()
+
+    def _explain(self, explain: Optional[Callable[[], Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Run and summarize explain for a slow call; failures are returned, not raised."""
+        if not self.explain or explain is None:
+            return None
+        try:
+            return summarize_explain(explain())
+        except Exception as e:
+            return {'error': f"explain failed: {str(e)}"}
+
+    def _write_log(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, default=str)
+        with self._log_lock:
+            with open(self.log_path, 'a', encoding='utf-8') as log_file:
+                log_file.write(line + '\n')
@@ -0,0 +1,392 @@
+"""
+Read-Through Query Cache for AnimalShelter
+CS 340 Module Four Milestone
+
+Dashboards and scripts run the same read() filters again and again against
+a collection that rarely changes. QueryCache keeps recent read() results in
+memory, bounded by entry count and total bytes, with a time-to-live.
+
+- Keys are a canonical BSON encoding of the filter and projection, so
+  {"a": 1, "b": 2} and {"b": 2, "a": 1} share an entry. Operator documents
+  such as {"$gte": x, "$lt": y} are canonicalized the same way. Embedded
+  documents used for exact matches keep their key order, because MongoDB
+  compares them in order.
+- Results are stored BSON-encoded. The entry size is the real byte size,
+  and every hit decodes fresh documents that callers may modify.
+- Writes made through an AnimalShelter drop the entries they might affect.
+  The check is conservative: an entry survives only if its filter pins a
+  scalar AAC field (or _id) to values the write provably cannot produce.
+  Large batches simply clear the cache. Writes from other processes are
+  only picked up when entries expire, so the TTL bounds staleness.
+
+Requirements following EARS format:
+- When get() is called for a key stored within the TTL, the QueryCache shall return a copy of the stored documents
+- When a put() would exceed max_entries or max_bytes, the QueryCache shall evict least recently used entries
+- When a write might change an entry's result, the QueryCache shall drop the entry
+- The QueryCache shall count hits, misses, evictions, expirations and invalidations
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+import bson
+
+from .schema import AAC_FIELDS
+
+
+# Fields known to hold one value per document, where two different equality
+# values cannot both match. Array fields are excluded (["a", "b"] matches both "a" and "b").
+SCALAR_FIELDS = frozenset(AAC_FIELDS) | {'_id'}
+
+# Writes touching more documents or filters than this clear the whole cache
+# instead of checking every entry against every item
+MAX_SELECTIVE_INVALIDATIONS = 100
+
+_LOGICAL_OPERATORS = ('$and', '$or', '$nor')
+
+
+def canonicalize(value: Any, is_filter: bool = True) -> Any:
+    """
+    Return value with order-insensitive dictionaries sorted by key.
+
+    Filters and operator documents are sorted. Embedded documents used as
+    exact-match values keep their order.
+
+    Args:
+        value (Any): Filter, operator document or value
+        is_filter (bool): Whether value is a filter (its top-level keys are fields)
+
+    Returns:
+        Any: Canonical form of value
+    """
+    if isinstance(value, dict):
+        is_operator_document = bool(value) and all(str(key).startswith('$') for key in value)
+        items = value.items()
+        if is_filter or is_operator_document:
+            items = sorted(items, key=lambda item: str(item[0]))
+        return {
+            key: ([canonicalize(clause) for clause in item] if key in _LOGICAL_OPERATORS and isinstance(item, list)
+                  else canonicalize(item, is_filter=False))
+            for key, item in items
+        }
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item, is_filter=False) for item in value]
+    return value
+
+
+def _pinned_values(criteria: Dict[str, Any]) -> Dict[str, FrozenSet[Any]]:
+    """
+    Scalar fields that criteria restricts to a finite set of values.
+
+    Only top-level plain equality, $eq and $in on SCALAR_FIELDS count.
+    Every other condition is ignored, which can only make a write look like
+    it overlaps more entries, never fewer.
+    """
+    pinned = {}
+    for field, condition in (criteria or {}).items():
+        if field not in SCALAR_FIELDS:
+            continue
+        if isinstance(condition, dict):
+            if set(condition) == {'$eq'}:
+                values = [condition['$eq']]
+            elif set(condition) == {'$in'} and isinstance(condition['$in'], (list, tuple)):
+                values = condition['$in']
+            else:
+                continue
+        elif isinstance(condition, (list, tuple, re.Pattern, bson.regex.Regex)):
+            continue
+        else:
+            values = [condition]
+        if any(isinstance(v, (dict, list, tuple, re.Pattern, bson.regex.Regex)) for v in values):
+            continue
+        try:
+            pinned[field] = frozenset(values)
+        except TypeError:
+            continue
+    return pinned
+
+
+def _updated_fields(update_values: Dict[str, Any]) -> Optional[FrozenSet[str]]:
+    """Top-level fields an update spec may change, or None if it cannot be determined."""
+    fields = set()
+    for operator, spec in update_values.items():
+        if not str(operator).startswith('$') or not isinstance(spec, dict):
+            return None
+        for path, target in spec.items():
+            fields.add(str(path).split('.')[0])
+            if operator == '$rename':
+                fields.add(str(target).split('.')[0])
+    return frozenset(fields)
+
+
+class _Entry:
+    """One cached result."""
+
+    __slots__ = ('data', 'size', 'expires_at', 'pinned')
+
+    def __init__(self, data: bytes, expires_at: float, pinned: Dict[str, FrozenSet[Any]]):
+        self.data = data
+        self.size = len(data)
+        self.expires_at = expires_at
+        self.pinned = pinned
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of read() results with a TTL and a byte budget.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached results
+            max_bytes (int): Maximum total BSON size of cached results
+            ttl (float): Seconds a result stays valid
+            clock (Callable[[], float]): Time source (tests inject a fake clock)
+
+        Raises:
+            ValueError: If a bound is not positive
+        """
+        if max_entries < 1 or max_bytes < 1 or ttl <= 0:
+            raise ValueError("max_entries, max_bytes and ttl must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[bytes, _Entry]' = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('hits', 'misses', 'evictions', 'expirations', 'invalidations'), 0)
+
+    @classmethod
+    def from_env(cls) -> 'QueryCache':
+        """
+        Create a cache sized by QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_MAX_BYTES
+        and QUERY_CACHE_TTL (seconds).
+
+        Returns:
+            QueryCache: A new cache
+        """
+        return cls(
+            max_entries=int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '1024')),
+            max_bytes=int(os.getenv('QUERY_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+            ttl=float(os.getenv('QUERY_CACHE_TTL', '300'))
+        )
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation; pass it back to put()."""
+        return self._generation
+
+    @staticmethod
+    def key(criteria: Dict[str, Any], projection: Optional[Union[Dict[str, Any], Sequence[str]]] = None,
+            operation: str = "find") -> Optional[bytes]:
+        """
+        Build the cache key for a filter and projection.
+
+        Args:
+            criteria (Dict[str, Any]): Query filter
+            projection (Optional[Union[Dict[str, Any], Sequence[str]]]): find() projection or field names
+            operation (str): Query kind, so find() and find_one() results for one filter differ
+
+        Returns:
+            Optional[bytes]: The key, or None if the query cannot be encoded (it is then not cached)
+        """
+        if projection is None:
+            canonical_projection = None
+        elif isinstance(projection, dict):
+            canonical_projection = dict(sorted(projection.items()))
+        else:
+            canonical_projection = sorted(projection)
+        try:
+            return bson.encode({'o': operation, 'q': canonicalize(criteria), 'p': canonical_projection})
+        except Exception:
+            return None
+
+    def get(self, key: bytes) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key (bytes): Key from key()
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Freshly decoded documents, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            data = entry.data
+        return bson.decode_all(data)
+
+    def put(self, key: bytes, criteria: Dict[str, Any], documents: Iterable[Dict[str, Any]],
+            generation: Optional[int] = None) -> bool:
+        """
+        Store a result, evicting least recently used entries to stay within bounds.
+
+        Args:
+            key (bytes): Key from key()
+            criteria (Dict[str, Any]): Filter the result was read with (used for invalidation)
+            documents (Iterable[Dict[str, Any]]): The result
+            generation (Optional[int]): generation read before the query ran; the result
+                                        is dropped if a write invalidated entries since
+
+        Returns:
+            bool: True if the result was stored
+        """
+        try:
+            data = b''.join(bson.encode(document) for document in documents)
+        except Exception:
+            return False
+        if len(data) > self.max_bytes:
+            return False
+
+        entry = _Entry(data, self._clock() + self.ttl, _pinned_values(criteria))
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters['evictions'] += 1
+        return True
+
+    def invalidate_inserts(self, documents: Sequence[Dict[str, Any]]) -> int:
+        """
+        Drop entries whose filter might match any of the inserted documents.
+
+        Args:
+            documents (Sequence[Dict[str, Any]]): Documents written
+
+        Returns:
+            int: Number of entries dropped
+        """
+        def affected(entry: _Entry) -> bool:
+            return any(self._may_match(entry.pinned, document) for document in documents)
+        return self._invalidate(affected, len(documents))
+
+    def invalidate_updates(self, updates: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        Drop entries that documents matched by an update might enter or leave.
+
+        An entry is unaffected by an update if both filters pin some field to
+        disjoint values and the update does not change that field.
+
+        Args:
+            updates (Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]): (criteria, update_values) pairs
+
+        Returns:
+            int: Number of entries dropped
+        """
+        prepared = []
+        for criteria, update_values in updates:
+            changed = _updated_fields(update_values) if isinstance(update_values, dict) else None
+            if changed is None:
+                return self.clear()
+            prepared.append((_pinned_values(criteria), changed))
+
+        def affected(entry: _Entry) -> bool:
+            return any(self._overlaps(entry.pinned, pinned, changed) for pinned, changed in prepared)
+        return self._invalidate(affected, len(updates))
+
+    def invalidate_deletes(self, criteria_list: Sequence[Dict[str, Any]]) -> int:
+        """
+        Drop entries that might contain documents matched by a delete filter.
+
+        Args:
+            criteria_list (Sequence[Dict[str, Any]]): Delete filters
+
+        Returns:
+            int: Number of entries dropped
+        """
+        prepared = [_pinned_values(criteria) for criteria in criteria_list]
+
+        def affected(entry: _Entry) -> bool:
+            return any(self._overlaps(entry.pinned, pinned) for pinned in prepared)
+        return self._invalidate(affected, len(criteria_list))
+
+    def clear(self) -> int:
+        """
+        Drop every entry.
+
+        Returns:
+            int: Number of entries dropped
+        """
+        return self._invalidate(lambda entry: True, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters and current size, for sizing the cache.
+
+        Returns:
+            Dict[str, Any]: hits, misses, evictions, expirations, invalidations,
+                            hit_rate, entries, bytes, max_entries, max_bytes and ttl
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            lookups = stats['hits'] + stats['misses']
+            stats.update(
+                hit_rate=round(stats['hits'] / lookups, 4) if lookups else 0.0,
+                entries=len(self._entries), bytes=self._bytes,
+                max_entries=self.max_entries, max_bytes=self.max_bytes, ttl=self.ttl
+            )
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _invalidate(self, affected: Callable[[_Entry], bool], items: int) -> int:
+        with self._lock:
+            self._generation += 1
+            if items > MAX_SELECTIVE_INVALIDATIONS:
+                affected = lambda entry: True  # noqa: E731
+            keys = [key for key, entry in self._entries.items() if affected(entry)]
+            for key in keys:
+                self._remove(key)
+            self._counters['invalidations'] += len(keys)
+        return len(keys)
+
+    def _remove(self, key: bytes) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    @staticmethod
+    def _may_match(pinned: Dict[str, FrozenSet[Any]], document: Dict[str, Any]) -> bool:
+        """Whether a document might match a filter with these pinned fields."""
+        for field, values in pinned.items():
+            value = document.get(field)
+            if isinstance(value, (dict, list, tuple)):
+                continue
+            try:
+                if value not in values:
+                    return False
+            except TypeError:
+                continue
+        return True
+
+    @staticmethod
+    def _overlaps(pinned: Dict[str, FrozenSet[Any]], other: Dict[str, FrozenSet[Any]],
+                  changed: FrozenSet[str] = frozenset()) -> bool:
+        """Whether two filters might match a common document, ignoring changed fields."""
+        for field in pinned.keys() & other.keys():
+            if field not in changed and not (pinned[field] & other[field]):
+                return False
+        return True
@@ -0,0 +1,154 @@
+"""
+Grazioso Salvare Rescue Categories
+CS 340 Module Four Milestone
+
+The dashboard used to define the rescue categories itself and run a
+filtered find for a category on every cache miss. The categories are
+defined here instead, and every document carries its precomputed
+membership as a tag array:
+
+    rescue_categories: ['water']     (or [] when it suits none)
+
+A multikey index on rescue_categories makes a category listing a single
+indexed equality read. The tags are written with the document: by the
+importer, create() and create_many(). Updates that change animal_type, breed
+or sex_upon_outcome refresh the tags of the documents they touched.
+refresh_expression() computes the same membership on the server, so
+AnimalShelter.refresh_rescue_categories() can retag any set of documents,
+or the whole collection after a definition changes, with one update_many.
+
+A category matches intact dogs whose breed contains one of its preferred
+breeds, ignoring case. That is the same test the dashboard's regex filters
+made.
+
+Requirements following EARS format:
+- When a document with an animal_type, breed or sex_upon_outcome is written, the package shall tag it with every rescue category it suits
+- When an update changes animal_type, breed or sex_upon_outcome, the AnimalShelter shall refresh the tags of the updated documents
+- When a category is looked up by key, label or alias, category_key() shall return its key
+- If a category name is unknown, category_key() shall raise ValueError
+"""
+
+import re
+from typing import Any, Dict, List
+
+from .breeds import BREED_FIELD, SEX_FIELD, is_intact
+from .query_cache import _updated_fields
+
+RESCUE_CATEGORIES_FIELD = 'rescue_categories'
+RESCUE_INDEX_NAME = 'idx_rescue_categories'
+
+ANIMAL_TYPE_FIELD = 'animal_type'
+
+# Source fields of the membership test
+RESCUE_SOURCE_FIELDS = (ANIMAL_TYPE_FIELD, BREED_FIELD, SEX_FIELD)
+
+# Ids per $in filter when retagging documents after a write
+REFRESH_CHUNK_SIZE = 1000
+
+# Rescue categories by key: dashboard label, other names, animal type and preferred breeds
+RESCUE_CATEGORIES = {
+    'water': {
+        'label': 'Water Rescue',
+        'aliases': (),
+        'animal_type': 'Dog',
+        'breeds': 'Labrador|Chesapeake Bay Retriever|Newfoundland',
+    },
+    'mountain': {
+        'label': 'Mountain or Wilderness Rescue',
+        'aliases': ('Mountain Rescue',),
+        'animal_type': 'Dog',
+        'breeds': 'German Shepherd|Old English Sheepdog|Siberian Husky|Rottweiler|Doberman',
+    },
+    'disaster': {
+        'label': 'Disaster or Individual Tracking',
+        'aliases': ('Disaster Rescue',),
+        'animal_type': 'Dog',
+        'breeds': 'German Shepherd|Doberman|Rottweiler|Bloodhound',
+    },
+}
+
+_BREED_PATTERNS = {key: re.compile(category['breeds'], re.IGNORECASE) for key, category in RESCUE_CATEGORIES.items()}
+
+_CATEGORY_NAMES = {
+    name.lower(): key
+    for key, category in RESCUE_CATEGORIES.items()
+    for name in (key, category['label'], *category['aliases'])
+}
+
+
+def category_key(name: str) -> str:
+    """
+    The key of a rescue category, from its key, dashboard label or alias (ignoring case).
+
+    Raises:
+        ValueError: If no category has that name
+    """
+    key = _CATEGORY_NAMES.get(str(name).strip().lower())
+    if key is None:
+        raise ValueError(f"Unknown rescue category '{name}'. Use one of: {', '.join(RESCUE_CATEGORIES)}")
+    return key
+
+
+def rescue_categories(document: Dict[str, Any]) -> List[str]:
+    """
+    The keys of the rescue categories a document suits, in RESCUE_CATEGORIES order.
+
+    Args:
+        document (Dict[str, Any]): AAC document (only RESCUE_SOURCE_FIELDS are read)
+
+    Returns:
+        List[str]: Category keys, [] if it suits none
+    """
+    breed = document.get(BREED_FIELD)
+    if not isinstance(breed, str) or not is_intact(document.get(SEX_FIELD)):
+        return []
+    return [
+        key for key, category in RESCUE_CATEGORIES.items()
+        if document.get(ANIMAL_TYPE_FIELD) == category['animal_type'] and _BREED_PATTERNS[key].search(breed)
+    ]
+
+
+def add_rescue_categories(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Tag a document with its rescue categories, in place.
+
+    A document that already has tags, or has none of RESCUE_SOURCE_FIELDS,
+    is left unchanged.
+
+    Returns:
+        Dict[str, Any]: The same document, for chaining
+    """
+    if RESCUE_CATEGORIES_FIELD not in document and any(field in document for field in RESCUE_SOURCE_FIELDS):
+        document[RESCUE_CATEGORIES_FIELD] = rescue_categories(document)
+    return document
+
+
+def affects_rescue_categories(update_values: Any) -> bool:
+    """Whether an update spec may change a category's source fields (unknown specs count as yes)."""
+    fields = _updated_fields(update_values) if isinstance(update_values, dict) else None
+    return fields is None or bool(fields & set(RESCUE_SOURCE_FIELDS))
+
+
+def _string_or_empty(field: str) -> Dict[str, Any]:
+    """Expression for a field's value if it is a string, else '' ($regexMatch rejects other types)."""
+    return {'$cond': [{'$eq': [{'$type': f'${field}'}, 'string']}, f'${field}', '']}
+
+
+def refresh_expression() -> Dict[str, Any]:
+    """
+    Aggregation expression computing rescue_categories on the server, as rescue_categories() does.
+
+    Returns:
+        Dict[str, Any]: Expression for a $set stage of a pipeline update
+    """
+    breed = _string_or_empty(BREED_FIELD)
+    intact = {'$regexMatch': {'input': _string_or_empty(SEX_FIELD), 'regex': r'^\s*intact', 'options': 'i'}}
+    tags = []
+    for key, category in RESCUE_CATEGORIES.items():
+        suits = {'$and': [
+            {'$eq': [f'${ANIMAL_TYPE_FIELD}', category['animal_type']]},
+            intact,
+            {'$regexMatch': {'input': breed, 'regex': category['breeds'], 'options': 'i'}},
+        ]}
+        tags.append({'$cond': [suits, [key], []]})
+    return {'$concatArrays': tags}
@@ -0,0 +1,106 @@
+"""
+AAC Document Schema
+CS 340 Module Four Milestone
+
+This module declares the fields of an Austin Animal Center (AAC) outcome
+document and their BSON types. It has no third-party dependencies so that
+both the importer (which writes documents) and the CRUD class (which reads
+them) can share one definition.
+
+Requirements following EARS format:
+- The schema shall declare the BSON type of every AAC column
+- When a sparse document is read, fill_missing_fields() shall restore every declared field with its empty value
+- When a projection is given, projected_fields() shall limit the fields to restore to the ones the projection returns
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+
+# Declared BSON type of each AAC column. Columns not listed are kept as strings.
+#   'string'   -> str ('' when missing)
+#   'int'      -> int (BSON int64, null when missing)
+#   'float'    -> float (BSON double, null when missing)
+#   'datetime' -> datetime (BSON date, null when missing)
+AAC_COLUMN_SCHEMA = {
+    'rec_num': 'int',
+    'age_upon_outcome': 'string',
+    'animal_id': 'string',
+    'animal_type': 'string',
+    'breed': 'string',
+    'color': 'string',
+    'date_of_birth': 'datetime',
+    'datetime': 'datetime',
+    'monthyear': 'datetime',
+    'name': 'string',
+    'outcome_subtype': 'string',
+    'outcome_type': 'string',
+    'sex_upon_outcome': 'string',
+    'location_lat': 'float',
+    'location_long': 'float',
+    'age_upon_outcome_in_weeks': 'float',
+}
+
+# Every AAC field, in CSV column order
+AAC_FIELDS = tuple(AAC_COLUMN_SCHEMA)
+
+
+def empty_value(field: str) -> Optional[str]:
+    """
+    Value a dense (non-sparse) import stores for a missing field.
+
+    Args:
+        field (str): Field name
+
+    Returns:
+        Optional[str]: '' for string fields, None for typed fields
+    """
+    return '' if AAC_COLUMN_SCHEMA.get(field, 'string') == 'string' else None
+
+
+def fill_missing_fields(document: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Add any absent fields to a document, in place, with their empty value.
+
+    Sparse imports omit blank fields; this gives readers the same stable set
+    of keys a dense import would have stored.
+
+    Args:
+        document (Dict[str, Any]): Document read from MongoDB
+        fields (Optional[Iterable[str]]): Fields to fill (default: AAC_FIELDS)
+
+    Returns:
+        Dict[str, Any]: The same document, for chaining
+    """
+    for field in (AAC_FIELDS if fields is None else fields):
+        if field not in document:
+            document[field] = empty_value(field)
+    return document
+
+
+def projected_fields(projection: Optional[Union[Mapping[str, Any], Sequence[str]]]) -> Optional[Tuple[str, ...]]:
+    """
+    The AAC fields a find() projection returns, for fill_missing_fields().
+
+    Filling every AAC field on a projected document would undo the
+    projection and report the excluded fields as empty.
+
+    Args:
+        projection (Optional[Union[Mapping[str, Any], Sequence[str]]]): find() projection
+                                                                        or list of field names
+
+    Returns:
+        Optional[Tuple[str, ...]]: The AAC fields the projection includes, in AAC_FIELDS order
+                                   (None without a projection, meaning every field)
+    """
+    if projection is None:
+        return None
+    if not isinstance(projection, Mapping):
+        included = set(projection)
+        return tuple(field for field in AAC_FIELDS if field in included)
+    # Operator values such as {'$slice': 2} do not make a projection an inclusion
+    inclusion = any(value and not isinstance(value, Mapping)
+                    for field, value in projection.items() if field != '_id')
+    if inclusion:
+        return tuple(field for field in AAC_FIELDS
+                     if projection.get(field) and not isinstance(projection[field], Mapping))
+    return tuple(field for field in AAC_FIELDS if projection.get(field, 1) or isinstance(projection[field], Mapping))
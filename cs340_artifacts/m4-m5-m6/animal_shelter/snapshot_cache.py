@@ -0,0 +1,191 @@
+"""
+Columnar Snapshot Cache for the AAC Source CSV
+CS 340 Module Four Milestone
+
+Parsing and typing the AAC CSV is the slowest step of every import and dry
+run. This module stores the typed DataFrame produced by the importer as a
+columnar snapshot next to a small JSON manifest, and loads it back on later
+runs as long as the CSV is unchanged.
+
+- With pyarrow installed, snapshots are uncompressed Arrow IPC files that are
+  memory-mapped on load.
+- Without pyarrow, snapshots fall back to pandas pickles.
+
+A snapshot is keyed by the CSV's size, modification time and content hash. A
+size change invalidates it immediately. An mtime change alone (for example
+after the file is copied or touched) triggers a re-hash, and the snapshot is
+kept if the content is the same.
+
+Requirements following EARS format:
+- When store() is called, the CsvSnapshotCache shall write a typed snapshot and a manifest describing the source CSV
+- When load() is called and the CSV is unchanged, the CsvSnapshotCache shall return the snapshot without parsing the CSV
+- When load() is called and the CSV has changed, the CsvSnapshotCache shall return None
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    feather = None
+    HAS_PYARROW = False
+
+
+# Bump when the typed frame produced by AACDataImporter._apply_schema changes shape
+SNAPSHOT_VERSION = 1
+
+# Snapshot file format written by this installation
+SNAPSHOT_FORMAT = 'arrow' if HAS_PYARROW else 'pickle'
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_content_hash(path: Path) -> str:
+    """
+    Hash a file's contents without loading it all into memory.
+
+    Args:
+        path (Path): File to hash
+
+    Returns:
+        str: Hex BLAKE2b digest of the file
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CsvSnapshotCache:
+    """
+    Typed columnar snapshots of CSV files, stored in one cache directory.
+    """
+
+    def __init__(self, cache_dir: str, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the snapshot cache.
+
+        Args:
+            cache_dir (str): Directory for snapshots and manifests (created if missing)
+            logger (Optional[logging.Logger]): Logger to report hits and misses to
+        """
+        self.cache_dir = Path(cache_dir)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def _manifest_path(self, csv_path: Path) -> Path:
+        """Manifest location for a CSV, unique per absolute source path."""
+        source_id = hashlib.blake2b(str(Path(csv_path).resolve()).encode('utf-8'), digest_size=6).hexdigest()
+        return self.cache_dir / f"{Path(csv_path).stem}-{source_id}.json"
+
+    def _read_manifest(self, csv_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._manifest_path(csv_path), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, csv_path: Path, manifest: Dict[str, Any]) -> None:
+        manifest_path = self._manifest_path(csv_path)
+        tmp_path = manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def load(self, csv_path: Path) -> Optional[pd.DataFrame]:
+        """
+        Load the snapshot of a CSV if it is still current.
+
+        Args:
+            csv_path (Path): Source CSV file
+
+        Returns:
+            Optional[pd.DataFrame]: The typed frame, or None on a cache miss
+        """
+        manifest = self._read_manifest(csv_path)
+        if not manifest or manifest.get('version') != SNAPSHOT_VERSION or manifest.get('format') != SNAPSHOT_FORMAT:
+            return None
+
+        snapshot_path = self.cache_dir / manifest['snapshot']
+        stat = Path(csv_path).stat()
+        if stat.st_size != manifest['size'] or not snapshot_path.exists():
+            return None
+
+        if stat.st_mtime_ns != manifest['mtime_ns']:
+            # Same size, new mtime: only a content change invalidates the snapshot
+            if file_content_hash(csv_path) != manifest['content_hash']:
+                return None
+            manifest['mtime_ns'] = stat.st_mtime_ns
+            self._write_manifest(csv_path, manifest)
+
+        try:
+            df = self._read_snapshot(snapshot_path)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable snapshot {snapshot_path}: {str(e)}")
+            return None
+
+        self.logger.info(f"Loaded {len(df)} records from snapshot: {snapshot_path}")
+        return df
+
+    def store(self, csv_path: Path, df: pd.DataFrame) -> Path:
+        """
+        Write a typed frame as the snapshot of a CSV.
+
+        Args:
+            csv_path (Path): Source CSV file the frame was parsed from
+            df (pd.DataFrame): Typed frame to store
+
+        Returns:
+            Path: The snapshot file
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        stat = Path(csv_path).stat()
+        content_hash = file_content_hash(csv_path)
+        suffix = '.arrow' if SNAPSHOT_FORMAT == 'arrow' else '.pkl'
+        snapshot_path = self.cache_dir / f"{Path(csv_path).stem}-{content_hash}{suffix}"
+
+        tmp_path = snapshot_path.with_name(snapshot_path.name + '.tmp')
+        self._write_snapshot(df, tmp_path)
+        os.replace(tmp_path, snapshot_path)
+
+        previous = self._read_manifest(csv_path)
+        self._write_manifest(csv_path, {
+            'version': SNAPSHOT_VERSION,
+            'format': SNAPSHOT_FORMAT,
+            'source': str(Path(csv_path).resolve()),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'content_hash': content_hash,
+            'rows': len(df),
+            'snapshot': snapshot_path.name
+        })
+        if previous and previous.get('snapshot') not in (None, snapshot_path.name):
+            (self.cache_dir / previous['snapshot']).unlink(missing_ok=True)
+
+        self.logger.info(f"Wrote {SNAPSHOT_FORMAT} snapshot of {len(df)} records: {snapshot_path}")
+        return snapshot_path
+
+    @staticmethod
+    def _write_snapshot(df: pd.DataFrame, path: Path) -> None:
+        if HAS_PYARROW:
+            # Uncompressed so the file can be memory-mapped on load
+            feather.write_feather(df.reset_index(drop=True), str(path), compression='uncompressed')
+        else:
+            df.reset_index(drop=True).to_pickle(path)
+
+    @staticmethod
+    def _read_snapshot(path: Path) -> pd.DataFrame:
+        if path.suffix == '.arrow':
+            with pa.memory_map(str(path), 'r') as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+        return pd.read_pickle(path)
@@ -0,0 +1,399 @@
+"""
+Incrementally Maintained Summary Statistics for the AAC Collection
+CS 340 Module Four Milestone
+
+Status checks used to scan the animals collection on every call:
+count_documents({}) for the total, plus distinct() for the animal and
+outcome types. SummaryStats keeps those numbers in a small side collection
+(animals_summary by default), so they can be read without touching the
+animals collection.
+
+- There is one document per counted value, {_id: {d: dimension, v: value}, count: n},
+  for the dimensions animal_type, outcome_type, breed and month (the "YYYY-MM" of
+  the outcome datetime), plus one 'total' document. A missing or null value is
+  counted under ''. Per-value documents never come near the 16 MB document limit,
+  and breed names need no escaping.
+- Writes made through an AnimalShelter, and by the importer, send $inc deltas
+  as they go: inserts count +1 and deletes count -1. Updates compare the changed
+  documents before and after.
+- AsyncSummaryStats sends the same deltas for AsyncAnimalShelter writes,
+  through Motor, to the same summary documents.
+- rebuild() recounts everything with one $facet aggregation. The summary is
+  only trusted (see is_ready()) after a rebuild, and until a failed delta marks
+  it stale. Writes that bypass AnimalShelter and AsyncAnimalShelter need a
+  rebuild afterwards.
+
+Requirements following EARS format:
+- When documents are inserted, updated or deleted through AnimalShelter or AsyncAnimalShelter with summary stats enabled, the SummaryStats shall apply the matching $inc deltas
+- When rebuild() is called, the SummaryStats shall recount every dimension from the source collection
+- When summary() is called, the SummaryStats shall answer from the summary collection without scanning the source collection
+- If a delta cannot be applied, the SummaryStats shall mark the summary stale until the next rebuild
+"""
+
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pymongo import DeleteMany, InsertOne, UpdateOne
+
+from .query_cache import _updated_fields
+
+# Fields counted directly, one summary document per distinct value
+VALUE_DIMENSIONS = ('animal_type', 'outcome_type', 'breed')
+
+# Month of the outcome, as "YYYY-MM", derived from this field
+MONTH_DIMENSION = 'month'
+MONTH_SOURCE_FIELD = 'datetime'
+
+DIMENSIONS = VALUE_DIMENSIONS + (MONTH_DIMENSION,)
+
+# Source fields needed to compute every dimension of a document
+SOURCE_FIELDS = VALUE_DIMENSIONS + (MONTH_SOURCE_FIELD,)
+
+TOTAL_ID = {'d': 'total', 'v': None}
+META_ID = {'d': '_meta', 'v': None}
+
+# Ids per $in query when re-reading changed documents
+SNAPSHOT_CHUNK_SIZE = 1000
+
+
+def month_of(value: Any) -> str:
+    """The "YYYY-MM" month of a datetime (or ISO date string), or '' when there is none."""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m')
+    if value is None:
+        return ''
+    return str(value)[:7]
+
+
+def document_counts(documents: Iterable[Dict[str, Any]], sign: int = 1) -> Counter:
+    """
+    Count the summary values of documents.
+
+    Args:
+        documents (Iterable[Dict[str, Any]]): AAC documents (only SOURCE_FIELDS are read)
+        sign (int): 1 to count the documents in, -1 to count them out
+
+    Returns:
+        Counter: {(dimension, value): count}, including ('total', None)
+    """
+    counts = Counter()
+    for document in documents:
+        counts[('total', None)] += sign
+        for dimension in VALUE_DIMENSIONS:
+            value = document.get(dimension)
+            counts[(dimension, '' if value is None else value)] += sign
+        counts[(MONTH_DIMENSION, month_of(document.get(MONTH_SOURCE_FIELD)))] += sign
+    return counts
+
+
+def summary_collection_name(collection_name: str) -> str:
+    """Name of the summary collection: AAC_SUMMARY_COLLECTION, or "<collection_name>_summary"."""
+    return os.getenv('AAC_SUMMARY_COLLECTION') or f"{collection_name}_summary"
+
+
+def delta_operations(counts: Counter) -> List[UpdateOne]:
+    """$inc upserts for the non-zero deltas of counts ({(dimension, value): delta})."""
+    return [
+        UpdateOne({'_id': {'d': dimension, 'v': value}}, {'$inc': {'count': delta}}, upsert=True)
+        for (dimension, value), delta in counts.items() if delta
+    ]
+
+
+# Per-value documents whose count has dropped to zero
+EMPTY_VALUES_FILTER = {'count': {'$lte': 0}, '_id.d': {'$in': list(DIMENSIONS)}}
+
+
+def stale_update(reason: str) -> Dict[str, Any]:
+    """Update of the meta document that marks the summary stale."""
+    return {'$set': {'stale': True, 'stale_reason': reason}}
+
+
+class SummaryStats:
+    """
+    Per-value document counts for an AAC collection, kept current with $inc deltas.
+    """
+
+    def __init__(self, source, summary, logger: Optional[logging.Logger] = None):
+        """
+        Initialize summary stats for a source collection.
+
+        Args:
+            source: pymongo Collection holding the AAC documents
+            summary: pymongo Collection holding the summary documents
+            logger (Optional[logging.Logger]): Logger to report rebuilds and failures to
+        """
+        self.source = source
+        self.summary_collection = summary
+        self.logger = logger or logging.getLogger(__name__)
+
+    @classmethod
+    def for_collection(cls, database, collection_name: str,
+                       logger: Optional[logging.Logger] = None) -> 'SummaryStats':
+        """
+        Create summary stats for database[collection_name], stored in the collection named by
+        AAC_SUMMARY_COLLECTION (default: "<collection_name>_summary").
+
+        Returns:
+            SummaryStats: Summary stats for the collection
+        """
+        return cls(database[collection_name], database[summary_collection_name(collection_name)], logger)
+
+    @staticmethod
+    def affected_by(update_values: Dict[str, Any]) -> bool:
+        """Whether an update spec may change a counted field (unknown specs count as yes)."""
+        fields = _updated_fields(update_values)
+        return fields is None or bool(fields & set(SOURCE_FIELDS))
+
+    def apply_safely(self, change: Callable[['SummaryStats'], Any]) -> bool:
+        """
+        Run a summary update without letting it fail the write it follows.
+
+        A failed update marks the summary stale, since the write itself
+        has already happened.
+
+        Args:
+            change (Callable[[SummaryStats], Any]): Applies the write's deltas to this summary
+
+        Returns:
+            bool: True if the deltas were applied
+        """
+        try:
+            change(self)
+            return True
+        except Exception as e:
+            try:
+                self.mark_stale(f"failed to apply a delta: {str(e)}")
+            except Exception as stale_error:
+                self.logger.error(f"Failed to mark summary stats stale: {str(stale_error)}")
+            return False
+
+    def record_inserts(self, documents: Sequence[Dict[str, Any]]) -> None:
+        """Count newly inserted documents in."""
+        self.apply(document_counts(documents))
+
+    def record_deletes(self, documents: Sequence[Dict[str, Any]]) -> None:
+        """Count deleted documents out (only SOURCE_FIELDS are needed)."""
+        self.apply(document_counts(documents, sign=-1))
+
+    def record_changes(self, before: Sequence[Dict[str, Any]], after: Sequence[Dict[str, Any]]) -> None:
+        """
+        Apply the difference between two snapshots of the same documents.
+
+        A document only in before was deleted, one only in after was
+        inserted, and one in both contributes only the values that changed.
+        """
+        counts = document_counts(after)
+        counts.update(document_counts(before, sign=-1))
+        self.apply(counts)
+
+    def snapshot(self, criteria: Dict[str, Any], limit: int = 0) -> List[Dict[str, Any]]:
+        """
+        Read the summary fields of the documents matching criteria, before a write.
+
+        Args:
+            criteria (Dict[str, Any]): Filter of the write
+            limit (int): Maximum number of documents (0 means no limit)
+
+        Returns:
+            List[Dict[str, Any]]: _id and SOURCE_FIELDS of each matching document
+        """
+        cursor = self.source.find(criteria, list(SOURCE_FIELDS))
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    def snapshot_ids(self, ids: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Read the summary fields of the documents with the given _ids, after a write."""
+        documents = []
+        for start in range(0, len(ids), SNAPSHOT_CHUNK_SIZE):
+            documents.extend(self.source.find({'_id': {'$in': list(ids[start:start + SNAPSHOT_CHUNK_SIZE])}},
+                                              list(SOURCE_FIELDS)))
+        return documents
+
+    def apply(self, counts: Counter) -> None:
+        """
+        Send count deltas as one unordered bulk_write of $inc upserts.
+
+        Values whose count drops to zero are removed, so the summary lists
+        only values that still occur.
+
+        Args:
+            counts (Counter): {(dimension, value): delta}, as from document_counts()
+        """
+        operations = delta_operations(counts)
+        if not operations:
+            return
+        self.summary_collection.bulk_write(operations, ordered=False)
+        if any(delta < 0 for delta in counts.values()):
+            self.summary_collection.delete_many(EMPTY_VALUES_FILTER)
+
+    def mark_stale(self, reason: str) -> None:
+        """Record that the counts may be wrong until the next rebuild()."""
+        self.logger.warning(f"Summary stats marked stale: {reason}")
+        self.summary_collection.update_one({'_id': META_ID}, stale_update(reason), upsert=True)
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Recount every dimension from the source collection and replace the summary.
+
+        One $facet aggregation reads the source collection once. The old
+        summary documents are replaced in one ordered bulk_write.
+
+        Returns:
+            Dict[str, Any]: The new summary, as from summary()
+
+        Raises:
+            Exception: If the source cannot be aggregated or the summary cannot be written
+        """
+        facets = {
+            dimension: [{'$group': {'_id': {'$ifNull': [f'${dimension}', '']}, 'count': {'$sum': 1}}}]
+            for dimension in VALUE_DIMENSIONS
+        }
+        month = {'$cond': [
+            {'$eq': [{'$type': f'${MONTH_SOURCE_FIELD}'}, 'date']},
+            {'$dateToString': {'format': '%Y-%m', 'date': f'${MONTH_SOURCE_FIELD}'}},
+            {'$substrCP': [{'$toString': {'$ifNull': [f'${MONTH_SOURCE_FIELD}', '']}}, 0, 7]},
+        ]}
+        facets[MONTH_DIMENSION] = [{'$group': {'_id': month, 'count': {'$sum': 1}}}]
+        facets['total'] = [{'$count': 'count'}]
+
+        try:
+            result = next(self.source.aggregate([{'$facet': facets}], allowDiskUse=True), {})
+            total = (result.get('total') or [{'count': 0}])[0]['count']
+            operations = [DeleteMany({}), InsertOne({'_id': TOTAL_ID, 'count': total})]
+            for dimension in DIMENSIONS:
+                operations.extend(InsertOne({'_id': {'d': dimension, 'v': row['_id']}, 'count': row['count']})
+                                  for row in result.get(dimension, []))
+            operations.append(InsertOne({'_id': META_ID, 'built_at': datetime.now(timezone.utc),
+                                         'stale': False, 'stale_reason': None}))
+            self.summary_collection.bulk_write(operations, ordered=True)
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild summary stats: {str(e)}")
+            raise Exception(f"Failed to rebuild summary stats: {str(e)}") from e
+
+        self.logger.info(f"Rebuilt summary stats for {total} documents")
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Read the whole summary. Its size depends on the number of distinct
+        values, not on the number of documents.
+
+        Returns:
+            Dict[str, Any]: 'total_documents', a {value: count} mapping per dimension
+                            (largest first), 'built_at' (None before the first rebuild),
+                            'stale', 'stale_reason' and 'ready' (see is_ready())
+        """
+        result: Dict[str, Any] = {'total_documents': 0, **{dimension: {} for dimension in DIMENSIONS},
+                                  'built_at': None, 'stale': False, 'stale_reason': None}
+        rows: List[Tuple[str, Any, int]] = []
+        for document in self.summary_collection.find({}):
+            key = document['_id']
+            if key == META_ID:
+                result.update(built_at=document.get('built_at'), stale=bool(document.get('stale')),
+                              stale_reason=document.get('stale_reason'))
+            elif key == TOTAL_ID:
+                result['total_documents'] = int(document.get('count', 0))
+            elif isinstance(key, dict) and key.get('d') in DIMENSIONS:
+                rows.append((key['d'], key.get('v'), int(document.get('count', 0))))
+
+        for dimension, value, count in sorted(rows, key=lambda row: (-row[2], str(row[1]))):
+            if count > 0:
+                result[dimension][value] = count
+        result['ready'] = result['built_at'] is not None and not result['stale']
+        return result
+
+    def total(self) -> int:
+        """Number of documents in the source collection, from the summary."""
+        document = self.summary_collection.find_one({'_id': TOTAL_ID})
+        return int(document.get('count', 0)) if document else 0
+
+    def is_ready(self) -> bool:
+        """Whether the summary has been rebuilt and not marked stale since."""
+        meta = self.summary_collection.find_one({'_id': META_ID})
+        return bool(meta) and meta.get('built_at') is not None and not meta.get('stale')
+
+
+class AsyncSummaryStats:
+    """
+    The write side of SummaryStats for Motor collections.
+
+    AsyncAnimalShelter sends its deltas here. They land in the same summary
+    documents, so rebuilds and reads still go through a SummaryStats.
+    """
+
+    affected_by = staticmethod(SummaryStats.affected_by)
+
+    def __init__(self, source, summary, logger: Optional[logging.Logger] = None):
+        """
+        Initialize async summary stats for a source collection.
+
+        Args:
+            source: Motor collection holding the AAC documents
+            summary: Motor collection holding the summary documents
+            logger (Optional[logging.Logger]): Logger to report failures to
+        """
+        self.source = source
+        self.summary_collection = summary
+        self.logger = logger or logging.getLogger(__name__)
+
+    @classmethod
+    def for_collection(cls, database, collection_name: str,
+                       logger: Optional[logging.Logger] = None) -> 'AsyncSummaryStats':
+        """Create async summary stats for database[collection_name] (see SummaryStats.for_collection)."""
+        return cls(database[collection_name], database[summary_collection_name(collection_name)], logger)
+
+    async def apply_safely(self, change: Callable[['AsyncSummaryStats'], Awaitable[Any]]) -> bool:
+        """Await a summary update, marking the summary stale instead of raising (see SummaryStats.apply_safely)."""
+        try:
+            await change(self)
+            return True
+        except Exception as e:
+            try:
+                await self.mark_stale(f"failed to apply a delta: {str(e)}")
+            except Exception as stale_error:
+                self.logger.error(f"Failed to mark summary stats stale: {str(stale_error)}")
+            return False
+
+    async def record_inserts(self, documents: Sequence[Dict[str, Any]]) -> None:
+        """Count newly inserted documents in."""
+        await self.apply(document_counts(documents))
+
+    async def record_changes(self, before: Sequence[Dict[str, Any]], after: Sequence[Dict[str, Any]]) -> None:
+        """Apply the difference between two snapshots of the same documents."""
+        counts = document_counts(after)
+        counts.update(document_counts(before, sign=-1))
+        await self.apply(counts)
+
+    async def snapshot(self, criteria: Dict[str, Any], limit: int = 0) -> List[Dict[str, Any]]:
+        """Read the summary fields of the documents matching criteria, before a write."""
+        cursor = self.source.find(criteria, list(SOURCE_FIELDS))
+        if limit:
+            cursor = cursor.limit(limit)
+        return [document async for document in cursor]
+
+    async def snapshot_ids(self, ids: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Read the summary fields of the documents with the given _ids, after a write."""
+        documents = []
+        for start in range(0, len(ids), SNAPSHOT_CHUNK_SIZE):
+            cursor = self.source.find({'_id': {'$in': list(ids[start:start + SNAPSHOT_CHUNK_SIZE])}},
+                                      list(SOURCE_FIELDS))
+            documents.extend([document async for document in cursor])
+        return documents
+
+    async def apply(self, counts: Counter) -> None:
+        """Send count deltas as one unordered bulk_write (see SummaryStats.apply)."""
+        operations = delta_operations(counts)
+        if not operations:
+            return
+        await self.summary_collection.bulk_write(operations, ordered=False)
+        if any(delta < 0 for delta in counts.values()):
+            await self.summary_collection.delete_many(EMPTY_VALUES_FILTER)
+
+    async def mark_stale(self, reason: str) -> None:
+        """Record that the counts may be wrong until the next SummaryStats.rebuild()."""
+        self.logger.warning(f"Summary stats marked stale: {reason}")
+        await self.summary_collection.update_one({'_id': META_ID}, stale_update(reason), upsert=True)
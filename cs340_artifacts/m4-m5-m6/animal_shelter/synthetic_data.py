@@ -0,0 +1,165 @@
+"""
+Synthetic AAC Data Generator
+CS 340 Module Four Milestone
+
+This module generates Austin Animal Center (AAC) outcome rows for benchmarks
+and load tests. The bundled CSV has only 10k rows, so the generator learns
+the real column distributions from it and produces any number of rows with
+the same 16 columns and CSV format.
+
+- The categorical columns (animal_type, breed, color, sex_upon_outcome,
+  outcome_type, outcome_subtype and age_upon_outcome, together with
+  age_upon_outcome_in_weeks) are sampled as whole rows from the profile. This
+  keeps correlations such as breed per animal type and subtype per outcome.
+- name is sampled on its own, including its blank rate.
+- Outcome datetimes are uniform over the profile's date range, and
+  date_of_birth is the outcome time minus the sampled age.
+- Coordinates are uniform over the profile's bounding box.
+- animal_id is unique except for a duplicate rate measured from the profile,
+  so de-duplication is exercised too.
+
+Output is deterministic for a given seed, row count and chunk size.
+
+Requirements following EARS format:
+- When generate_frame() is called twice with the same seed and start, the SyntheticAACGenerator shall return identical rows
+- The SyntheticAACGenerator shall produce the same columns as the bundled AAC CSV
+"""
+
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_PROFILE_CSV = Path(__file__).resolve().parent.parent / 'assets' / 'aac_shelter_outcomes.csv'
+
+# Columns sampled together, as whole rows, from the profile
+PROFILE_ROW_COLUMNS = (
+    'animal_type', 'breed', 'color', 'sex_upon_outcome', 'outcome_type',
+    'outcome_subtype', 'age_upon_outcome', 'age_upon_outcome_in_weeks'
+)
+
+# Column order of the bundled CSV
+CSV_COLUMNS = (
+    'rec_num', 'age_upon_outcome', 'animal_id', 'animal_type', 'breed', 'color',
+    'date_of_birth', 'datetime', 'monthyear', 'name', 'outcome_subtype', 'outcome_type',
+    'sex_upon_outcome', 'location_lat', 'location_long', 'age_upon_outcome_in_weeks'
+)
+
+
+class SyntheticAACGenerator:
+    """
+    Deterministic generator of AAC-shaped outcome rows.
+    """
+
+    def __init__(self, seed: int = 42, profile_csv: Optional[Union[str, Path]] = None,
+                 duplicate_rate: Optional[float] = None):
+        """
+        Initialize the generator from a profile CSV.
+
+        Args:
+            seed (int): Random seed; the same seed produces the same rows
+            profile_csv (Optional[Union[str, Path]]): Real AAC CSV to learn the
+                                                      distributions from (default: bundled CSV)
+            duplicate_rate (Optional[float]): Fraction of rows that repeat an earlier
+                                              animal_id (default: rate in the profile)
+        """
+        self.seed = seed
+        profile = pd.read_csv(profile_csv or DEFAULT_PROFILE_CSV, encoding='utf-8')
+
+        self._rows = profile[list(PROFILE_ROW_COLUMNS)].reset_index(drop=True)
+        self._names = profile['name'].to_numpy(dtype=object)
+
+        outcome_times = pd.to_datetime(profile['datetime'], errors='coerce').dropna()
+        self._start_seconds = int(outcome_times.min().timestamp())
+        self._span_seconds = int(outcome_times.max().timestamp()) - self._start_seconds
+
+        self._lat_range = (profile['location_lat'].min(), profile['location_lat'].max())
+        self._long_range = (profile['location_long'].min(), profile['location_long'].max())
+
+        if duplicate_rate is None:
+            duplicate_rate = 1 - profile['animal_id'].nunique() / len(profile)
+        self.duplicate_rate = float(duplicate_rate)
+
+    def generate_frame(self, rows: int, start: int = 0) -> pd.DataFrame:
+        """
+        Generate one block of rows.
+
+        Args:
+            rows (int): Number of rows to generate
+            start (int): Index of the first row; blocks with different starts
+                         have different rows and animal_ids
+
+        Returns:
+            pd.DataFrame: Rows with the bundled CSV's columns, as CSV-style strings
+                          for dates and floats for coordinates and ages
+        """
+        rng = np.random.default_rng([self.seed, start])
+        index = np.arange(start, start + rows)
+
+        sampled = self._rows.iloc[rng.integers(0, len(self._rows), rows)].reset_index(drop=True)
+
+        # Unique ids, except duplicate_rate of rows that reuse an earlier id in the block
+        ids = index.copy()
+        duplicates = np.flatnonzero(rng.random(rows) < self.duplicate_rate)
+        duplicates = duplicates[duplicates > 0]
+        ids[duplicates] = start + (rng.random(len(duplicates)) * duplicates).astype(np.int64)
+
+        outcome = pd.to_datetime(
+            self._start_seconds + rng.integers(0, self._span_seconds // 60 + 1, rows) * 60, unit='s'
+        )
+        weeks = sampled['age_upon_outcome_in_weeks'].to_numpy(dtype=float)
+        birth = (outcome - pd.to_timedelta(np.nan_to_num(weeks) * 7, unit='D')).normalize()
+
+        return pd.DataFrame({
+            'rec_num': index + 1,
+            'age_upon_outcome': sampled['age_upon_outcome'],
+            'animal_id': pd.Series(ids).map('S{:08d}'.format),
+            'animal_type': sampled['animal_type'],
+            'breed': sampled['breed'],
+            'color': sampled['color'],
+            'date_of_birth': birth.strftime('%Y-%m-%d'),
+            'datetime': outcome.strftime('%Y-%m-%d %H:%M:%S'),
+            'monthyear': outcome.strftime('%Y-%m-%dT%H:%M:%S'),
+            'name': self._names[rng.integers(0, len(self._names), rows)],
+            'outcome_subtype': sampled['outcome_subtype'],
+            'outcome_type': sampled['outcome_type'],
+            'sex_upon_outcome': sampled['sex_upon_outcome'],
+            'location_lat': rng.uniform(*self._lat_range, rows),
+            'location_long': rng.uniform(*self._long_range, rows),
+            'age_upon_outcome_in_weeks': weeks,
+        }, columns=list(CSV_COLUMNS))
+
+    def iter_frames(self, rows: int, chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Generate rows in blocks of at most chunk_size rows.
+
+        Args:
+            rows (int): Total number of rows
+            chunk_size (int): Rows per block
+
+        Yields:
+            pd.DataFrame: Consecutive blocks of rows
+        """
+        for start in range(0, rows, chunk_size):
+            yield self.generate_frame(min(chunk_size, rows - start), start)
+
+    def write_csv(self, path: Union[str, Path], rows: int, chunk_size: int = 100000) -> Path:
+        """
+        Write rows to a CSV file in the bundled CSV's format, one block at a time.
+
+        Args:
+            path (Union[str, Path]): Output CSV file
+            rows (int): Total number of rows
+            chunk_size (int): Rows generated and written per block
+
+        Returns:
+            Path: The written CSV file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for i, frame in enumerate(self.iter_frames(rows, chunk_size)):
+                frame.to_csv(f, header=(i == 0), index=False)
+        return path
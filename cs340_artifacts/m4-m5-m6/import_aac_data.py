@@ -16,7 +16,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 try:
-    from animal_shelter import AACDataImporter
+    from animal_shelter import AACDataImporter, close_all_clients
+    from animal_shelter.data_importer import CSV_ENGINES, IMPORT_STRATEGIES
 except ImportError as e:
     print(f"❌ Error importing AnimalShelter: {e}")
     print("💡 Make sure you have installed the requirements: pip install -r requirements.txt")
@@ -34,6 +35,25 @@ def main():
                        help='Only check if data exists, do not import')
     parser.add_argument('--batch-size', type=int, default=None,
                        help='Number of records to process in each batch')
+    parser.add_argument('--strategy', choices=IMPORT_STRATEGIES, default=None,
+                       help='Write strategy: bulk (one insert_many per batch), single (one insert per record), '
+                            'delta (write only new or changed records) or upsert (replace/insert by natural key)')
+    parser.add_argument('--natural-key', default=None,
+                       help='Comma-separated fields identifying a record, e.g. animal_id,datetime')
+    parser.add_argument('--sparse', action='store_true', default=None,
+                       help='Omit empty fields from documents instead of storing placeholders')
+    parser.add_argument('--csv-engine', choices=CSV_ENGINES, default=None,
+                       help='CSV parser: c (single-threaded), pyarrow (multi-threaded) or auto')
+    parser.add_argument('--snapshot-dir', default=None,
+                       help='Cache a typed columnar snapshot of the CSV in this directory')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help='Stream the CSV in chunks of this many rows to keep memory flat')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of parse/clean worker processes')
+    parser.add_argument('--writers', type=int, default=None,
+                       help='Number of MongoDB writer threads')
+    parser.add_argument('--delete-missing', action='store_true',
+                       help='With --strategy delta, delete imported records no longer in the CSV')
     
     args = parser.parse_args()
     
@@ -43,7 +63,9 @@ def main():
     try:
         # Create importer instance
         print("📁 Looking for AAC CSV file...")
-        importer = AACDataImporter()
+        natural_key = args.natural_key.split(',') if args.natural_key else None
+        importer = AACDataImporter(natural_key=natural_key, sparse=args.sparse, snapshot_dir=args.snapshot_dir,
+                                   csv_engine=args.csv_engine)
         
         print(f"Found CSV file: {importer.csv_path}")
         print(f"📊 File size: {importer.csv_path.stat().st_size / 1024 / 1024:.2f} MB")
@@ -62,7 +84,10 @@ def main():
         # Run the import
         print("\n🔄 Starting data import...")
         batch_size = args.batch_size or int(os.getenv('BATCH_SIZE', '500'))
-        results = importer.run_full_import(batch_size=batch_size, force_import=args.force)
+        results = importer.run_full_import(batch_size=batch_size, force_import=args.force,
+                                           strategy=args.strategy, chunk_size=args.chunk_size,
+                                           workers=args.workers, writers=args.writers,
+                                           delete_missing=args.delete_missing)
         
         # Handle skipped imports
         if results.get('skipped', False):
@@ -100,6 +125,10 @@ def main():
         print("\n💡 Make sure MongoDB is running and accessible.")
         print("   If using Docker: docker-compose up -d")
         return 1
+    
+    finally:
+        # Close the pooled MongoClient shared by the importer's connections
+        close_all_clients()
 
 
 if __name__ == "__main__":
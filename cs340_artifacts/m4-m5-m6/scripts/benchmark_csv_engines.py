@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+CSV Engine Benchmark
+CS 340 Module Four Milestone
+
+Times AACDataImporter.load_csv_data() with each CSV engine against the
+original loader (pandas C engine with type inference and a deep
+memory_usage() pass), on the bundled AAC CSV repeated to a target row count.
+
+Usage:
+    python scripts/benchmark_csv_engines.py --rows 10000000
+    python scripts/benchmark_csv_engines.py --rows 1000000 --engines c
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from animal_shelter.data_importer import AACDataImporter, CSV_ENGINES  # noqa: E402
+from animal_shelter.snapshot_cache import HAS_PYARROW  # noqa: E402
+
+BUNDLED_CSV = PROJECT_DIR / 'assets' / 'aac_shelter_outcomes.csv'
+
+
+def write_scaled_csv(source: Path, target: Path, rows: int) -> int:
+    """Write the source CSV's data lines repeatedly until target has at least rows rows."""
+    with open(source, 'r', encoding='utf-8', newline='') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith('\n'):
+        body += '\n'
+    source_rows = len(pd.read_csv(source, usecols=[0]))
+    repeats = max(1, -(-rows // source_rows))
+    with open(target, 'w', encoding='utf-8', newline='') as f:
+        f.write(header)
+        for _ in range(repeats):
+            f.write(body)
+    return repeats * source_rows
+
+
+def time_baseline(csv_path: Path) -> float:
+    """The loader before selectable engines: inferred dtypes plus a deep memory pass."""
+    started = time.perf_counter()
+    df = pd.read_csv(csv_path, encoding='utf-8')
+    df.memory_usage(deep=True).sum()
+    return time.perf_counter() - started
+
+
+def time_engine(csv_path: Path, engine: str) -> float:
+    """Time load_csv_data() with one engine."""
+    importer = AACDataImporter(str(csv_path), csv_engine=engine, snapshot_dir='')
+    started = time.perf_counter()
+    importer.load_csv_data()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV engines for load_csv_data()')
+    parser.add_argument('--rows', type=int, default=10_000_000, help='Rows in the scaled CSV')
+    parser.add_argument('--engines', default=','.join(e for e in CSV_ENGINES if e != 'auto'),
+                        help='Comma-separated engines to time (default: c,pyarrow)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per engine; the best time is reported')
+    parser.add_argument('--csv', default=str(BUNDLED_CSV), help='Source CSV to scale up')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / 'aac_scaled.csv'
+        rows = write_scaled_csv(Path(args.csv), csv_path, args.rows)
+        size_mb = os.path.getsize(csv_path) / 1024 / 1024
+        print(f"Scaled CSV: {rows:,} rows, {size_mb:,.0f} MB, {os.cpu_count()} CPUs")
+
+        baseline = min(time_baseline(csv_path) for _ in range(args.repeat))
+        print(f"  {'baseline (c, inferred, deep memory)':40}{baseline:>9.2f}s{rows / baseline:>14,.0f} rows/s")
+
+        for engine in engines:
+            if engine == 'pyarrow' and not HAS_PYARROW:
+                print(f"  {engine:40}{'skipped (pyarrow not installed)':>24}")
+                continue
+            elapsed = min(time_engine(csv_path, engine) for _ in range(args.repeat))
+            print(f"  {engine:40}{elapsed:>9.2f}s{rows / elapsed:>14,.0f} rows/s"
+                  f"   {baseline / elapsed:.2f}x baseline")
+
+
+if __name__ == "__main__":
+    main()
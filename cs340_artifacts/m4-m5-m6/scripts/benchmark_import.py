@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Importer Throughput Benchmark
+CS 340 Module Four Milestone
+
+Generates synthetic AAC CSV files (animal_shelter.synthetic_data) and runs
+AACDataImporter.run_full_import() once per (row count, strategy) pair against
+either a local mongod or mongomock, an in-process stand-in. Each run happens
+in a fresh process so its peak RSS is its own, and imports into a scratch
+collection that is dropped afterwards.
+
+For every run, the benchmark records rows/s, peak RSS and per-batch write
+latency (count, mean, p50, p95, p99, max). The results are appended to a JSON
+file together with the git commit and host details, so runs can be compared
+over time.
+
+Usage:
+    python scripts/benchmark_import.py --rows 10000,100000 --strategies bulk,upsert
+    python scripts/benchmark_import.py --target mongomock --rows 10000
+    python scripts/benchmark_import.py --rows 1000000 --workers 4 --writers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import numpy as np
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from animal_shelter.data_importer import AACDataImporter, IMPORT_STRATEGIES  # noqa: E402
+from animal_shelter.synthetic_data import SyntheticAACGenerator  # noqa: E402
+
+DEFAULT_RESULTS = PROJECT_DIR / 'docs' / 'benchmarks' / 'import_benchmarks.json'
+SCRATCH_COLLECTION = 'import_benchmark'
+
+
+class TimedImporter(AACDataImporter):
+    """AACDataImporter that records how long each write batch takes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_latencies: List[float] = []
+
+    def _write_batch(self, batch, strategy):
+        started = time.perf_counter()
+        try:
+            return super()._write_batch(batch, strategy)
+        finally:
+            # list.append is atomic, so parallel writer threads can share the list
+            self.batch_latencies.append(time.perf_counter() - started)
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, Any]:
+    """Summarize per-batch latencies in milliseconds."""
+    if not latencies:
+        return {'batches': 0}
+    ms = np.asarray(latencies) * 1000
+    return {
+        'batches': int(ms.size),
+        'mean_ms': round(float(ms.mean()), 3),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'max_ms': round(float(ms.max()), 3)
+    }
+
+
+def run_once(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one import in the current process (called in a fresh child process)."""
+    os.environ['AAC_COLLECTION'] = SCRATCH_COLLECTION
+    os.environ['LOG_LEVEL'] = 'WARNING'
+
+    client_patch = None
+    if config['target'] == 'mongomock':
+        import mongomock
+        # mongomock keeps data per client, so every AnimalShelter shares one that is never closed
+        shared_client = mongomock.MongoClient()
+        shared_client.close = lambda: None
+        client_patch = patch('animal_shelter.animal_shelter.MongoClient', lambda *args, **kwargs: shared_client)
+        client_patch.start()
+
+    from animal_shelter.animal_shelter import AnimalShelter
+    try:
+        with AnimalShelter() as shelter:
+            shelter.collection.drop()
+
+        importer = TimedImporter(config['csv_path'], csv_engine=config['csv_engine'], snapshot_dir='')
+        started = time.perf_counter()
+        results = importer.run_full_import(
+            batch_size=config['batch_size'], force_import=True, strategy=config['strategy'],
+            chunk_size=config['chunk_size'], workers=config['workers'], writers=config['writers']
+        )
+        elapsed = time.perf_counter() - started
+
+        with AnimalShelter() as shelter:
+            shelter.collection.drop()
+    finally:
+        if client_patch is not None:
+            client_patch.stop()
+
+    stats = results.get('import_stats', {})
+    return {
+        'success': results.get('success', False),
+        'error': results.get('error'),
+        'records': stats.get('total_records', 0),
+        'successful_imports': stats.get('successful_imports', 0),
+        'failed_imports': stats.get('failed_imports', 0),
+        'import_seconds': round(stats['duration'], 3) if stats.get('duration') else None,
+        'total_seconds': round(elapsed, 3),
+        'rows_per_second': round(config['rows'] / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'batch_latency': latency_summary(importer.batch_latencies),
+        'bottleneck': stats.get('stages', {}).get('bottleneck')
+    }
+
+
+def run_isolated(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one import in a fresh process so peak RSS is measured per run."""
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run_once, (config,))
+
+
+def environment_info() -> Dict[str, Any]:
+    """Host and code version details stored with each benchmark run."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        commit = None
+    import pandas
+    import pymongo
+    return {
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'pandas': pandas.__version__,
+        'pymongo': pymongo.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def append_results(path: Path, run: Dict[str, Any]) -> None:
+    """Append one benchmark run to the JSON results file (a list of runs)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    runs = json.loads(path.read_text(encoding='utf-8')) if path.exists() else []
+    runs.append(run)
+    path.write_text(json.dumps(runs, indent=2) + '\n', encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AAC import throughput on synthetic data')
+    parser.add_argument('--rows', default='10000,100000',
+                        help='Comma-separated row counts to generate, 10k to 10M (default: 10000,100000)')
+    parser.add_argument('--strategies', default='bulk,delta,upsert',
+                        help=f"Comma-separated strategies from {', '.join(IMPORT_STRATEGIES)}")
+    parser.add_argument('--target', choices=('mongod', 'mongomock'), default='mongod',
+                        help='Local mongod (from the usual MONGO_* env vars) or in-process mongomock. '
+                             'mongomock has no real indexes, so keyed strategies are quadratic there; '
+                             'use it to smoke-test the harness, not to compare throughput')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--writers', type=int, default=1)
+    parser.add_argument('--csv-engine', default='auto')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=None,
+                        help='Keep generated CSVs here and reuse them (default: temporary directory)')
+    parser.add_argument('--output', default=str(DEFAULT_RESULTS), help='JSON results file to append to')
+    parser.add_argument('--label', default=None, help='Free-text label stored with this run')
+    args = parser.parse_args()
+
+    row_counts = [int(r) for r in args.rows.split(',') if r.strip()]
+    strategies = [s.strip() for s in args.strategies.split(',') if s.strip()]
+    unknown = set(strategies) - set(IMPORT_STRATEGIES)
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(sorted(unknown))}")
+
+    temp_dir = None
+    if args.data_dir:
+        data_dir = Path(args.data_dir)
+    else:
+        temp_dir = tempfile.TemporaryDirectory()
+        data_dir = Path(temp_dir.name)
+
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'label': args.label,
+        'target': args.target,
+        'environment': environment_info(),
+        'settings': {key: getattr(args, key) for key in
+                     ('batch_size', 'chunk_size', 'workers', 'writers', 'csv_engine', 'seed')},
+        'results': []
+    }
+
+    try:
+        generator = SyntheticAACGenerator(seed=args.seed)
+        for rows in row_counts:
+            csv_path = data_dir / f"aac_synthetic_{rows}_seed{args.seed}.csv"
+            if not csv_path.exists():
+                started = time.perf_counter()
+                generator.write_csv(csv_path, rows)
+                print(f"Generated {rows:,} rows in {time.perf_counter() - started:.1f}s: {csv_path}")
+
+            for strategy in strategies:
+                config = {
+                    'csv_path': str(csv_path), 'rows': rows, 'strategy': strategy, 'target': args.target,
+                    'batch_size': args.batch_size, 'chunk_size': args.chunk_size,
+                    'workers': args.workers, 'writers': args.writers, 'csv_engine': args.csv_engine
+                }
+                result = {'rows': rows, 'strategy': strategy, **run_isolated(config)}
+                run['results'].append(result)
+                latency = result['batch_latency']
+                print(f"  {rows:>10,} rows  {strategy:7} {result['rows_per_second'] or 0:>12,.0f} rows/s  "
+                      f"peak RSS {result['peak_rss_mb']:>8,.1f} MB  "
+                      f"batch p50/p99 {latency.get('p50_ms', 0):.1f}/{latency.get('p99_ms', 0):.1f} ms"
+                      + ('' if result['success'] else f"  FAILED: {result['error']}"))
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    append_results(Path(args.output), run)
+    print(f"Results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
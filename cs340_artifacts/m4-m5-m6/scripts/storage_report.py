@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Dense vs Sparse Storage Report
+CS 340 Module Four Milestone
+
+Measures how much smaller AAC documents are when the importer leaves blank
+fields out (--sparse) instead of storing '' / null placeholders.
+
+By default the report is offline: it cleans the bundled CSV both ways and
+sums the encoded BSON size of every document, and reports how much of it
+the derived fields the importer adds to every document take up. With --live it also imports
+both variants into scratch collections, builds the recommended indexes and
+reports the collStats numbers (data, storage and index size) from MongoDB.
+
+Usage:
+    python scripts/storage_report.py
+    python scripts/storage_report.py --live
+"""
+
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+
+import bson
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from animal_shelter.breeds import BREED_MIX_FIELD, BREED_TOKENS_FIELD, INTACT_FIELD  # noqa: E402
+from animal_shelter.data_importer import AACDataImporter  # noqa: E402
+from animal_shelter.geo import LOCATION_FIELD  # noqa: E402
+from animal_shelter.rescue import RESCUE_CATEGORIES_FIELD  # noqa: E402
+
+# Fields the importer derives from the AAC columns; written in dense and sparse mode alike
+DERIVED_FIELDS = (LOCATION_FIELD, BREED_TOKENS_FIELD, BREED_MIX_FIELD, INTACT_FIELD, RESCUE_CATEGORIES_FIELD)
+
+# Length prefix and trailing NUL of an encoded BSON document
+BSON_DOCUMENT_OVERHEAD = 5
+
+
+def measure_offline(csv_path=None):
+    """Return BSON size totals, blank-field counts and derived-field sizes for dense and sparse documents."""
+    results = {}
+    blanks = Counter()
+    derived = {field: Counter() for field in DERIVED_FIELDS}
+    for label, sparse in (('dense', False), ('sparse', True)):
+        importer = AACDataImporter(csv_path=csv_path, sparse=sparse)
+        records = importer.clean_data(importer.load_csv_data())
+        sizes = [len(bson.encode(record)) for record in records]
+        results[label] = {
+            'documents': len(records),
+            'fields': sum(len(record) for record in records),
+            'bson_bytes': sum(sizes),
+            'avg_bson_bytes': sum(sizes) / len(sizes) if sizes else 0
+        }
+        if not sparse:
+            for record in records:
+                blanks.update(k for k, v in record.items() if v is None or v == '')
+                for field, totals in derived.items():
+                    if field in record:
+                        totals['documents'] += 1
+                        totals['bson_bytes'] += len(bson.encode({field: record[field]})) - BSON_DOCUMENT_OVERHEAD
+    return results, blanks, derived
+
+
+def measure_live(csv_path=None):
+    """Import both variants into scratch collections and return their collStats."""
+    from animal_shelter.animal_shelter import AnimalShelter
+
+    results = {}
+    for label, sparse in (('dense', False), ('sparse', True)):
+        importer = AACDataImporter(csv_path=csv_path, sparse=sparse)
+        records = importer.clean_data(importer.load_csv_data())
+        shelter = AnimalShelter()
+        try:
+            shelter.COL = f"storage_report_{label}"
+            shelter.collection = shelter.database[shelter.COL]
+            shelter.collection.drop()
+            shelter.collection.insert_many(records, ordered=False)
+            shelter.ensure_indexes()
+            results[label] = shelter.get_storage_stats()
+            shelter.collection.drop()
+        finally:
+            shelter.close_connection()
+    return results
+
+
+def _pct(before, after):
+    return f"{(before - after) / before * 100:.1f}%" if before else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare dense and sparse AAC document sizes')
+    parser.add_argument('--csv', default=None, help='CSV file to measure (default: bundled AAC CSV)')
+    parser.add_argument('--live', action='store_true',
+                        help='Also import into scratch MongoDB collections and report collStats')
+    args = parser.parse_args()
+
+    offline, blanks, derived = measure_offline(args.csv)
+    dense, sparse = offline['dense'], offline['sparse']
+    print("Encoded BSON size (offline)")
+    print(f"  {'':8}{'documents':>12}{'fields':>12}{'bytes':>14}{'avg bytes':>12}")
+    for label in ('dense', 'sparse'):
+        row = offline[label]
+        print(f"  {label:8}{row['documents']:>12,}{row['fields']:>12,}{row['bson_bytes']:>14,}{row['avg_bson_bytes']:>12.1f}")
+    print(f"  saved: {_pct(dense['bson_bytes'], sparse['bson_bytes'])} of BSON bytes, "
+          f"{_pct(dense['fields'], sparse['fields'])} of stored fields")
+    print("\nBlank fields per column (dense import)")
+    for field, count in blanks.most_common():
+        print(f"  {field:28}{count:>8,}")
+    print("\nDerived fields (dense import; sparse is the same)")
+    print(f"  {'':20}{'documents':>12}{'bytes':>14}{'share':>8}")
+    for field, totals in derived.items():
+        print(f"  {field:20}{totals['documents']:>12,}{totals['bson_bytes']:>14,}"
+              f"{totals['bson_bytes'] / dense['bson_bytes'] * 100 if dense['bson_bytes'] else 0:>7.1f}%")
+
+    if args.live:
+        live = measure_live(args.csv)
+        print("\ncollStats (live)")
+        for key in ('size', 'avg_obj_size', 'storage_size', 'total_index_size'):
+            before, after = live['dense'][key], live['sparse'][key]
+            print(f"  {key:18}{before:>14,}{after:>14,}  saved {_pct(before, after)}")
+        for index, before in live['dense']['index_sizes'].items():
+            after = live['sparse']['index_sizes'].get(index, 0)
+            print(f"  {index:28}{before:>10,}{after:>10,}  saved {_pct(before, after)}")
+
+
+if __name__ == "__main__":
+    main()
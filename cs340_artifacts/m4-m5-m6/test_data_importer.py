@@ -0,0 +1,653 @@
+"""
+Unit Tests for AACDataImporter
+CS 340 Module Four Milestone
+
+This module contains unit tests for the AACDataImporter class. MongoDB access
+is mocked so the tests run without a database.
+"""
+
+import unittest
+import importlib.util
+import os
+import sys
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+import pandas as pd
+import bson
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+# Add current directory to path for imports
+sys.path.append('.')
+
+from animal_shelter.data_importer import (
+    AACDataImporter, SeenKeySet, compute_content_hash, parse_age_weeks, CONTENT_HASH_FIELD
+)
+from animal_shelter.parallel_import import ParallelImportEngine, iter_csv_text_blocks
+from animal_shelter.summary_stats import SummaryStats
+from animal_shelter.synthetic_data import SyntheticAACGenerator, CSV_COLUMNS
+
+
+CSV_PATH = str(Path(__file__).parent / 'assets' / 'aac_shelter_outcomes.csv')
+STORAGE_REPORT_SCRIPT = Path(__file__).parent / 'scripts' / 'storage_report.py'
+STORAGE_REPORT_DOC = Path(__file__).parent / 'docs' / 'storage_report.md'
+
+
+def make_records(count: int) -> list:
+    """Build a list of minimal AAC-shaped records."""
+    return [{"animal_id": f"A{i:06d}", "animal_type": "Dog"} for i in range(count)]
+
+
+class TestAACDataImporter(unittest.TestCase):
+    """Test cases for AACDataImporter import strategies."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_shelter = Mock(summary_stats=None)
+        self.mock_collection = self.mock_shelter.collection
+
+        # Patch AnimalShelter inside the importer module to return our mock
+        self.shelter_patcher = patch('animal_shelter.data_importer.AnimalShelter', return_value=self.mock_shelter)
+        self.shelter_patcher.start()
+
+        self.importer = AACDataImporter(CSV_PATH)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.shelter_patcher.stop()
+
+    def test_bulk_import_uses_one_insert_many_per_batch(self):
+        """Test that the bulk strategy sends each batch as one unordered insert_many."""
+        records = make_records(25)
+        self.mock_collection.insert_many.side_effect = lambda batch, ordered: Mock(inserted_ids=list(range(len(batch))))
+
+        stats = self.importer.import_data(records, batch_size=10, strategy='bulk')
+
+        self.assertEqual(self.mock_collection.insert_many.call_count, 3)
+        for call in self.mock_collection.insert_many.call_args_list:
+            self.assertFalse(call.kwargs['ordered'])
+        self.mock_shelter.create.assert_not_called()
+        self.assertEqual(stats['successful_imports'], 25)
+        self.assertEqual(stats['failed_imports'], 0)
+        self.assertEqual(stats['errors'], [])
+
+    def test_bulk_import_collects_write_errors(self):
+        """Test that per-document BulkWriteError details are collected into stats['errors']."""
+        records = make_records(5)
+        self.mock_collection.insert_many.side_effect = BulkWriteError({
+            'nInserted': 3,
+            'writeErrors': [
+                {'index': 1, 'code': 11000, 'errmsg': 'E11000 duplicate key error'},
+                {'index': 4, 'code': 11000, 'errmsg': 'E11000 duplicate key error'},
+            ],
+            'writeConcernErrors': [],
+        })
+
+        stats = self.importer.import_data(records, batch_size=10, strategy='bulk')
+
+        self.assertEqual(stats['successful_imports'], 3)
+        self.assertEqual(stats['failed_imports'], 2)
+        self.assertEqual(len(stats['errors']), 2)
+        self.assertIn('A000001', stats['errors'][0])
+        self.assertIn('A000004', stats['errors'][1])
+
+    def test_bulk_import_batch_failure(self):
+        """Test that a failed batch round trip marks every record in it as failed."""
+        records = make_records(4)
+        self.mock_collection.insert_many.side_effect = Exception("Connection reset")
+
+        stats = self.importer.import_data(records, batch_size=10, strategy='bulk')
+
+        self.assertEqual(stats['successful_imports'], 0)
+        self.assertEqual(stats['failed_imports'], 4)
+        self.assertIn("Connection reset", stats['errors'][0])
+
+    def test_single_import_uses_create(self):
+        """Test that the single strategy still inserts through AnimalShelter.create()."""
+        records = make_records(3)
+        self.mock_shelter.create.side_effect = [True, Exception("Invalid document"), True]
+
+        stats = self.importer.import_data(records, batch_size=2, strategy='single')
+
+        self.assertEqual(self.mock_shelter.create.call_count, 3)
+        self.mock_collection.insert_many.assert_not_called()
+        self.assertEqual(stats['successful_imports'], 2)
+        self.assertEqual(stats['failed_imports'], 1)
+        self.assertIn('A000001', stats['errors'][0])
+
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with self.assertRaises(ValueError) as context:
+            self.importer.import_data(make_records(1), strategy='sideways')
+
+        self.assertIn("Unknown import strategy", str(context.exception))
+
+
+class TestTypedSchema(unittest.TestCase):
+    """Test cases for the typed BSON conversion in clean_data."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.importer = AACDataImporter(CSV_PATH)
+
+    def test_clean_data_produces_native_types(self):
+        """Test that dates, ints and floats are stored as native BSON types."""
+        record = self.importer.clean_data(self.importer.load_csv_data())[0]
+
+        self.assertIsInstance(record['datetime'], datetime)
+        self.assertIsInstance(record['date_of_birth'], datetime)
+        self.assertIsInstance(record['rec_num'], int)
+        self.assertIsInstance(record['location_lat'], float)
+        self.assertIsInstance(record['age_upon_outcome_in_weeks'], float)
+        self.assertEqual(record['name'], '')
+
+        decoded = bson.decode(bson.encode(record))
+        self.assertEqual(decoded['datetime'], datetime(2017, 4, 11, 9, 0))
+
+    def test_missing_typed_values_become_null(self):
+        """Test that unparseable dates and numbers become None instead of ''."""
+        df = pd.DataFrame({
+            'animal_id': ['A1', 'A2'],
+            'datetime': ['2016-05-06 10:49:00', 'not a date'],
+            'location_lat': [30.5, None],
+            'age_upon_outcome': ['2 weeks', '3 years'],
+        })
+
+        records = self.importer.clean_data(df)
+
+        self.assertIsNone(records[1]['datetime'])
+        self.assertIsNone(records[1]['location_lat'])
+        self.assertEqual(records[0]['age_upon_outcome_in_weeks'], 2.0)
+        self.assertAlmostEqual(records[1]['age_upon_outcome_in_weeks'], 156.54, places=2)
+
+    def test_parse_age_weeks(self):
+        """Test parsing of free-text AAC ages into weeks."""
+        weeks = parse_age_weeks(pd.Series(['1 day', '2 weeks', '1 month', '2 years', 'NULL', '']))
+
+        self.assertAlmostEqual(weeks[0], 1 / 7)
+        self.assertEqual(weeks[1], 2.0)
+        self.assertAlmostEqual(weeks[2], 4.348, places=3)
+        self.assertAlmostEqual(weeks[3], 104.357, places=3)
+        self.assertTrue(weeks[4:].isna().all())
+
+    def test_csv_engine_selection(self):
+        """Test engine resolution and the explicit dtypes passed to read_csv."""
+        importer = AACDataImporter(CSV_PATH, csv_engine='c')
+        dtypes = importer._read_csv_kwargs()['dtype']
+
+        self.assertEqual(importer.csv_engine, 'c')
+        self.assertIs(dtypes['name'], str)
+        self.assertIs(dtypes['datetime'], str)
+        self.assertNotIn('location_lat', dtypes)
+        self.assertIn(AACDataImporter(CSV_PATH, csv_engine='auto').csv_engine, ('c', 'pyarrow'))
+        with self.assertRaises(ValueError):
+            AACDataImporter(CSV_PATH, csv_engine='python')
+
+    def test_sparse_records_omit_blank_fields(self):
+        """Test that a sparse importer leaves '' and null fields out of documents."""
+        sparse_importer = AACDataImporter(CSV_PATH, sparse=True)
+        df = pd.DataFrame({
+            'animal_id': ['A1', 'A2'],
+            'name': ['Rex', None],
+            'location_lat': [30.5, None],
+        })
+
+        records = sparse_importer.clean_data(df)
+
+        self.assertEqual(records[0]['name'], 'Rex')
+        self.assertNotIn('name', records[1])
+        self.assertNotIn('location_lat', records[1])
+        self.assertEqual(records[1]['animal_id'], 'A2')
+        self.assertEqual(sparse_importer._worker_kwargs()['sparse'], True)
+
+
+    def test_records_get_geojson_location(self):
+        """Test that rows with valid coordinates get a [long, lat] GeoJSON point and others none."""
+        df = pd.DataFrame({
+            'animal_id': ['A1', 'A2', 'A3'],
+            'location_lat': [30.25, None, 95.0],
+            'location_long': [-97.75, -97.7, -97.7],
+        })
+
+        records = self.importer.clean_data(df)
+
+        self.assertEqual(records[0]['location'], {'type': 'Point', 'coordinates': [-97.75, 30.25]})
+        self.assertNotIn('location', records[1])
+        self.assertNotIn('location', records[2])
+
+    def test_records_get_breed_tokens(self):
+        """Test that records get breed tokens, a mix flag and an intact flag when the sex is known."""
+        df = pd.DataFrame({
+            'animal_id': ['A1', 'A2', 'A3'],
+            'breed': ['Labrador Retriever/Pit Bull Mix', 'Beagle', 'Beagle'],
+            'sex_upon_outcome': ['Intact Male', 'Unknown', 'Spayed Female'],
+        })
+
+        records = self.importer.clean_data(df)
+
+        self.assertEqual(records[0]['breed_tokens'], ['labrador retriever', 'pit bull'])
+        self.assertTrue(records[0]['breed_mix'])
+        self.assertTrue(records[0]['intact'])
+        self.assertNotIn('intact', records[1])
+        self.assertFalse(records[2]['intact'])
+        # Rows sharing a breed get their own token lists
+        self.assertIsNot(records[1]['breed_tokens'], records[2]['breed_tokens'])
+
+    def test_records_get_rescue_categories(self):
+        """Test that every record is tagged with the rescue categories it suits."""
+        df = pd.DataFrame({
+            'animal_id': ['A1', 'A2', 'A3', 'A4'],
+            'animal_type': ['Dog', 'Dog', 'Dog', 'Cat'],
+            'breed': ['Rottweiler Mix', 'Rottweiler Mix', 'Labrador Retriever', 'Labrador Retriever'],
+            'sex_upon_outcome': ['Intact Male', 'Intact Male', 'Neutered Male', 'Intact Female'],
+        })
+
+        records = self.importer.clean_data(df)
+
+        self.assertEqual([record['rescue_categories'] for record in records],
+                         [['mountain', 'disaster'], ['mountain', 'disaster'], [], []])
+        self.assertIsNot(records[0]['rescue_categories'], records[1]['rescue_categories'])
+
+
+class TestDeltaImport(unittest.TestCase):
+    """Test cases for the content-hash delta import strategy."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_shelter = Mock(summary_stats=None)
+        self.mock_collection = self.mock_shelter.collection
+        self.mock_collection.bulk_write.side_effect = lambda operations, ordered: Mock(
+            inserted_count=sum(isinstance(op, InsertOne) for op in operations),
+            matched_count=sum(isinstance(op, ReplaceOne) for op in operations)
+        )
+
+        self.shelter_patcher = patch('animal_shelter.data_importer.AnimalShelter', return_value=self.mock_shelter)
+        self.shelter_patcher.start()
+
+        self.importer = AACDataImporter(CSV_PATH)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.shelter_patcher.stop()
+
+    def test_content_hash_ignores_id_and_blank_fields(self):
+        """Test that the fingerprint depends only on non-empty content."""
+        record = {"animal_id": "A1", "name": "Rex", "breed": "Beagle"}
+
+        self.assertEqual(compute_content_hash(record), compute_content_hash({**record, "_id": 1, "color": ""}))
+        self.assertNotEqual(compute_content_hash(record), compute_content_hash({**record, "name": "Max"}))
+
+    def test_delta_writes_only_new_and_changed_records(self):
+        """Test that unchanged records are skipped and changed ones replaced."""
+        unchanged = {"animal_id": "A1", "name": "Rex"}
+        changed = {"animal_id": "A2", "name": "Max"}
+        new = {"animal_id": "A3", "name": "Bo"}
+        self.mock_collection.find.return_value = [
+            {"_id": 101, "animal_id": "A1", CONTENT_HASH_FIELD: compute_content_hash(unchanged)},
+            {"_id": 102, "animal_id": "A2", CONTENT_HASH_FIELD: "stale"},
+        ]
+
+        stats = self.importer.import_data([unchanged, changed, new], strategy='delta')
+
+        operations = self.mock_collection.bulk_write.call_args.args[0]
+        self.assertEqual(len(operations), 2)
+        self.assertIsInstance(operations[0], ReplaceOne)
+        self.assertEqual(operations[0]._filter, {"_id": 102})
+        self.assertIsInstance(operations[1], InsertOne)
+        self.assertEqual((stats['inserted'], stats['updated'], stats['unchanged']), (1, 1, 1))
+        self.assertEqual(stats['successful_imports'], 3)
+        self.assertIn(CONTENT_HASH_FIELD, new)
+
+    def test_delta_without_changes_sends_no_writes(self):
+        """Test that a re-run over identical data performs no writes."""
+        record = {"animal_id": "A1", "name": "Rex"}
+        self.mock_collection.find.return_value = [
+            {"_id": 101, "animal_id": "A1", CONTENT_HASH_FIELD: compute_content_hash(record)}
+        ]
+
+        stats = self.importer.import_data([record], strategy='delta')
+
+        self.mock_collection.bulk_write.assert_not_called()
+        self.assertEqual(stats['unchanged'], 1)
+
+    def test_delta_applies_summary_deltas(self):
+        """Test that a delta run counts inserts and replaced values into the summary stats."""
+        summary_collection = MagicMock()
+        self.mock_shelter.summary_stats = SummaryStats(self.mock_collection, summary_collection)
+        changed = {"animal_id": "A2", "animal_type": "Dog", "outcome_type": "Transfer"}
+        new = {"animal_id": "A3", "animal_type": "Cat", "outcome_type": "Adoption"}
+        self.mock_collection.find.return_value = [
+            {"_id": 102, "animal_id": "A2", "animal_type": "Dog", "outcome_type": "Adoption", CONTENT_HASH_FIELD: "stale"},
+        ]
+
+        self.importer.import_data([changed, new], strategy='delta')
+
+        self.assertIn('outcome_type', self.mock_collection.find.call_args.args[1])
+        operations = summary_collection.bulk_write.call_args.args[0]
+        deltas = {(op._filter['_id']['d'], op._filter['_id']['v']): op._doc['$inc']['count'] for op in operations}
+        self.assertEqual(deltas[('total', None)], 1)
+        self.assertEqual(deltas[('animal_type', 'Cat')], 1)
+        self.assertEqual(deltas[('outcome_type', 'Transfer')], 1)
+        # The replaced Adoption is offset by the new one, and A2 stays a Dog
+        self.assertNotIn(('outcome_type', 'Adoption'), deltas)
+        self.assertNotIn(('animal_type', 'Dog'), deltas)
+
+    def test_delete_vanished(self):
+        """Test that imported documents missing from the last delta run are deleted."""
+        self.mock_collection.find.return_value = []
+        self.importer.import_data([{"animal_id": "A1"}, {"animal_id": "A2"}], strategy='delta')
+
+        cursor = Mock()
+        cursor.__iter__ = Mock(return_value=iter([
+            {"_id": 1, "animal_id": "A1"},
+            {"_id": 2, "animal_id": "A2"},
+            {"_id": 3, "animal_id": "A9"},
+        ]))
+        self.mock_collection.find.return_value = Mock()
+        self.mock_collection.find.return_value.batch_size.return_value = cursor
+        self.mock_collection.delete_many.return_value = Mock(deleted_count=1)
+
+        deleted = self.importer.delete_vanished()
+
+        self.assertEqual(deleted, 1)
+        self.mock_collection.find.assert_called_with({CONTENT_HASH_FIELD: {'$exists': True}}, {'animal_id': 1})
+        self.mock_collection.delete_many.assert_called_once_with({'_id': {'$in': [3]}})
+
+
+class TestUpsertImport(unittest.TestCase):
+    """Test cases for the natural-key upsert import strategy."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_shelter = Mock(summary_stats=None)
+        self.mock_collection = self.mock_shelter.collection
+        self.mock_collection.index_information.return_value = {
+            '_id_': {'key': [('_id', 1)]},
+            'idx_natural_key': {'key': [('animal_id', 1), ('datetime', 1)], 'unique': True},
+        }
+
+        self.shelter_patcher = patch('animal_shelter.data_importer.AnimalShelter', return_value=self.mock_shelter)
+        self.shelter_patcher.start()
+
+        self.importer = AACDataImporter(CSV_PATH, natural_key=['animal_id', 'datetime'])
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.shelter_patcher.stop()
+
+    def test_upsert_sends_replace_one_by_natural_key(self):
+        """Test that each record becomes a ReplaceOne(upsert=True) keyed on the natural key."""
+        records = [
+            {"animal_id": "A1", "datetime": "2017-01-01 10:00:00", "name": "Rex"},
+            {"animal_id": "A1", "datetime": "2018-05-01 09:00:00", "name": "Rex"},
+        ]
+        self.mock_collection.bulk_write.return_value = Mock(upserted_count=1, modified_count=0, matched_count=1)
+
+        stats = self.importer.import_data(records, strategy='upsert')
+
+        operations = self.mock_collection.bulk_write.call_args.args[0]
+        self.assertFalse(self.mock_collection.bulk_write.call_args.kwargs['ordered'])
+        self.assertTrue(all(isinstance(op, ReplaceOne) and op._upsert for op in operations))
+        self.assertEqual(operations[1]._filter, {"animal_id": "A1", "datetime": "2018-05-01 09:00:00"})
+        self.assertEqual((stats['inserted'], stats['updated'], stats['unchanged']), (1, 0, 1))
+        self.mock_collection.create_index.assert_not_called()
+
+    def test_natural_key_index_replaces_non_unique_index(self):
+        """Test that a non-unique index on the same fields is replaced by a unique one."""
+        self.mock_collection.index_information.return_value = {
+            '_id_': {'key': [('_id', 1)]},
+            'idx_pair': {'key': [('animal_id', 1), ('datetime', 1)]},
+        }
+        self.mock_collection.aggregate.return_value = iter([])
+
+        name = self.importer.ensure_natural_key_index(self.mock_collection)
+
+        self.assertEqual(name, 'idx_natural_key')
+        self.mock_collection.drop_index.assert_called_once_with('idx_pair')
+        self.mock_collection.create_index.assert_called_once_with(
+            [('animal_id', 1), ('datetime', 1)], name='idx_natural_key', unique=True
+        )
+
+    def test_natural_key_index_rejects_duplicates(self):
+        """Test that existing duplicate keys abort the upsert before any index change."""
+        self.mock_collection.index_information.return_value = {'_id_': {'key': [('_id', 1)]}}
+        self.mock_collection.aggregate.return_value = iter([{'_id': {'animal_id': 'A1', 'datetime': 'x'}, 'count': 2}])
+
+        with self.assertRaises(ValueError) as context:
+            self.importer.import_data([{"animal_id": "A1"}], strategy='upsert')
+
+        self.assertIn("duplicate", str(context.exception))
+        self.mock_collection.create_index.assert_not_called()
+        self.mock_collection.bulk_write.assert_not_called()
+
+    def test_compound_natural_key_keeps_repeat_outcomes(self):
+        """Test that de-duplication follows the configured natural key."""
+        df = self.importer.load_csv_data()
+        by_animal = AACDataImporter(CSV_PATH, natural_key=['animal_id']).clean_data(df)
+        by_outcome = self.importer.clean_data(df)
+
+        self.assertGreater(len(by_outcome), len(by_animal))
+
+
+class TestStreamingImport(unittest.TestCase):
+    """Test cases for the chunked, bounded-memory import pipeline."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.importer = AACDataImporter(CSV_PATH)
+
+    def test_stream_records_matches_clean_data(self):
+        """Test that streaming in small chunks yields the same records as a full load."""
+        full_records = self.importer.clean_data(self.importer.load_csv_data())
+        streamed_records = list(self.importer.stream_records(chunk_size=777))
+
+        self.assertEqual(len(streamed_records), len(full_records))
+        self.assertEqual(
+            [r['animal_id'] for r in streamed_records],
+            [r['animal_id'] for r in full_records]
+        )
+
+    def test_stream_records_dedups_across_chunks(self):
+        """Test that an animal_id repeated in a later chunk is dropped."""
+        animal_ids = [r['animal_id'] for r in self.importer.stream_records(chunk_size=500)]
+
+        self.assertEqual(len(animal_ids), len(set(animal_ids)))
+
+    def test_seen_key_set(self):
+        """Test SeenKeySet membership across additions."""
+        seen = SeenKeySet()
+        first = SeenKeySet.hash_keys(pd.Series(['A1', 'A2']))
+        second = SeenKeySet.hash_keys(pd.Series(['A2', 'A3']))
+
+        self.assertFalse(seen.contains(first).any())
+        seen.add(first)
+        self.assertEqual(seen.contains(second).tolist(), [True, False])
+        self.assertEqual(len(seen), 2)
+
+        # Many small additions are merged into few runs and stay searchable
+        for i in range(100):
+            seen.add(SeenKeySet.hash_keys(pd.Series([f"B{i}"])))
+        self.assertLessEqual(len(seen._runs), 8)
+        self.assertTrue(seen.contains(SeenKeySet.hash_keys(pd.Series(['B0', 'B99', 'A1']))).all())
+
+    @patch('animal_shelter.data_importer.AnimalShelter')
+    def test_import_data_consumes_generator(self, mock_shelter_class):
+        """Test that import_data batches a generator without needing its length."""
+        mock_shelter_class.return_value.summary_stats = None
+        mock_collection = mock_shelter_class.return_value.collection
+        mock_collection.insert_many.side_effect = lambda batch, ordered: Mock(inserted_ids=list(range(len(batch))))
+
+        stats = self.importer.import_data((record for record in make_records(25)), batch_size=10)
+
+        self.assertEqual(mock_collection.insert_many.call_count, 3)
+        self.assertEqual(stats['total_records'], 25)
+        self.assertEqual(stats['successful_imports'], 25)
+
+
+class TestSnapshotCache(unittest.TestCase):
+    """Test cases for the typed columnar snapshot of the source CSV."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'aac.csv')
+        pd.read_csv(CSV_PATH, nrows=300).to_csv(self.csv_path, index=False)
+        self.snapshot_dir = os.path.join(self.temp_dir, 'snapshots')
+
+    def tearDown(self):
+        """Remove the temporary CSV and snapshots."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_snapshot_hit_matches_parsed_csv(self):
+        """Test that a second load reads the snapshot and cleans to the same records."""
+        parsed = AACDataImporter(self.csv_path).clean_data(
+            AACDataImporter(self.csv_path).load_csv_data())
+
+        AACDataImporter(self.csv_path, snapshot_dir=self.snapshot_dir).load_csv_data()
+        importer = AACDataImporter(self.csv_path, snapshot_dir=self.snapshot_dir)
+        with patch('animal_shelter.data_importer.pd.read_csv') as mock_read_csv:
+            records = importer.clean_data(importer.load_csv_data())
+            streamed = list(importer.stream_records(chunk_size=70))
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(records, parsed)
+        self.assertEqual(streamed, parsed)
+
+    def test_snapshot_invalidated_by_content_change(self):
+        """Test that a changed CSV is re-parsed while a touched, unchanged one is not."""
+        importer = AACDataImporter(self.csv_path, snapshot_dir=self.snapshot_dir)
+        importer.load_csv_data()
+
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNotNone(importer.snapshot_cache.load(importer.csv_path))
+
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write(',,A999999,Dog,Mix,Black,,,,,,,,,,\n')
+        self.assertIsNone(importer.snapshot_cache.load(importer.csv_path))
+        self.assertEqual(len(importer.load_csv_data()), 301)
+
+
+class TestSyntheticData(unittest.TestCase):
+    """Test cases for the synthetic AAC data generator used by benchmarks."""
+
+    def test_generator_is_deterministic(self):
+        """Test that the same seed and start produce the same rows."""
+        first = SyntheticAACGenerator(seed=7).generate_frame(500, start=1000)
+        second = SyntheticAACGenerator(seed=7).generate_frame(500, start=1000)
+        other = SyntheticAACGenerator(seed=8).generate_frame(500, start=1000)
+
+        pd.testing.assert_frame_equal(first, second)
+        self.assertFalse(first['breed'].equals(other['breed']))
+
+    def test_generated_rows_import_like_real_rows(self):
+        """Test that generated rows have the real columns and clean like the bundled CSV."""
+        generator = SyntheticAACGenerator(seed=1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = generator.write_csv(Path(temp_dir) / 'synthetic.csv', 5000, chunk_size=2000)
+            importer = AACDataImporter(str(csv_path))
+            df = importer.load_csv_data()
+            records = importer.clean_data(df)
+
+        self.assertEqual(list(df.columns), list(CSV_COLUMNS))
+        self.assertEqual(len(df), 5000)
+        self.assertLess(len(records), 5000)
+        self.assertGreater(len(records), 5000 * (1 - 3 * generator.duplicate_rate))
+        self.assertAlmostEqual(df['name'].isna().mean(), 0.30, delta=0.05)
+        self.assertIsInstance(records[0]['datetime'], datetime)
+
+
+class TestParallelImport(unittest.TestCase):
+    """Test cases for the ParallelImportEngine."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.mock_shelter = Mock(summary_stats=None)
+        self.mock_collection = self.mock_shelter.collection
+        self.mock_collection.insert_many.side_effect = lambda batch, ordered: Mock(inserted_ids=list(range(len(batch))))
+
+        self.shelter_patcher = patch('animal_shelter.parallel_import.AnimalShelter', return_value=self.mock_shelter)
+        self.shelter_patcher.start()
+
+        self.importer = AACDataImporter(CSV_PATH)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.shelter_patcher.stop()
+
+    def test_parallel_import_matches_serial_cleaning(self):
+        """Test that the parallel engine writes the same records as a serial import."""
+        expected_ids = [r['animal_id'] for r in self.importer.clean_data(self.importer.load_csv_data())]
+
+        engine = ParallelImportEngine(self.importer, workers=2, writers=3, chunk_size=1500, batch_size=400)
+        stats = engine.run()
+
+        written_ids = [
+            record['animal_id']
+            for call in self.mock_collection.insert_many.call_args_list
+            for record in call.args[0]
+        ]
+        self.assertEqual(sorted(written_ids), sorted(expected_ids))
+        self.assertEqual(stats['successful_imports'], len(expected_ids))
+        self.assertEqual(stats['failed_imports'], 0)
+        self.mock_shelter.close_connection.assert_called_once()
+
+    def test_parallel_import_reports_stage_throughput(self):
+        """Test that per-stage throughput and a bottleneck are reported."""
+        engine = ParallelImportEngine(self.importer, workers=1, writers=2, chunk_size=5000, batch_size=1000)
+        stats = engine.run()
+
+        self.assertEqual(stats['stages']['parse']['rows'], 10000)
+        self.assertEqual(stats['stages']['write']['records'], stats['total_records'])
+        for stage in ('read', 'parse', 'write'):
+            self.assertIn('records_per_second', stats['stages'][stage])
+        self.assertIn(stats['stages']['bottleneck'], ('read', 'parse', 'write'))
+
+    def test_text_blocks_keep_quoted_newlines(self):
+        """Test that a block boundary never splits a quoted multi-line field."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='') as f:
+            f.write('animal_id,name\nA1,"Two\nLines"\nA2,Rex\nA3,Max\n')
+        try:
+            header, *blocks = list(iter_csv_text_blocks(Path(f.name), chunk_size=1))
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(header, 'animal_id,name\n')
+        self.assertEqual(blocks[0], 'A1,"Two\nLines"\n')
+        self.assertEqual(len(blocks), 3)
+
+
+
+class TestStorageReport(unittest.TestCase):
+    """Test that docs/storage_report.md matches what scripts/storage_report.py measures."""
+
+    def setUp(self):
+        """Load the report script and measure the bundled CSV."""
+        spec = importlib.util.spec_from_file_location('storage_report', STORAGE_REPORT_SCRIPT)
+        self.script = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.script)
+        self.offline, _, self.derived = self.script.measure_offline(CSV_PATH)
+        self.report = STORAGE_REPORT_DOC.read_text(encoding='utf-8')
+
+    def test_document_sizes_match_report(self):
+        """Test that the dense and sparse rows are what the script prints for the current document shape."""
+        for label in ('Dense ', 'Sparse'):
+            row = self.offline[label.strip().lower()]
+            with self.subTest(import_mode=label.strip()):
+                self.assertIn(f"| {label} | {row['documents']:,} | {row['fields']:,} | "
+                              f"{row['bson_bytes']:,} | {row['avg_bson_bytes']:.1f} |", self.report)
+
+    def test_every_derived_field_is_reported(self):
+        """Test that each derived field the importer writes has a row with its measured size."""
+        for field, totals in self.derived.items():
+            with self.subTest(field=field):
+                self.assertRegex(self.report, rf"\| `{field}` \|[^\n]*\| {totals['documents']:,} \| "
+                                              rf"{totals['bson_bytes']:,} \|")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)